@@ -1,5 +1,8 @@
 # attach_from_neighborhood.py
 from .imports import *
+from .shared.walk import DIR_CREATED, DIR_DELETED, OVERFLOW, listed_paths, make_watcher, walk_entries, walk_files
+from .shared.search import CancelToken, Matcher, SearchSpec, TrigramIndex, iter_search_batches, search_content, search_file
+import time
 # Data structures
 @dataclass
 class initSearchParams:
@@ -53,17 +56,142 @@ class initSearchWorker(QThread):
 class SearchWorker(QThread):
     log = pyqtSignal(str)
     done = pyqtSignal(list)
-    def __init__(self, params):
+    batch = pyqtSignal(list)       # streaming: partial hits
+    progress = pyqtSignal(dict)    # streaming: SearchProgress.as_dict()
+    FLUSH_INTERVAL = 0.05          # seconds between batch emits
+    FLUSH_FILES = 2000             # ...or after this many scanned files
+    def __init__(self, params, streaming: bool = False, use_index: bool = False):
         super().__init__()
         self.params = params
+        self.streaming = streaming
+        self.use_index = use_index
+        self.token = CancelToken()
+    def cancel(self):
+        """Stop the search; workers bail out before their next file or chunk."""
+        self.token.cancel()
     def run(self):
         self.log.emit("Starting search...\n")
         self.log.emit(f"params=={self.params}")
-        results = findContent(
-            **self.params
-        )
+        if self.streaming:
+            results = self._run_streaming()
+        else:
+            results = search_content(
+                **self.params, use_index=self.use_index, token=self.token
+            )
         self.done.emit(results or [])
         logging.info("Search finished: %d hits", len(results or []))
+    def _run_streaming(self) -> list:
+        """Coalesce engine batches so the UI sees at most one update per FLUSH_INTERVAL."""
+        spec = SearchSpec.from_params(**self.params)
+        results = []
+        index = TrigramIndex(self.params["directory"]) if self.use_index and spec.needles else None
+        batches = iter_search_batches(
+            self.params["directory"], spec,
+            cfg=self.params.get("path_filter") or self.params.get("cfg"),
+            recursive=self.params.get("recursive", True),
+            index=index,
+            token=self.token,
+        )
+        try:
+            self._consume(batches, results)
+        finally:
+            if index is not None:
+                index.close()
+        return results
+    def _consume(self, batches, results: list):
+        pending = []
+        last_emit, last_scanned = time.monotonic(), 0
+        progress = None
+        for hits, progress in batches:
+            pending.extend(hits)
+            now = time.monotonic()
+            if ((pending and not results)          # first hits go out immediately
+                    or now - last_emit >= self.FLUSH_INTERVAL
+                    or progress.files_scanned - last_scanned >= self.FLUSH_FILES):
+                self._flush(pending, results, progress)
+                pending = []
+                last_emit, last_scanned = now, progress.files_scanned
+        if progress is not None:
+            self._flush(pending, results, progress)
+        return results
+    def _flush(self, pending: list, results: list, progress) -> None:
+        if pending:
+            results.extend(pending)
+            self.batch.emit(pending)
+        self.progress.emit(progress.as_dict())
+
+class WatchWorker(QThread):
+    """
+    Live search: watch the searched tree and re-run the current query on the
+    files that change. Emits [(path, result_or_None)] for files whose hits
+    changed; None drops a file that no longer matches or no longer exists.
+    """
+    log = pyqtSignal(str)
+    updates = pyqtSignal(list)
+    SETTLE = 0.2                   # seconds of quiet before a burst is evaluated
+    def __init__(self, params, known=()):
+        super().__init__()
+        self.params = params
+        self.known = set(known)    # paths currently shown as hits
+        self.token = CancelToken()
+    def cancel(self):
+        self.token.cancel()
+    def run(self):
+        self.root = directory = os.path.abspath(self.params["directory"])
+        self.cfg = self.params.get("path_filter") or self.params.get("cfg")
+        self.recursive = self.params.get("recursive", True)
+        self.spec = SearchSpec.from_params(**self.params)
+        self.matcher = Matcher.from_spec(self.spec)
+        try:
+            watcher = make_watcher(directory, self.cfg, self.recursive)
+        except OSError as e:
+            self.log.emit(f"Live search unavailable: {e}\n")
+            return
+        self.log.emit(f"👁 Live search on {directory} ({type(watcher).__name__}).\n")
+        pending, last = {}, 0.0
+        try:
+            while not self.token.cancelled:
+                events = watcher.read_events(0.1)
+                for path, kind in events:
+                    pending[path] = kind
+                if events:
+                    last = time.monotonic()
+                elif pending and time.monotonic() - last >= self.SETTLE:
+                    batch, pending = pending, {}
+                    out = self._evaluate(batch)
+                    if out:
+                        self.updates.emit(out)
+        finally:
+            watcher.close()
+    def _evaluate(self, events: dict) -> list:
+        """Re-search changed files; listings re-apply the path filter and ignore files."""
+        removed, candidates, by_dir = set(), set(), {}
+        for path, kind in events.items():
+            if kind == DIR_DELETED:
+                prefix = path.rstrip(os.sep) + os.sep
+                removed.update(p for p in self.known if p.startswith(prefix))
+            elif kind in (DIR_CREATED, OVERFLOW):
+                candidates.update(e.path for e in walk_entries(path, self.cfg, self.recursive,
+                                                               token=self.token, ignore_root=self.root))
+                if kind == OVERFLOW:
+                    removed.update(self.known)
+            else:
+                by_dir.setdefault(os.path.dirname(path), []).append(path)
+        for dirpath, paths in by_dir.items():
+            listed = listed_paths(dirpath, self.cfg, self.root)
+            for path in paths:
+                (candidates if path in listed else removed).add(path)
+        out = []
+        for path in candidates:
+            removed.discard(path)
+            result = search_file(path, self.spec, self.matcher)
+            if result or path in self.known:
+                out.append((path, result))
+                (self.known.add if result else self.known.discard)(path)
+        for path in removed & self.known:
+            out.append((path, None))
+            self.known.discard(path)
+        return out
   
 def _ensure_pkg(name: str, path: Path | None) -> types.ModuleType:
     """Create or return a package module with an optional __path__."""
@@ -185,7 +313,7 @@ class _ExtractWorker(QThread):
 
     def run(self):
         try:
-            py_files = collect_filepaths(**self.params)  # from your lib
+            py_files = walk_files(**self.params)
             module_paths, imports = get_py_script_paths(py_files)  # your function
             self.done.emit((module_paths, imports))
         except Exception:
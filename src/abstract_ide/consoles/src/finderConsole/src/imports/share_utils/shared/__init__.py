@@ -1,4 +1,9 @@
 from .results import *
+from .walk import *
+from .search import *
+from .patch import *
+from .pydeps import *
 from .states import *
 from .inputs import *
 from .open_file_funcs import *
+from .log_sink import *
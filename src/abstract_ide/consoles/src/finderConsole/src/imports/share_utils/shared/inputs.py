@@ -3,13 +3,15 @@ from PyQt6.QtWidgets import QToolButton,QHBoxLayout,QSpinBox,QGridLayout,QWidget
 from PyQt6.QtCore import QSignalBlocker
 from ..imports import *
 
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import time
 from .results import *
 from .states import *
 from .open_file_funcs import *
 from abstract_utilities.file_utils import (derive_file_defaults)
 
 from .visibility import *
+from .walk.snapshot import default_snapshot_cache
 logger = get_logFile(__name__)
 _read_state = read_state
 _write_state = write_state
@@ -21,18 +23,73 @@ def normalize_filter_value(v):
     return str(v)
 
 class SharedStateBus(QObject):
-    stateBroadcast = pyqtSignal(object, dict)  # (sender, state)
+    """
+    Shared filter state for linked tabs.
+
+    `push` records only the keys whose value actually changed and coalesces
+    them per sender for `debounce_ms` (flushed early once a burst has been
+    pending for `max_wait_ms`). A flush emits `stateBroadcast(sender, changed)`
+    and calls each `subscribe`d callback whose declared keys intersect the
+    change, with just those keys.
+    """
+    stateBroadcast = pyqtSignal(object, dict)  # (sender, changed keys only)
+    DEBOUNCE_MS = 150
+    MAX_WAIT_MS = 600
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, debounce_ms: int = DEBOUNCE_MS, max_wait_ms: int = MAX_WAIT_MS):
         super().__init__(parent)
         self._snap: dict = {}
+        self._pending: dict = {}          # sender -> {key: value}
+        self._pending_since = None
+        self._subscribers: list = []      # (frozenset(keys) | None, callback)
+        self.debounce_ms = debounce_ms
+        self.max_wait_ms = max_wait_ms
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        # one tree walk per (dir, filters) serves every linked tab
+        self.snapshots = default_snapshot_cache()
 
     def snapshot(self) -> dict:
-        return dict(self._snap)
+        """Current shared state, including changes still waiting in the debounce window."""
+        snap = dict(self._snap)
+        for diff in self._pending.values():
+            snap.update(diff)
+        return snap
+
+    def subscribe(self, callback, keys=None):
+        """Call `callback(sender, changed)` on flushes touching `keys` (None = every key)."""
+        self._subscribers.append((frozenset(keys) if keys is not None else None, callback))
+
+    def push(self, sender, state: dict, immediate: bool = False):
+        """Queue the keys of `state` that differ from the shared state."""
+        current = self.snapshot()
+        diff = {k: v for k, v in state.items() if k not in current or current[k] != v}
+        if not diff:
+            return
+        self._pending.setdefault(sender, {}).update(diff)
+        if immediate:
+            self.flush()
+            return
+        now = time.monotonic()
+        if self._pending_since is None:
+            self._pending_since = now
+        if (now - self._pending_since) * 1000 >= self.max_wait_ms:
+            self.flush()
+        else:
+            self._timer.start(self.debounce_ms)
 
-    def push(self, sender, state: dict):
-        self._snap = dict(state)
-        self.stateBroadcast.emit(sender, self.snapshot())
+    def flush(self):
+        self._timer.stop()
+        pending, self._pending, self._pending_since = self._pending, {}, None
+        for sender, diff in pending.items():
+            self._snap.update(diff)
+            self.stateBroadcast.emit(sender, dict(diff))
+            for keys, callback in list(self._subscribers):
+                if keys is None:
+                    callback(sender, dict(diff))
+                elif not keys.isdisjoint(diff):
+                    callback(sender, {k: v for k, v in diff.items() if k in keys})
 def getContentComponentDefaults(
         host,
         *args,
@@ -117,35 +174,31 @@ def getSharedBus(
     host._bus = bus
     host._applying_remote = False
 
-    # --- propagate local → bus when linked
-    def maybe_broadcast(*_):
-        if not host.link_btn.isChecked() or host._applying_remote:
-            return
-        bus.push(host, _read_state(host))
-
-    # connect all widgets to broadcast
-    for w in (host.dir_in, host.strings_in,
-              host.allowed_exts_in, host.exclude_exts_in,
-              host.allowed_types_in, host.exclude_types_in,
-              host.allowed_dirs_in, host.exclude_dirs_in,
-              host.allowed_patterns_in, host.exclude_patterns_in):
-        w.textEdited.connect(maybe_broadcast)
-
-    for cb in (host.chk_add, host.chk_recursive, host.chk_total,
-               host.chk_parse, host.chk_getlines):
-        cb.toggled.connect(maybe_broadcast)
+    # --- propagate local → bus when linked (only the edited field)
+    def broadcaster(key, read):
+        def maybe_broadcast(*_):
+            if not host.link_btn.isChecked() or host._applying_remote:
+                return
+            bus.push(host, {key: read()})
+        return maybe_broadcast
 
-    host.spec_spin.valueChanged.connect(maybe_broadcast)
+    for key, w in state_widgets(host):
+        if isinstance(w, QLineEdit):
+            w.textEdited.connect(broadcaster(key, w.text))
+        elif isinstance(w, QCheckBox):
+            w.toggled.connect(broadcaster(key, w.isChecked))
+        else:
+            w.valueChanged.connect(broadcaster(key, w.value))
 
     # --- bus → host
-    def apply_shared(sender, state):
+    def apply_shared(sender, changed):
         if sender is host or not host.link_btn.isChecked():
             return
         host._applying_remote = True
-        _write_state(host, state)
+        _write_state(host, changed)
         host._applying_remote = False
 
-    bus.stateBroadcast.connect(apply_shared)
+    bus.subscribe(apply_shared)
 
     # --- INITIAL SYNC
     current = _read_state(host)
@@ -159,7 +212,7 @@ def getSharedBus(
         return
 
     # First tab to attach → seed the bus
-    bus.push(host, current)
+    bus.push(host, current, immediate=True)
 
 
 def add_result_item(list_widget, file_path: str, line: int | None):
@@ -0,0 +1,81 @@
+"""
+Batched log output for tabs that log per result.
+
+Every insertPlainText + cursor move re-lays out the document, so logging
+100k lines one call at a time freezes the UI. A BatchedLogSink collects
+writes and inserts them in one call at most every `flush_ms`, and caps the
+widget at `max_blocks` lines (older lines scroll out; a burst larger than
+the cap is trimmed before it ever reaches the widget).
+"""
+from PyQt6.QtCore import QObject, QTimer
+
+FLUSH_MS = 40          # max delay between a write and its appearance
+MAX_BLOCKS = 5000      # lines kept in the log widget
+
+class BatchedLogSink(QObject):
+    def __init__(self, edit, flush_ms: int = FLUSH_MS, max_blocks: int = MAX_BLOCKS):
+        super().__init__(edit)
+        self.edit = edit
+        self.max_blocks = max_blocks
+        self._chunks: list[str] = []
+        self._lines = 0
+        self._dropped = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(flush_ms)
+        self._timer.timeout.connect(self.flush)
+        if max_blocks:
+            edit.document().setMaximumBlockCount(max_blocks)
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        self._chunks.append(text)
+        self._lines += text.count("\n")
+        if self.max_blocks and self._lines > 2 * self.max_blocks:
+            self._trim()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _trim(self) -> None:
+        """Keep only the last `max_blocks` pending lines."""
+        text = "".join(self._chunks)
+        cut = -1
+        for _ in range(self.max_blocks):
+            cut = text.rfind("\n", 0, cut if cut >= 0 else len(text) - 1)
+            if cut < 0:
+                break
+        if cut >= 0:
+            self._dropped += text.count("\n", 0, cut + 1)
+            text = text[cut + 1:]
+        self._chunks = [text]
+        self._lines = text.count("\n")
+
+    def flush(self) -> None:
+        self._timer.stop()
+        if not self._chunks:
+            return
+        text = "".join(self._chunks)
+        if self._dropped:
+            text = f"… {self._dropped} line(s) not shown\n" + text
+        self._chunks, self._lines, self._dropped = [], 0, 0
+        self.edit.moveCursor(self.edit.textCursor().MoveOperation.End)
+        self.edit.insertPlainText(text)
+        bar = self.edit.verticalScrollBar()
+        bar.setValue(bar.maximum())
+
+    def clear(self) -> None:
+        self._timer.stop()
+        self._chunks, self._lines, self._dropped = [], 0, 0
+        self.edit.clear()
+
+def log_sink(host, attr: str = "log"):
+    """The BatchedLogSink for `host.<attr>` (created on first use), or None without a log widget."""
+    edit = getattr(host, attr, None)
+    if edit is None:
+        return None
+    sink = getattr(host, "_log_sink", None)
+    if sink is None or sink.edit is not edit:
+        sink = BatchedLogSink(edit)
+        host._log_sink = sink
+    return sink
@@ -12,16 +12,32 @@ def _extract_path_line_from_item(item: QListWidgetItem) -> tuple[str, int | None
     print(f"from _extract_path_line_from_item data == {data}")
     if isinstance(data, dict) and "file_path" in data:
         return data["file_path"], data.get("line")
-    text = item.text()
+    text = item.text() if hasattr(item, "text") else str(item.data(Qt.ItemDataRole.DisplayRole) or "")
     path, sep, rest = text.partition(":")
     line = int(rest.strip()) if sep and rest.strip().isdigit() else None
     return path, line
 
+def _current_entry(view):
+    """Current row of a QListWidget (item) or a model-backed QListView (index)."""
+    if hasattr(view, "currentItem"):
+        return view.currentItem()
+    idx = view.currentIndex()
+    return idx if idx.isValid() else None
+
+def _iter_view_entries(view):
+    """Yield (path, line) for every file in a QListWidget or a SearchResultsModel view."""
+    model = view.model() if hasattr(view, "model") else None
+    if model is not None and hasattr(model, "iter_files"):
+        yield from model.iter_files()
+        return
+    for i in range(view.count()):
+        yield _extract_path_line_from_item(view.item(i))
+
 def open_one(self, item: QListWidgetItem | None = None):
     print(f"from open_one item == {item}")
     # When called from code (no item), use current selection
     if item is None and hasattr(self, "list"):
-        item = self.list.currentItem()
+        item = _current_entry(self.list)
 
     if item is None:
         parent = self if isinstance(self, QWidget) else None
@@ -34,9 +50,7 @@ def open_one(self, item: QListWidgetItem | None = None):
 def open_all_hits(self):
     if not hasattr(self, "list"):
         return
-    for i in range(self.list.count()):
-        itm = self.list.item(i)
-        path, line = _extract_path_line_from_item(itm)
+    for path, line in _iter_view_entries(self.list):
         open_in_editor(path, line)
 # open_file_funcs.py
 def open_in_editor(path: str, line: int | None = None):
@@ -0,0 +1,5 @@
+from .delta import *
+from .batch import *
+from .undo import *
+from .preview import *
+from .route import *
@@ -0,0 +1,420 @@
+"""
+Atomic batch apply for the Diff Parser.
+
+Writing a patch to many files runs in three phases, none on the UI thread:
+
+1. prepare: every source is read and transformed in the search pool
+   (engine `_make_executor`). Nothing is written yet, so a file that fails
+   to patch aborts the batch before the tree is touched.
+2. stage: each output goes to a temp file beside its target. The temps are
+   fsynced together once all of them are written, not one write at a time.
+3. commit: a journal listing every target is written and fsynced. Each
+   original is hard-linked aside and its temp is moved over it with
+   os.replace. Touched directories are fsynced once at the end.
+
+If a replace fails, or a source changed after it was read, the targets
+already replaced are restored from their links. The tree is then either
+fully patched or untouched. A journal left behind by a crash is rolled back
+by `recover_journals`. The journal directory is shared by every window, so
+the owner holds an flock on `<txid>.lock` for the whole commit, and
+recovery skips any journal whose lock is still held. Once committed, the batch's reverse deltas can be
+kept in an UndoJournal (see undo.py).
+"""
+import json
+import os
+import socket
+import shutil
+import stat
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:                   # Windows
+    fcntl = None
+
+from ..search.cancel import CancelToken, worker_token
+from ..search.engine import _make_executor, _shards, _task_token, _workers_for
+from ..walk.latency import io_profile
+from .delta import content_hash, line_delta
+
+SYNC_WORKERS = 16                 # threads issuing fsyncs in the stage phase
+INLINE_APPLY_LIMIT = 8            # below this, a pool costs more than it saves
+STALE_JOURNAL_AGE = 3600          # s; without flock, other processes' journals are left alone until this old
+NOT_A_FILE = "not a file"         # PreparedChange.error for sources that are skipped, not failed
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# text -> patched text, or None when the file needs no change
+Transform = Callable[[str], Optional[str]]
+
+def default_journal_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "abstract_ide", "patch_journal")
+
+# ───────────────────────── models ─────────────────────────
+
+@dataclass
+class PreparedChange:
+    source: str                        # file that was read
+    target: str                        # file to write (source, or e.g. source + ".new")
+    data: Optional[bytes] = None       # new content; None = no change needed
+    mtime_ns: int = 0
+    size: int = -1
+    error: Optional[str] = None
+    undo: Optional[dict] = None        # reverse delta entry, see delta.line_delta
+
+@dataclass
+class BatchResult:
+    changed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    committed: bool = False
+    txid: Optional[str] = None
+    undo_path: Optional[str] = None
+
+# ───────────────────────── prepare ─────────────────────────
+
+def _read_bytes(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _undo_entry(target: str, old: Optional[bytes], new: bytes) -> dict:
+    return {"target": target, "existed": old is not None, "new_hash": content_hash(new),
+            "old_hash": content_hash(old) if old is not None else None,
+            "ops": line_delta(new, old) if old is not None else []}
+
+def _prepare_one(source: str, target: str, transform: Transform) -> PreparedChange:
+    change = PreparedChange(source, target)
+    try:
+        try:
+            st = os.stat(source)
+        except (FileNotFoundError, NotADirectoryError):
+            st = None
+        if st is None or not stat.S_ISREG(st.st_mode):
+            change.error = NOT_A_FILE
+            return change
+        change.mtime_ns, change.size = st.st_mtime_ns, st.st_size
+        raw = _read_bytes(source)
+        if raw is None:                # removed between stat and read
+            change.error = NOT_A_FILE
+            return change
+        # same newline handling as a text-mode read
+        text = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        patched = transform(text)
+        if patched is not None:
+            change.data = (patched if patched.endswith("\n") else patched + "\n").encode("utf-8")
+            old = raw if target == source else _read_bytes(target)
+            change.undo = _undo_entry(target, old, change.data)
+    except ValueError as e:
+        change.error = str(e)
+        change.data = None
+    except Exception as e:
+        change.error = f"{type(e).__name__}: {e}"
+        change.data = None
+    return change
+
+def _prepare_shard(items: List[tuple], transform: Transform,
+                   token: Optional[CancelToken] = None) -> List[PreparedChange]:
+    """Pool entry point (must stay module-level to pickle)."""
+    token = token if token is not None else worker_token()
+    out = []
+    for source, target, *own in items:
+        if token is not None and token.cancelled:
+            break
+        out.append(_prepare_one(source, target, own[0] if own and own[0] is not None else transform))
+    return out
+
+def prepare_changes(items: Sequence[tuple], transform: Transform,
+                    max_workers: Optional[int] = None,
+                    token: Optional[CancelToken] = None) -> List[PreparedChange]:
+    """
+    Read and transform every (source, target) pair; results keep `items` order.
+    An item may carry its own transform as a third element (None = `transform`).
+    """
+    items = list(items)
+    if not items:
+        return []
+    profile = io_profile(os.path.dirname(items[0][0]) or ".")
+    workers = _workers_for(profile, max_workers)
+    if workers <= 1 or len(items) <= INLINE_APPLY_LIMIT:
+        return _prepare_shard(items, transform, token)
+    out: List[PreparedChange] = []
+    with _make_executor(workers, token, profile) as ex:
+        for shard in ex.map(_prepare_shard, _shards(items, workers), repeat(transform),
+                            repeat(_task_token(ex, token))):
+            out.extend(shard)
+    return out
+
+# ───────────────────────── journal ─────────────────────────
+
+def _fsync_path(path: str, directory: bool = False) -> None:
+    fd = os.open(path, os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0))
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass                           # some FUSE mounts refuse fsync on directories
+    finally:
+        os.close(fd)
+
+def _write_json(path: str, data: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def _unlink(path: Optional[str]) -> None:
+    if path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+def _restore(entry: dict) -> None:
+    """Undo one journal entry; safe to repeat, and a no-op if it was never replaced."""
+    target, backup = entry["target"], entry.get("backup")
+    if backup and os.path.lexists(backup):
+        os.replace(backup, target)
+        _unlink(backup)                # rename is a no-op when both are links to one file
+    elif not entry.get("existed") and not os.path.lexists(entry["temp"]):
+        _unlink(target)                # target was created by this batch
+    _unlink(entry["temp"])
+
+def _lock_path(journal: str) -> str:
+    return os.path.splitext(journal)[0] + ".lock"
+
+def _lock_journal(journal: str, wait: bool = True) -> Optional[int]:
+    """fd holding the journal's lock, or None when another owner holds it (wait=False)."""
+    fd = os.open(_lock_path(journal), os.O_RDWR | os.O_CREAT, 0o600)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+        except OSError:
+            os.close(fd)
+            return None
+    return fd
+
+def _unlock_journal(journal: str, fd: int) -> None:
+    if fcntl is None:                  # Windows cannot unlink an open file
+        os.close(fd)
+        _unlink(_lock_path(journal))
+        return
+    _unlink(_lock_path(journal))       # before closing: nobody can take the old lock and find a journal
+    os.close(fd)
+
+def _owned_elsewhere(manifest: dict) -> bool:
+    # only consulted where flock is unavailable: a live pid cannot be checked safely there
+    if fcntl is not None or manifest.get("pid") in (None, os.getpid()):
+        return False
+    return time.time() - manifest.get("created", 0) < STALE_JOURNAL_AGE
+
+class PatchTransaction:
+    """Stage, then atomically swap in, a set of prepared outputs."""
+
+    def __init__(self, changes: Sequence[PreparedChange], journal_dir: Optional[str] = None,
+                 durable: bool = True) -> None:
+        self.changes = [c for c in changes if c.data is not None and c.error is None]
+        self.journal_dir = journal_dir or default_journal_dir()
+        self.durable = durable
+        self.txid = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:8]
+        self.journal = os.path.join(self.journal_dir, self.txid + ".json")
+        self.entries: List[dict] = []
+        self._lock_fd: Optional[int] = None
+
+    def _manifest(self, state: str) -> dict:
+        return {"txid": self.txid, "state": state, "created": time.time(),
+                "pid": os.getpid(), "host": socket.gethostname(), "entries": self.entries}
+
+    # stage: temp files beside their targets, synced as one batch
+    def _stage_one(self, change: PreparedChange) -> dict:
+        directory, name = os.path.split(change.target)
+        fd, temp = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory or ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(change.data)
+            try:
+                mode = stat.S_IMODE(os.stat(change.target).st_mode)
+                existed = True
+            except FileNotFoundError:
+                mode, existed = 0o666 & ~_UMASK, False
+            os.chmod(temp, mode)
+        except BaseException:
+            _unlink(temp)
+            raise
+        return {"source": change.source, "target": change.target, "temp": temp, "existed": existed,
+                "backup": os.path.join(directory, f".{name}.{self.txid}.orig") if existed else None,
+                "mtime_ns": change.mtime_ns, "size": change.size}
+
+    def stage(self) -> None:
+        with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as ex:
+            futures = [ex.submit(self._stage_one, c) for c in self.changes]
+            errors = []
+            for fut in futures:
+                try:
+                    self.entries.append(fut.result())
+                except Exception as e:
+                    errors.append(e)
+            if errors:
+                for entry in self.entries:
+                    _unlink(entry["temp"])
+                raise errors[0]
+            if self.durable:
+                list(ex.map(_fsync_path, [e["temp"] for e in self.entries]))
+
+    # commit: journal first, then one rename per target
+    def commit(self) -> None:
+        os.makedirs(self.journal_dir, exist_ok=True)
+        # held until the journal is gone, so recovery elsewhere leaves this batch alone
+        self._lock_fd = _lock_journal(self.journal)
+        _write_json(self.journal, self._manifest("pending"))
+        done: List[dict] = []
+        try:
+            for entry in self.entries:
+                st = os.stat(entry["source"])
+                if (st.st_mtime_ns, st.st_size) != (entry["mtime_ns"], entry["size"]):
+                    raise RuntimeError(f"changed since it was read: {entry['source']}")
+                done.append(entry)
+                if entry["existed"]:
+                    try:
+                        os.link(entry["target"], entry["backup"])
+                    except OSError:
+                        shutil.copy2(entry["target"], entry["backup"])
+                os.replace(entry["temp"], entry["target"])
+            if self.durable:
+                for directory in {os.path.dirname(e["target"]) or "." for e in self.entries}:
+                    _fsync_path(directory, directory=True)
+        except BaseException:
+            self.rollback(done)
+            raise
+        _write_json(self.journal, self._manifest("committed"))
+        self._finish()
+
+    def _finish(self) -> None:
+        for entry in self.entries:
+            _unlink(entry["backup"])
+        _unlink(self.journal)
+        self._unlock()
+
+    def rollback(self, entries: Optional[List[dict]] = None) -> None:
+        for entry in reversed(entries if entries is not None else self.entries):
+            _restore(entry)
+        for entry in self.entries:
+            _unlink(entry["temp"])
+        _unlink(self.journal)
+        self._unlock()
+
+    def _unlock(self) -> None:
+        if self._lock_fd is not None:
+            _unlock_journal(self.journal, self._lock_fd)
+            self._lock_fd = None
+
+def recover_journals(journal_dir: Optional[str] = None) -> List[str]:
+    """
+    Roll back batches interrupted mid-commit; returns their transaction ids.
+    Journals whose lock is held belong to a commit still running (another
+    window or process) and are skipped.
+    """
+    journal_dir = journal_dir or default_journal_dir()
+    recovered = []
+    try:
+        names = sorted(os.listdir(journal_dir))
+    except FileNotFoundError:
+        return recovered
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(journal_dir, name)
+        try:
+            fd = _lock_journal(path, wait=False)
+        except OSError:
+            continue
+        if fd is None:
+            continue
+        try:
+            # read under the lock: the owner may have finished since listdir
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            _unlock_journal(path, fd)
+            continue
+        if _owned_elsewhere(manifest):
+            os.close(fd)
+            continue
+        entries = manifest.get("entries", [])
+        if manifest.get("state") == "committed":
+            for entry in entries:
+                _unlink(entry.get("backup"))
+        else:
+            for entry in reversed(entries):
+                _restore(entry)
+            recovered.append(manifest.get("txid", name[:-5]))
+        _unlink(path)
+        _unlock_journal(path, fd)
+    return recovered
+
+# ───────────────────────── driver ─────────────────────────
+
+def apply_batch(items: Sequence[tuple], transform: Transform, *,
+                max_workers: Optional[int] = None, token: Optional[CancelToken] = None,
+                durable: bool = True, journal_dir: Optional[str] = None,
+                undo=None, log: Callable[[str], None] = lambda _msg: None) -> BatchResult:
+    """
+    Patch every (source, target) pair or none of them.
+    A source that fails to transform aborts the batch before anything is
+    written; a failure while swapping files in rolls back the whole set.
+    With `undo` (an UndoJournal) the reverse deltas are recorded once the
+    batch has committed.
+    """
+    result = BatchResult()
+    recovered = recover_journals(journal_dir)
+    if recovered:
+        log(f"Rolled back {len(recovered)} interrupted batch(es)\n")
+    changes = prepare_changes(items, transform, max_workers, token)
+    if token is not None and token.cancelled:
+        log("Cancelled before writing\n")
+        return result
+    for c in changes:
+        if c.error == NOT_A_FILE:
+            result.skipped.append(c.source)
+            log(f"Skip (not a file): {c.source}\n")
+        elif c.error:
+            result.failed.append((c.source, c.error))
+            log(f"Patch error for {c.source}: {c.error}\n")
+        elif c.data is None:
+            result.skipped.append(c.source)
+            log(f"No changes needed: {c.source}\n")
+    if result.failed:
+        log("Nothing written: fix the failing files and apply again\n")
+        return result
+    txn = PatchTransaction(changes, journal_dir, durable)
+    if not txn.changes:
+        return result
+    result.txid = txn.txid
+    try:
+        txn.stage()
+        txn.commit()
+    except Exception as e:
+        result.failed.append(("", f"{type(e).__name__}: {e}"))
+        log(f"Apply failed, all files restored: {e}\n")
+        return result
+    result.committed = True
+    result.changed = [e["target"] for e in txn.entries]
+    for path in result.changed:
+        log(f"Saved: {path}\n")
+    if undo is not None:
+        try:
+            result.undo_path = undo.record(txn.txid, [c.undo for c in txn.changes])
+        except OSError as e:
+            log(f"Undo record not written: {e}\n")
+    return result
@@ -0,0 +1,67 @@
+"""
+Line deltas for patch undo.
+
+A patch rewrites a few blocks in an otherwise unchanged file, so the reverse
+delta (new content -> old content) is found with one linear walk instead of
+a general diff: equal lines are stepped over in lockstep. At a mismatch, both
+sides are searched within RESYNC_WINDOW lines for the nearest point where
+RESYNC_RUN lines agree again. Whatever cannot be resynced becomes a single
+tail op. The result is always exact, and small whenever the change is.
+
+Lines keep their endings (bytes.splitlines(keepends=True)), so CRLF files
+and a missing final newline round-trip byte for byte.
+"""
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+RESYNC_WINDOW = 2000      # lines searched on each side for a resync point
+RESYNC_RUN = 3            # equal lines needed to accept a resync point
+
+# [start, end, old text]: new lines [start:end] are replaced by old text
+DeltaOp = List
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _resync(a: List[bytes], b: List[bytes], i: int, j: int) -> Optional[Tuple[int, int]]:
+    """Smallest (di, dj), by di + dj, after which RESYNC_RUN lines of a and b agree."""
+    index: Dict[bytes, List[int]] = {}
+    for dj in range(min(RESYNC_WINDOW, len(b) - j)):
+        index.setdefault(b[j + dj], []).append(dj)
+    best = None
+    for di in range(min(RESYNC_WINDOW, len(a) - i)):
+        if best is not None and di >= sum(best):
+            break
+        for dj in index.get(a[i + di], ()):
+            if best is not None and di + dj >= sum(best):
+                break
+            if a[i + di:i + di + RESYNC_RUN] == b[j + dj:j + dj + RESYNC_RUN]:
+                best = (di, dj)
+                break
+    return best
+
+def line_delta(new: bytes, old: bytes) -> List[DeltaOp]:
+    """Ops that turn `new` back into `old` (see apply_delta)."""
+    a, b = new.splitlines(keepends=True), old.splitlines(keepends=True)
+    ops: List[DeltaOp] = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            i += 1
+            j += 1
+            continue
+        step = _resync(a, b, i, j)
+        if step is None:
+            break
+        di, dj = step
+        ops.append([i, i + di, b"".join(b[j:j + dj]).decode("utf-8", "surrogateescape")])
+        i, j = i + di, j + dj
+    if i < len(a) or j < len(b):
+        ops.append([i, len(a), b"".join(b[j:]).decode("utf-8", "surrogateescape")])
+    return ops
+
+def apply_delta(new: bytes, ops: List[DeltaOp]) -> bytes:
+    lines = new.splitlines(keepends=True)
+    for start, end, text in reversed(ops):
+        lines[start:end] = [text.encode("utf-8", "surrogateescape")]
+    return b"".join(lines)
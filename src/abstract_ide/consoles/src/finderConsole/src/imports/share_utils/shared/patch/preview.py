@@ -0,0 +1,123 @@
+"""
+Diff previews for the Diff Parser, rendered off the UI thread.
+
+A preview is keyed by (path, mtime_ns, size, diff hash), so it is reused
+until either the file or the pasted diff changes. PreviewCache keeps the
+most recent ones within a byte budget.
+
+Files past WINDOW_BYTES or WINDOW_LINES are not shown whole. Only the
+patched lines are kept, with WINDOW_CONTEXT lines around each change (the
+spans come from delta.line_delta), and the gaps are collapsed into one
+marker line each. The text widget then never has to lay out a multi-MB
+document while the user arrows through the file list.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from .delta import line_delta
+
+PREVIEW_CACHE_ENTRIES = 256
+PREVIEW_CACHE_BYTES = 64 * 1024 * 1024
+WINDOW_BYTES = 256 * 1024          # larger files are previewed around their hunks only
+WINDOW_LINES = 5000
+WINDOW_CONTEXT = 30                # lines kept on each side of a change
+
+PreviewKey = Tuple[str, int, int, str]
+
+@dataclass
+class PreviewResult:
+    path: str
+    text: str = ""
+    changed: bool = False
+    windowed: bool = False
+    error: Optional[str] = None
+
+def diff_hash(diff_text: str) -> str:
+    return hashlib.sha1(diff_text.encode("utf-8", "surrogateescape")).hexdigest()
+
+def preview_key(path: str, dhash: str) -> Optional[PreviewKey]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, dhash)
+
+class PreviewCache:
+    """LRU of rendered previews, bounded by entry count and total text size."""
+
+    def __init__(self, max_entries: int = PREVIEW_CACHE_ENTRIES, max_bytes: int = PREVIEW_CACHE_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[PreviewKey, PreviewResult]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: Optional[PreviewKey]) -> Optional[PreviewResult]:
+        if key is None or key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key: Optional[PreviewKey], result: PreviewResult) -> None:
+        if key is None:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.text)
+        self._items[key] = result
+        self._bytes += len(result.text)
+        while self._items and (len(self._items) > self.max_entries or self._bytes > self.max_bytes):
+            _, dropped = self._items.popitem(last=False)
+            self._bytes -= len(dropped.text)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._bytes = 0
+
+def windowed_text(original: str, patched: str, context: int = WINDOW_CONTEXT) -> str:
+    """`patched` cut down to the changed lines plus `context` lines around each."""
+    lines = patched.splitlines(keepends=True)
+    spans: List[List[int]] = []
+    for start, end, _ in line_delta(patched.encode("utf-8", "surrogateescape"),
+                                    original.encode("utf-8", "surrogateescape")):
+        lo, hi = max(0, start - context), min(len(lines), end + context)
+        if spans and lo <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], hi)
+        else:
+            spans.append([lo, hi])
+    if not spans:
+        spans = [[0, min(len(lines), 2 * context)]]
+    out, pos = [], 0
+    for lo, hi in spans:
+        if lo > pos:
+            out.append(f"⋯ {lo - pos} unchanged line(s) ⋯\n")
+        out.extend(lines[lo:hi])
+        if out and not out[-1].endswith("\n"):
+            out[-1] += "\n"
+        pos = hi
+    if pos < len(lines):
+        out.append(f"⋯ {len(lines) - pos} unchanged line(s) ⋯\n")
+    return "".join(out)
+
+def render_preview(path: str, transform: Callable[[str], str]) -> PreviewResult:
+    """Patch `path` in memory; huge files come back windowed around their changes."""
+    result = PreviewResult(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            original = f.read()
+        patched = transform(original)
+    except ValueError as e:
+        result.error = str(e)
+        return result
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+    result.changed = patched.rstrip("\n") != original.rstrip("\n")
+    if len(original) > WINDOW_BYTES or original.count("\n") > WINDOW_LINES:
+        result.text = windowed_text(original, patched)
+        result.windowed = True
+    else:
+        result.text = patched
+    return result
@@ -0,0 +1,71 @@
+"""
+Route patch hunks by their `---`/`+++` file headers.
+
+A multi-file patch (`git diff`, `diff -ru`) names the file every hunk
+belongs to. The header path is resolved against a root after stripping
+`strip` leading components, like `patch -p<strip>`. With strip=None the
+level is guessed: the first of AUTO_STRIP_LEVELS under which the file
+exists wins, so both `a/src/x.py` and `src/x.py` resolve. Resolved files
+are confined to the root: absolute headers are never taken as-is, `..`
+components are dropped and symlinks must not lead out of the tree. Hunks
+whose file does not resolve fall back to a content search, done by the
+caller.
+"""
+import os
+from typing import Iterable, Optional
+
+DEV_NULL = "/dev/null"
+AUTO_STRIP_LEVELS = (1, 0, 2, 3)
+
+def _unquote(path: str) -> str:
+    # git quotes paths with unusual characters: "a/with space\\tand tab"
+    if len(path) < 2 or not path[0] == path[-1] == '"':
+        return path
+    inner = path[1:-1]
+    try:
+        # octal escapes are UTF-8 bytes
+        return inner.encode("latin-1").decode("unicode_escape").encode("latin-1").decode("utf-8")
+    except (UnicodeError, ValueError):
+        return inner
+
+def header_path(line: str) -> Optional[str]:
+    """Path from a `--- path` / `+++ path` line, without timestamp; None for /dev/null."""
+    rest = line[4:].rstrip("\r\n")
+    if rest.startswith('"'):
+        end = rest.find('"', 1)
+        while end > 0 and rest[end - 1] == "\\":
+            end = rest.find('"', end + 1)
+        path = _unquote(rest[:end + 1]) if end > 0 else rest
+    else:
+        path = rest.split("\t", 1)[0].rstrip()
+    return None if not path or path == DEV_NULL else path
+
+def strip_components(path: str, strip: int) -> Optional[str]:
+    """Relative `path` without its first `strip` components; `.` and `..` parts never count."""
+    parts = [p for p in path.replace("\\", "/").split("/") if p and p not in (".", "..")]
+    if strip >= len(parts):
+        return None
+    return os.path.join(*parts[strip:])
+
+def resolve_patch_path(paths: Iterable[Optional[str]], root: str,
+                       strip: Optional[int] = None) -> Optional[str]:
+    """First existing file named by `paths` (new name, then old) inside `root`."""
+    levels = AUTO_STRIP_LEVELS if strip is None else (strip,)
+    real_root = os.path.realpath(root)
+    for level in levels:
+        for path in paths:
+            if not path or (level == 0 and os.path.isabs(path)):
+                continue
+            rel = strip_components(path, level)
+            if rel is None or os.path.isabs(rel) or os.path.splitdrive(rel)[0]:
+                continue
+            full = os.path.join(root, rel)
+            if os.path.isfile(full) and _inside(full, real_root):
+                return os.path.normpath(full)
+    return None
+
+def _inside(path: str, real_root: str) -> bool:
+    try:
+        return os.path.commonpath([os.path.realpath(path), real_root]) == real_root
+    except ValueError:              # different drives
+        return False
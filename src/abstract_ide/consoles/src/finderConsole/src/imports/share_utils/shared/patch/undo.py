@@ -0,0 +1,127 @@
+"""
+Undo journal for batch applies.
+
+Each committed batch leaves one record, `<txid>.undo`, instead of a `.bak`
+copy beside every file. A record is zlib-compressed JSON. Per target it
+holds the line delta back to the old content (see delta.line_delta) and
+the hashes of the content before and after the apply. Undo only touches a
+file whose current hash still matches the recorded new hash, so later edits
+are never clobbered. Restores go through the same PatchTransaction as the
+apply: all of a record's files come back, or none do.
+
+Records older than UNDO_MAX_AGE are pruned whenever a new one is written.
+"""
+import json
+import os
+import time
+import zlib
+from typing import Callable, List, Optional
+
+from .batch import BatchResult, PatchTransaction, PreparedChange, _read_bytes, _unlink
+from .delta import apply_delta, content_hash
+
+UNDO_MAX_AGE = 14 * 24 * 3600     # seconds a record is kept
+UNDO_SUFFIX = ".undo"
+
+def default_undo_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "abstract_ide", "undo")
+
+class UndoJournal:
+    """One compressed record per applied batch, newest undone first."""
+
+    def __init__(self, directory: Optional[str] = None, max_age: float = UNDO_MAX_AGE) -> None:
+        self.directory = directory or default_undo_dir()
+        self.max_age = max_age
+
+    def _path(self, txid: str) -> str:
+        return os.path.join(self.directory, txid + UNDO_SUFFIX)
+
+    def record(self, txid: str, entries: List[dict]) -> str:
+        """Write the reverse deltas of a committed batch; returns the record path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(txid)
+        blob = zlib.compress(json.dumps({"txid": txid, "created": time.time(),
+                                         "entries": entries}).encode("utf-8"))
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self.prune()
+        return path
+
+    def records(self) -> List[str]:
+        """Record paths, newest first (txids start with their timestamp)."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, n)
+                for n in sorted((n for n in names if n.endswith(UNDO_SUFFIX)), reverse=True)]
+
+    def load(self, path: str) -> dict:
+        with open(path, "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+    def prune(self, max_age: Optional[float] = None) -> int:
+        """Drop records older than `max_age` seconds; returns how many went."""
+        cutoff = time.time() - (self.max_age if max_age is None else max_age)
+        dropped = 0
+        for path in self.records():
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+                    dropped += 1
+            except FileNotFoundError:
+                pass
+        return dropped
+
+    def undo(self, path: str, log: Callable[[str], None] = lambda _msg: None) -> BatchResult:
+        """Restore every file of one record, or none; the record is removed once undone."""
+        record = self.load(path)
+        result = BatchResult(txid=record.get("txid"))
+        changes: List[PreparedChange] = []
+        created: List[str] = []
+        for entry in record.get("entries", []):
+            target = entry["target"]
+            current = _read_bytes(target)
+            if current is None or content_hash(current) != entry["new_hash"]:
+                result.failed.append((target, "modified since the apply"))
+                log(f"Cannot undo, modified since the apply: {target}\n")
+                continue
+            if not entry["existed"]:
+                created.append(target)
+                continue
+            old = apply_delta(current, entry["ops"])
+            if content_hash(old) != entry["old_hash"]:
+                result.failed.append((target, "undo data does not match"))
+                log(f"Cannot undo, undo data does not match: {target}\n")
+                continue
+            st = os.stat(target)
+            changes.append(PreparedChange(target, target, old, st.st_mtime_ns, st.st_size))
+        if result.failed:
+            log("Nothing restored\n")
+            return result
+        try:
+            txn = PatchTransaction(changes)
+            txn.stage()
+            txn.commit()
+        except Exception as e:
+            result.failed.append(("", f"{type(e).__name__}: {e}"))
+            log(f"Undo failed, files left as they were: {e}\n")
+            return result
+        for target in created:
+            _unlink(target)
+        result.committed = True
+        result.changed = [c.target for c in changes] + created
+        for target in result.changed:
+            log(f"Restored: {target}\n")
+        _unlink(path)
+        return result
+
+    def undo_last(self, log: Callable[[str], None] = lambda _msg: None) -> Optional[BatchResult]:
+        """Undo the newest record; None when there is nothing to undo."""
+        records = self.records()
+        return self.undo(records[0], log) if records else None
@@ -0,0 +1,2 @@
+from .index import *
+from .graph import *
@@ -0,0 +1,437 @@
+"""
+Module dependency graph over the files of an ImportIndex.
+
+Every indexed .py file is a node with a small integer id. Imports are
+resolved to nodes: relative ones by path from the importing file,
+absolute ones by dotted name. A file is known by its package name (found
+by climbing `__init__.py` directories) and by its path relative to the
+root. `import a.b.c` resolves to the longest prefix that is a file, and
+`from m import x` points at submodule `m.x` when that is a file, else at
+`m`. Imports that do not resolve (stdlib, third party) are not nodes.
+
+Edges live in per-node `array('i')` lists, forward (`fwd`) and reverse
+(`rev`). Strongly connected components (import cycles) are kept up to
+date as files change:
+
+- When an edge is removed inside a component, Tarjan is rerun on that
+  component only.
+- When an edge u->w is added, the graph is searched from w. If u is
+  reached, the components on those paths are merged.
+
+Transitive dependencies and dependents are int bitsets over node ids,
+memoized per component. A change to one file drops only the memos it can
+affect: its ancestors' dependency sets and its old and new descendants'
+dependent sets.
+"""
+import os
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .index import ImportIndex, ImportRecord
+
+REBUILD_FRACTION = 0.25           # sync() rebuilds when more of the graph than this changed
+
+def module_aliases(path: str, root: str, package_dirs: Set[str]) -> List[str]:
+    """Dotted names `path` is importable as: package-relative, then root-relative."""
+    d, base = os.path.split(path)
+    stem = os.path.splitext(base)[0]
+    parts = [] if stem == "__init__" else [stem]
+    while d in package_dirs:
+        d, pkg = os.path.split(d)
+        parts.append(pkg)
+    names = [".".join(reversed(parts))] if parts else []
+    rel = os.path.relpath(path, root)
+    if not rel.startswith(os.pardir):
+        rel_parts = os.path.splitext(rel)[0].split(os.sep)
+        if rel_parts[-1] == "__init__":
+            rel_parts.pop()
+        dotted = ".".join(rel_parts)
+        if rel_parts and dotted not in names:
+            names.append(dotted)
+    return names
+
+def _path_key(path: str) -> str:
+    # what relative imports of this file resolve through: the package dir or the stem
+    stem = os.path.splitext(path)[0]
+    return os.path.dirname(path) if os.path.basename(stem) == "__init__" else stem
+
+def _bit_indexes(bits: int) -> List[int]:
+    return [i for i, c in enumerate(reversed(bin(bits)[2:])) if c == "1"]
+
+def _tarjan(nodes: Iterable[int], fwd: List[array], allowed: Optional[Set[int]] = None) -> List[List[int]]:
+    """Strongly connected components of the subgraph on `nodes` (iterative Tarjan)."""
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    on_stack: Set[int] = set()
+    stack: List[int] = []
+    out: List[List[int]] = []
+    counter = 0
+    for s in nodes:
+        if s in index:
+            continue
+        index[s] = low[s] = counter
+        counter += 1
+        stack.append(s)
+        on_stack.add(s)
+        work = [(s, 0)]
+        while work:
+            v, k = work[-1]
+            adj = fwd[v]
+            if k < len(adj):
+                work[-1] = (v, k + 1)
+                w = adj[k]
+                if allowed is not None and w not in allowed:
+                    continue
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, 0))
+                elif w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] == index[v]:
+                comp = []
+                while True:
+                    w = stack.pop()
+                    on_stack.discard(w)
+                    comp.append(w)
+                    if w == v:
+                        break
+                out.append(comp)
+    return out
+
+class ModuleGraph:
+    """Resolved import graph for one root; not thread-safe."""
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.realpath(root)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.paths: List[Optional[str]] = []
+        self.fwd: List[array] = []
+        self.rev: List[array] = []
+        self.comp = array("i")
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[str, List[int]] = {}
+        self._keys: List[List[str]] = []
+        self._records: List[Optional[List[ImportRecord]]] = []
+        self._waiting: Dict[str, Set[int]] = {}
+        self._waits: List[Set[str]] = []
+        self._package_dirs: Set[str] = set()
+        self._members: Dict[int, List[int]] = {}
+        self._next_cid = 0
+        self._down: Dict[int, int] = {}
+        self._up: Dict[int, int] = {}
+
+    @classmethod
+    def from_index(cls, index: ImportIndex, files: Iterable[str]) -> "ModuleGraph":
+        graph = cls(index.root)
+        graph.build(index, files)
+        return graph
+
+    # ─────────────────── building ───────────────────
+    def build(self, index: ImportIndex, files: Iterable[str]) -> None:
+        """Resolve every file from scratch; one Tarjan pass over the whole graph."""
+        self._reset()
+        files = sorted(set(files))
+        self._package_dirs = {os.path.dirname(p) for p in files if os.path.basename(p) == "__init__.py"}
+        for p in files:
+            self._add_node(p, relink=False)
+        for i, p in enumerate(files):
+            self._records[i] = index.records(p)
+            targets, waits = self._resolve(i)
+            self.fwd[i] = array("i", sorted(targets))
+            self._set_waits(i, waits)
+        for i, adj in enumerate(self.fwd):
+            for w in adj:
+                self.rev[w].append(i)
+        self._members.clear()
+        for comp in _tarjan(range(len(self.paths)), self.fwd):
+            self._new_comp(comp)
+
+    def sync(self, index: ImportIndex, files: Iterable[str]) -> int:
+        """
+        Bring the graph in line with `files` and their current records,
+        updating only files that were added, removed or re-parsed. Returns
+        the number of files that changed.
+        """
+        files = list(files)
+        current = set(files)
+        added = [p for p in files if p not in self._ids]
+        removed = [p for p in self._ids if p not in current]
+        changed = [p for p in files if p in self._ids and self._records[self._ids[p]] != index.records(p)]
+        count = len(added) + len(removed) + len(changed)
+        if not count:
+            return 0
+        # a new/removed __init__.py renames the modules around it
+        structural = any(os.path.basename(p) == "__init__.py" for p in added + removed)
+        if structural or count > REBUILD_FRACTION * max(len(self._ids), 1):
+            self.build(index, files)
+            return count
+        for p in removed:
+            self.remove(p)
+        for p in added:
+            self._add_node(p, relink=True)
+        for p in added + changed:
+            self.update(p, index.records(p))
+        return count
+
+    def update(self, path: str, records: List[ImportRecord]) -> None:
+        """Re-resolve one file's imports and patch components and memos around it."""
+        i = self._ids.get(path)
+        if i is None:
+            i = self._add_node(path, relink=True)
+        self._records[i] = records
+        targets, waits = self._resolve(i)
+        self._set_waits(i, waits)
+        self._set_edges(i, targets)
+
+    def remove(self, path: str) -> None:
+        i = self._ids.pop(path, None)
+        if i is None:
+            return
+        self._set_edges(i, set())
+        self._set_waits(i, set())
+        for key in self._keys[i]:
+            ids = self._names.get(key)
+            if ids and i in ids:
+                ids.remove(i)
+                if not ids:
+                    del self._names[key]
+        self._keys[i] = []
+        self.paths[i] = None
+        self._records[i] = None
+        for j in list(self.rev[i]):
+            if self.paths[j] is not None:
+                self.update(self.paths[j], self._records[j])
+
+    def _add_node(self, path: str, relink: bool) -> int:
+        i = len(self.paths)
+        self.paths.append(path)
+        self.fwd.append(array("i"))
+        self.rev.append(array("i"))
+        self.comp.append(-1)
+        self._records.append([])
+        self._waits.append(set())
+        self._ids[path] = i
+        keys = module_aliases(path, self.root, self._package_dirs) + [_path_key(path)]
+        self._keys.append(keys)
+        for key in keys:
+            self._names.setdefault(key, []).append(i)
+        if relink:
+            self._new_comp([i])
+            waiting = set()
+            for key in keys:
+                waiting |= self._waiting.get(key, set())
+            for j in sorted(waiting):
+                if j != i and self.paths[j] is not None:
+                    self.update(self.paths[j], self._records[j])
+        return i
+
+    # ─────────────────── resolution ───────────────────
+    def _lookup(self, key: str, near: str) -> Optional[int]:
+        ids = self._names.get(key)
+        if not ids:
+            return None
+        if len(ids) == 1:
+            return ids[0]
+        # same dotted name in several places: prefer the one closest to the importer
+        return max(ids, key=lambda j: len(os.path.commonpath([self.paths[j], near])))
+
+    def _resolve(self, i: int) -> Tuple[Set[int], Set[str]]:
+        """Node ids file `i` imports, and the keys it is still waiting on."""
+        path = self.paths[i]
+        targets: Set[int] = set()
+        waits: Set[str] = set()
+        for module, level, names in self._records[i] or ():
+            if level:
+                base = os.path.dirname(path)
+                for _ in range(level - 1):
+                    base = os.path.dirname(base)
+                key = os.path.join(base, *module.split(".")) if module else base
+                sep = os.sep
+                target = self._lookup(key, path)
+                full = True
+            else:
+                key, sep = module, "."
+                target = self._lookup(key, path)
+                full = target is not None
+                parts = module.split(".")
+                for k in range(len(parts) - 1, 0, -1):
+                    if target is not None:
+                        break
+                    target = self._lookup(".".join(parts[:k]), path)
+            if not full or target is None:
+                waits.add(key)
+            needs_target = not names
+            for name in names:
+                if name == "*":
+                    needs_target = True
+                    continue
+                sub = self._lookup(key + sep + name, path)
+                if sub is None:
+                    needs_target = True
+                    waits.add(key + sep + name)
+                else:
+                    targets.add(sub)
+            if needs_target and target is not None:
+                targets.add(target)
+        targets.discard(i)
+        return targets, waits
+
+    def _set_waits(self, i: int, waits: Set[str]) -> None:
+        old = self._waits[i]
+        for key in old - waits:
+            ids = self._waiting.get(key)
+            if ids is not None:
+                ids.discard(i)
+                if not ids:
+                    del self._waiting[key]
+        for key in waits - old:
+            self._waiting.setdefault(key, set()).add(i)
+        self._waits[i] = waits
+
+    # ─────────────── edges and components ───────────────
+    def _set_edges(self, i: int, targets: Set[int]) -> None:
+        old = set(self.fwd[i])
+        if targets == old:
+            return
+        removed, added = old - targets, targets - old
+        before = self._reach([i], self.fwd) if self._up else set()
+        self.fwd[i] = array("i", sorted(targets))
+        for w in removed:
+            self.rev[w] = array("i", (x for x in self.rev[w] if x != i))
+        for w in added:
+            self.rev[w].append(i)
+        c = self.comp[i]
+        if any(self.comp[w] == c for w in removed):
+            self._split(c)
+        outside = [w for w in added if self.comp[w] != self.comp[i]]
+        if outside:
+            self._merge_through(i, outside)
+        if self._down:
+            for n in self._reach([i], self.rev):
+                self._down.pop(self.comp[n], None)
+        if self._up:
+            for n in before | self._reach([i], self.fwd):
+                self._up.pop(self.comp[n], None)
+
+    def _reach(self, starts: Iterable[int], adj: List[array], within: Optional[Set[int]] = None) -> Set[int]:
+        seen = set(starts)
+        stack = list(seen)
+        while stack:
+            for w in adj[stack.pop()]:
+                if w not in seen and (within is None or w in within):
+                    seen.add(w)
+                    stack.append(w)
+        return seen
+
+    def _new_comp(self, nodes: List[int]) -> int:
+        cid = self._next_cid
+        self._next_cid += 1
+        self._members[cid] = list(nodes)
+        for n in nodes:
+            self.comp[n] = cid
+        return cid
+
+    def _retire(self, cid: int) -> List[int]:
+        self._down.pop(cid, None)
+        self._up.pop(cid, None)
+        return self._members.pop(cid, [])
+
+    def _split(self, cid: int) -> None:
+        members = self._members[cid]
+        pieces = _tarjan(members, self.fwd, allowed=set(members))
+        if len(pieces) > 1:
+            self._retire(cid)
+            for piece in pieces:
+                self._new_comp(piece)
+
+    def _merge_through(self, i: int, starts: List[int]) -> None:
+        # new edges i -> starts close a cycle iff some start reaches i
+        ahead = self._reach(starts, self.fwd)
+        if i not in ahead:
+            return
+        on_cycle = self._reach([i], self.rev, within=ahead)
+        cids = {self.comp[n] for n in on_cycle}
+        if len(cids) < 2:
+            return
+        merged: List[int] = []
+        for cid in cids:
+            merged.extend(self._retire(cid))
+        self._new_comp(merged)
+
+    # ─────────────────── closures ───────────────────
+    def _closure(self, cid: int, adj: List[array], memo: Dict[int, int]) -> int:
+        """Bitset of nodes reachable from component `cid` along `adj`, itself included."""
+        succ: Dict[int, Set[int]] = {}
+        stack = [cid]
+        while stack:
+            c = stack[-1]
+            if c in memo:
+                stack.pop()
+                continue
+            if c not in succ:
+                succ[c] = {self.comp[w] for n in self._members[c] for w in adj[n]} - {c}
+            todo = [d for d in succ[c] if d not in memo]
+            if todo:
+                stack.extend(todo)
+                continue
+            bits = 0
+            for n in self._members[c]:
+                bits |= 1 << n
+            for d in succ[c]:
+                bits |= memo[d]
+            memo[c] = bits
+            stack.pop()
+        return memo[cid]
+
+    def _node(self, path: str) -> int:
+        i = self._ids.get(path)
+        if i is None:
+            raise KeyError(f"Not in the module graph: {path}")
+        return i
+
+    def _paths_of(self, bits: int) -> List[str]:
+        return sorted(self.paths[n] for n in _bit_indexes(bits) if self.paths[n] is not None)
+
+    # ─────────────────── queries ───────────────────
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._ids
+
+    def dependencies(self, path: str, transitive: bool = True) -> List[str]:
+        """Files `path` imports, directly or (default) through other files."""
+        i = self._node(path)
+        if not transitive:
+            return sorted(self.paths[w] for w in self.fwd[i])
+        return self._paths_of(self._closure(self.comp[i], self.fwd, self._down) & ~(1 << i))
+
+    def dependents(self, path: str, transitive: bool = True) -> List[str]:
+        """Files that import `path`: what is affected when it changes."""
+        i = self._node(path)
+        if not transitive:
+            return sorted(self.paths[j] for j in self.rev[i])
+        return self._paths_of(self._closure(self.comp[i], self.rev, self._up) & ~(1 << i))
+
+    def cycle_of(self, path: str) -> List[str]:
+        """The import cycle `path` is part of; empty when it is in none."""
+        members = self._members[self.comp[self._node(path)]]
+        return sorted(self.paths[n] for n in members) if len(members) > 1 else []
+
+    def cycles(self) -> List[List[str]]:
+        """Every import cycle (component of more than one file), largest first."""
+        out = [sorted(self.paths[n] for n in m) for m in self._members.values() if len(m) > 1]
+        out.sort(key=lambda c: (-len(c), c[0]))
+        return out
+
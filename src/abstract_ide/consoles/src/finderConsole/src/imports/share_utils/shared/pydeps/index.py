@@ -0,0 +1,207 @@
+"""
+Python import index used by the Extract Imports tab.
+
+Each file is parsed once with `ast`; every Import/ImportFrom statement,
+nested ones included, becomes an ImportRecord (module, level, names). Only
+statement bodies are walked (imports are never expressions), which skips
+the bulk of the tree. Parsing runs in the search pool (engine
+`_make_executor`) and results are kept in one SQLite file per root
+directory (under ~/.cache/abstract_ide/imports), keyed by path with
+mtime_ns/size. A refresh only re-parses files whose stat
+changed, so reopening a large project costs one stat per file.
+
+Files that do not parse are stored with no records, so they are not retried
+until they change.
+"""
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..search.cancel import CancelToken
+from ..search.engine import _make_executor, _shards, _workers_for
+from ..walk.latency import io_profile
+
+INDEX_VERSION = "1"
+INLINE_PARSE_LIMIT = 64           # below this many stale files, parse in-thread
+WRITE_BATCH = 2000                # rows per transaction
+
+# (module, level, names): `from ..a.b import c, d` -> ("a.b", 2, ("c", "d")),
+# `import a.b` -> ("a.b", 0, ())
+ImportRecord = Tuple[str, int, Tuple[str, ...]]
+
+def default_imports_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "abstract_ide", "imports")
+
+_BODIES = ("body", "orelse", "finalbody", "handlers", "cases")
+
+def parse_imports(source, filename: str = "<unknown>") -> Optional[List[ImportRecord]]:
+    """All imports in `source` (str or bytes), sorted; None if it does not parse."""
+    try:
+        tree = ast.parse(source, filename)
+    except (SyntaxError, ValueError):
+        return None
+    out: List[ImportRecord] = []
+    stack = list(tree.body)
+    while stack:
+        node = stack.pop()
+        for attr in _BODIES:
+            sub = getattr(node, attr, None)
+            if isinstance(sub, list):
+                stack.extend(sub)
+        if isinstance(node, ast.Import):
+            out.extend((a.name, 0, ()) for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            out.append((node.module or "", node.level or 0, tuple(a.name for a in node.names)))
+    out.sort(key=lambda r: (r[1], r[0]))
+    return out
+
+def import_names(record: ImportRecord) -> List[str]:
+    """Display names for a record: the module as written, dots included."""
+    module, level, names = record
+    prefix = "." * level
+    if module:
+        return [prefix + module]
+    return [prefix + n for n in names if n != "*"] or [prefix]
+
+def _parse_shard(paths: List[str]) -> list:
+    """Pool entry point: (path, mtime_ns, size, records|None) per readable file."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            with open(p, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        out.append((p, st.st_mtime_ns, st.st_size, parse_imports(data, p)))
+    return out
+
+class ImportIndex:
+    """Per-root import cache; use from a single thread (the extract worker)."""
+
+    def __init__(self, root: str, index_dir: Optional[str] = None) -> None:
+        self.root = os.path.realpath(root)
+        index_dir = index_dir or default_imports_dir()
+        os.makedirs(index_dir, exist_ok=True)
+        digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        self.db_path = os.path.join(index_dir, f"{digest}.sqlite")
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        # path -> (mtime_ns, size, records)
+        self._rows: Dict[str, Tuple[int, int, List[ImportRecord]]] = {}
+        self._load_rows()
+
+    # ───────────── schema / bookkeeping ─────────────
+    def _init_schema(self) -> None:
+        c = self._conn
+        c.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
+        row = c.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        if row and row[0] != INDEX_VERSION:
+            c.executescript("DROP TABLE IF EXISTS files; DELETE FROM meta;")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS files(
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                imports TEXT NOT NULL) WITHOUT ROWID
+        """)
+        c.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('version', ?)", (INDEX_VERSION,))
+        c.execute("INSERT OR IGNORE INTO meta(key, value) VALUES('root', ?)", (self.root,))
+        c.commit()
+
+    def _load_rows(self) -> None:
+        self._rows = {
+            path: (mtime, size, [(m, lv, tuple(ns)) for m, lv, ns in json.loads(imports)])
+            for path, mtime, size, imports in
+            self._conn.execute("SELECT path, mtime_ns, size, imports FROM files")
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ─────────────────── refresh ───────────────────
+    def stale_paths(self, files: Iterable[str]) -> List[str]:
+        """Paths that are new or whose (mtime, size) differs from the index."""
+        stale = []
+        for p in files:
+            row = self._rows.get(p)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            if row is None or row[0] != st.st_mtime_ns or row[1] != st.st_size:
+                stale.append(p)
+        return stale
+
+    def refresh(self, files: List[str], max_workers: Optional[int] = None,
+                token: Optional[CancelToken] = None) -> int:
+        """
+        Bring the index up to date for `files`. Only new/changed files are
+        parsed; indexed paths under the root that no longer exist are
+        dropped. Returns the number of files (re)parsed.
+        """
+        stale = self.stale_paths(files)
+        if stale:
+            profile = io_profile(self.root)
+            workers = _workers_for(profile, max_workers)
+            inline = workers <= 1 or len(stale) <= INLINE_PARSE_LIMIT
+            with (nullcontext() if inline else _make_executor(workers, token, profile)) as ex:
+                parts = [_parse_shard(stale)] if inline else ex.map(_parse_shard, _shards(stale, workers))
+                batch = []
+                for part in parts:
+                    batch.extend(part)
+                    if len(batch) >= WRITE_BATCH:
+                        self._write(batch)
+                        batch = []
+                    if token is not None and token.cancelled:
+                        break
+                self._write(batch)
+        self._drop_missing(set(files))
+        return len(stale)
+
+    def _write(self, entries: list) -> None:
+        if not entries:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files(path, mtime_ns, size, imports) VALUES(?, ?, ?, ?)",
+                [(p, m, s, json.dumps(r or [])) for p, m, s, r in entries])
+        for p, m, s, r in entries:
+            self._rows[p] = (m, s, r or [])
+
+    def _drop_missing(self, current: Set[str]) -> None:
+        gone = [p for p in self._rows.keys() - current
+                if p.startswith(self.root) and not os.path.exists(p)]
+        if not gone:
+            return
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path=?", [(p,) for p in gone])
+        for p in gone:
+            self._rows.pop(p, None)
+
+    # ─────────────────── queries ───────────────────
+    def records(self, path: str) -> List[ImportRecord]:
+        row = self._rows.get(path)
+        return row[2] if row else []
+
+    def by_file(self, files: Iterable[str]) -> Dict[str, List[ImportRecord]]:
+        return {p: self._rows[p][2] for p in files if p in self._rows}
+
+    def reverse(self, files: Iterable[str]) -> Dict[str, List[str]]:
+        """Import name -> sorted files that import it, over `files`."""
+        idx: Dict[str, Set[str]] = {}
+        for p in files:
+            row = self._rows.get(p)
+            if row is None:
+                continue
+            for rec in row[2]:
+                for name in import_names(rec):
+                    idx.setdefault(name, set()).add(p)
+        return {name: sorted(paths) for name, paths in idx.items()}
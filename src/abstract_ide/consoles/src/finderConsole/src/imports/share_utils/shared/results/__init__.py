@@ -1,2 +1,5 @@
 from .params import *
 from .results import *
+from .result_model import *
+from .map_model import *
+from .chip_model import *
@@ -0,0 +1,462 @@
+"""
+Virtualized "chip" list (the Extract Imports tab's imports).
+
+ChipModel keeps the strings and, built once per set_items(), their lowercase
+forms joined into one newline-separated haystack with a row-offset array.
+ChipFilterProxy shows a sorted array of source rows; filtering is a
+str.find sweep over the haystack, or a pass over the rows already shown
+when the needle only grew, followed by a single model reset.
+
+ChipView replaces QListView's flow layout. Chip widths are measured once
+per string by ChipDelegate and cached. A layout is then just integer
+arithmetic over the shown rows (first row of every visual line, plus each
+chip's x and width), and painting and hit testing touch only the visual
+lines inside the viewport.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Set
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QAbstractProxyModel, QEvent, QItemSelection, QModelIndex, QRect, QRectF, QSize
+from PyQt6.QtGui import QPainter, QRegion
+from PyQt6.QtWidgets import QAbstractItemView, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+CHIP_PAD_X = 12          # px of text padding on each side of a chip
+CHIP_PAD_Y = 5
+CHIP_MIN_WIDTH = 80
+CHIP_MAX_WIDTH = 380     # longer names are elided
+CHIP_SPACING = 6
+CHIP_RADIUS = 8.0
+
+class ChipModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[str] = []
+        self._lower: List[str] = []
+        self._haystack = ""
+        self._offsets = array("I")
+
+    def set_items(self, items: Iterable[str]) -> None:
+        self.beginResetModel()
+        self._items = list(items)
+        self._lower = [s.lower() for s in self._items]
+        self._haystack = "\n".join(self._lower)
+        self._offsets = array("I")
+        pos = 0
+        for s in self._lower:
+            self._offsets.append(pos)
+            pos += len(s) + 1
+        self.endResetModel()
+
+    def items(self) -> List[str]:
+        return self._items
+
+    def match_rows(self, needle: str, within: Optional[array] = None) -> array:
+        """Source rows whose lowercase text contains `needle` (already lowercase), ascending."""
+        if not needle:
+            return array("I", range(len(self._items))) if within is None else array("I", within)
+        if within is not None:
+            lower = self._lower
+            return array("I", (r for r in within if needle in lower[r]))
+        out = array("I")
+        hay, offsets = self._haystack, self._offsets
+        last = len(offsets) - 1
+        pos = hay.find(needle)
+        while pos >= 0:
+            row = bisect_right(offsets, pos) - 1
+            out.append(row)
+            if row >= last:
+                break
+            pos = hay.find(needle, offsets[row + 1])
+        return out
+
+    # ───────────── Qt model API ─────────────
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._items[index.row()]
+        return None
+
+class ChipFilterProxy(QAbstractProxyModel):
+    """Substring filter over a ChipModel; the shown rows are an ascending array of source rows."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = array("I")
+        self._needle = ""
+
+    def setSourceModel(self, model: ChipModel) -> None:
+        self.beginResetModel()
+        old = self.sourceModel()
+        if old is not None:
+            old.modelReset.disconnect(self._source_reset)
+        super().setSourceModel(model)
+        model.modelReset.connect(self._source_reset)
+        self._rows = model.match_rows(self._needle)
+        self.endResetModel()
+
+    def _source_reset(self) -> None:
+        self.beginResetModel()
+        self._rows = self.sourceModel().match_rows(self._needle)
+        self.endResetModel()
+
+    def set_filter(self, text: str) -> None:
+        needle = text.strip().lower()
+        if needle == self._needle:
+            return
+        narrowing = bool(self._needle) and needle.startswith(self._needle)
+        rows = self.sourceModel().match_rows(needle, self._rows if narrowing else None)
+        self.beginResetModel()
+        self._rows = rows
+        self._needle = needle
+        self.endResetModel()
+
+    def filter_text(self) -> str:
+        return self._needle
+
+    def visible_texts(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Texts of shown rows [start, stop), without going through data()."""
+        items = self.sourceModel().items()
+        return [items[r] for r in self._rows[start:stop]]
+
+    # ───────────── Qt proxy API ─────────────
+    def index(self, row, column=0, parent=QModelIndex()) -> QModelIndex:
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, proxy_index) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        pos = bisect_left(self._rows, row)
+        if pos < len(self._rows) and self._rows[pos] == row:
+            return self.createIndex(pos, 0)
+        return QModelIndex()
+
+class ChipDelegate(QStyledItemDelegate):
+    """Rounded chips; widths are measured once per string and font."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._widths: dict = {}
+
+    def reset_metrics(self) -> None:
+        self._widths.clear()
+
+    def chip_width(self, text: str, fm) -> int:
+        w = self._widths.get(text)
+        if w is None:
+            w = min(max(fm.horizontalAdvance(text) + 2 * CHIP_PAD_X, CHIP_MIN_WIDTH), CHIP_MAX_WIDTH)
+            self._widths[text] = w
+        return w
+
+    def chip_height(self, fm) -> int:
+        return fm.height() + 2 * CHIP_PAD_Y
+
+    def sizeHint(self, option, index):
+        fm = option.fontMetrics
+        return QSize(self.chip_width(index.data() or "", fm), self.chip_height(fm))
+
+    def paint(self, painter, option, index):
+        text = index.data() or ""
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        pal = option.palette
+        rect = option.rect.adjusted(0, 0, -1, -1)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(pal.highlight().color() if option.state & QStyle.StateFlag.State_HasFocus else pal.mid().color())
+        painter.setBrush(pal.highlight() if selected else pal.alternateBase())
+        painter.drawRoundedRect(QRectF(rect), CHIP_RADIUS, CHIP_RADIUS)
+        painter.setPen(pal.highlightedText().color() if selected else pal.text().color())
+        shown = option.fontMetrics.elidedText(text, Qt.TextElideMode.ElideRight, rect.width() - 2 * CHIP_PAD_X)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, shown)
+        painter.restore()
+
+class ChipView(QAbstractItemView):
+    """Wrapped rows of chips over a ChipFilterProxy; only visible lines are painted or hit tested."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setItemDelegate(ChipDelegate(self))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._line_starts = array("I")      # first shown row of each visual line
+        self._xs = array("I")
+        self._ws = array("I")
+        self._layout_width = -1
+        self._dirty = True
+
+    # ───────────── layout ─────────────
+    def _invalidate(self) -> None:
+        self._dirty = True
+        self.updateGeometries()
+        self.viewport().update()
+
+    def _chip_height(self) -> int:
+        return self.itemDelegate().chip_height(self.fontMetrics())
+
+    def _pitch(self) -> int:
+        return self._chip_height() + CHIP_SPACING
+
+    def _ensure_layout(self) -> None:
+        width = self.viewport().width()
+        if not self._dirty and width == self._layout_width:
+            return
+        self._dirty = False
+        self._layout_width = width
+        starts, xs, ws = array("I"), array("I"), array("I")
+        model = self.model()
+        if model is not None and model.rowCount():
+            fm = self.fontMetrics()
+            chip_width = self.itemDelegate().chip_width
+            right = width - CHIP_SPACING
+            x = CHIP_SPACING
+            starts.append(0)
+            for row, text in enumerate(model.visible_texts()):
+                w = chip_width(text, fm)
+                if x > CHIP_SPACING and x + w > right:
+                    starts.append(row)
+                    x = CHIP_SPACING
+                xs.append(x)
+                ws.append(w)
+                x += w + CHIP_SPACING
+        self._line_starts, self._xs, self._ws = starts, xs, ws
+
+    def _line_of(self, row: int) -> int:
+        return bisect_right(self._line_starts, row) - 1
+
+    def _line_range(self, line: int) -> range:
+        stop = self._line_starts[line + 1] if line + 1 < len(self._line_starts) else len(self._xs)
+        return range(self._line_starts[line], stop)
+
+    def updateGeometries(self) -> None:
+        self._ensure_layout()
+        pitch = self._pitch()
+        total = CHIP_SPACING + len(self._line_starts) * pitch
+        bar = self.verticalScrollBar()
+        bar.setSingleStep(pitch)
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(0, total - self.viewport().height()))
+        super().updateGeometries()
+
+    def setModel(self, model) -> None:
+        super().setModel(model)
+        self._invalidate()
+
+    def reset(self) -> None:
+        super().reset()
+        self._invalidate()
+
+    def rowsInserted(self, parent, start, end) -> None:
+        super().rowsInserted(parent, start, end)
+        self._invalidate()
+
+    def rowsAboutToBeRemoved(self, parent, start, end) -> None:
+        super().rowsAboutToBeRemoved(parent, start, end)
+        self._dirty = True
+
+    def dataChanged(self, top_left, bottom_right, roles=()) -> None:
+        super().dataChanged(top_left, bottom_right, roles)
+        self._invalidate()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.updateGeometries()
+
+    def changeEvent(self, event) -> None:
+        if event.type() == QEvent.Type.FontChange:
+            self.itemDelegate().reset_metrics()
+            self._invalidate()
+        super().changeEvent(event)
+
+    # ───────────── geometry API ─────────────
+    def visualRect(self, index) -> QRect:
+        if not index.isValid():
+            return QRect()
+        self._ensure_layout()
+        row = index.row()
+        if row >= len(self._xs):
+            return QRect()
+        y = CHIP_SPACING + self._line_of(row) * self._pitch() - self.verticalOffset()
+        return QRect(self._xs[row], y, self._ws[row], self._chip_height())
+
+    def indexAt(self, point) -> QModelIndex:
+        self._ensure_layout()
+        model = self.model()
+        if model is None or not self._xs:
+            return QModelIndex()
+        pitch = self._pitch()
+        y = point.y() + self.verticalOffset() - CHIP_SPACING
+        line = y // pitch
+        if y < 0 or line >= len(self._line_starts) or y % pitch >= self._chip_height():
+            return QModelIndex()
+        rows = self._line_range(line)
+        row = bisect_right(self._xs, point.x(), rows.start, rows.stop) - 1
+        if row < rows.start or point.x() >= self._xs[row] + self._ws[row]:
+            return QModelIndex()
+        return model.index(row, 0)
+
+    def scrollTo(self, index, hint=QAbstractItemView.ScrollHint.EnsureVisible) -> None:
+        rect = self.visualRect(index)
+        if rect.isNull():
+            return
+        bar = self.verticalScrollBar()
+        height = self.viewport().height()
+        if hint == QAbstractItemView.ScrollHint.PositionAtTop:
+            bar.setValue(bar.value() + rect.top() - CHIP_SPACING)
+        elif hint == QAbstractItemView.ScrollHint.PositionAtBottom:
+            bar.setValue(bar.value() + rect.bottom() + 1 - height + CHIP_SPACING)
+        elif hint == QAbstractItemView.ScrollHint.PositionAtCenter:
+            bar.setValue(bar.value() + rect.center().y() - height // 2)
+        elif rect.top() < 0:
+            bar.setValue(bar.value() + rect.top() - CHIP_SPACING)
+        elif rect.bottom() >= height:
+            bar.setValue(bar.value() + rect.bottom() + 1 - height + CHIP_SPACING)
+
+    def horizontalOffset(self) -> int:
+        return 0
+
+    def verticalOffset(self) -> int:
+        return self.verticalScrollBar().value()
+
+    def isIndexHidden(self, index) -> bool:
+        return False
+
+    def moveCursor(self, action, modifiers) -> QModelIndex:
+        self._ensure_layout()
+        model = self.model()
+        count = len(self._xs)
+        if model is None or not count:
+            return QModelIndex()
+        current = self.currentIndex()
+        if not current.isValid():
+            return model.index(0, 0)
+        row = current.row()
+        A = QAbstractItemView.CursorAction
+        if action in (A.MoveLeft, A.MovePrevious):
+            row -= 1
+        elif action in (A.MoveRight, A.MoveNext):
+            row += 1
+        elif action == A.MoveHome:
+            row = 0
+        elif action == A.MoveEnd:
+            row = count - 1
+        elif action in (A.MoveUp, A.MoveDown, A.MovePageUp, A.MovePageDown):
+            step = 1 if action in (A.MoveUp, A.MoveDown) else max(1, self.viewport().height() // self._pitch())
+            if action in (A.MoveUp, A.MovePageUp):
+                step = -step
+            line = min(max(self._line_of(row) + step, 0), len(self._line_starts) - 1)
+            rows = self._line_range(line)
+            centre = self._xs[row] + self._ws[row] // 2
+            row = max(bisect_right(self._xs, centre, rows.start, rows.stop) - 1, rows.start)
+        return model.index(min(max(row, 0), count - 1), 0)
+
+    def setSelection(self, rect, command) -> None:
+        self._ensure_layout()
+        model = self.model()
+        selection = QItemSelection()
+        if model is not None and self._xs:
+            rect = rect.normalized()
+            pitch = self._pitch()
+            offset = self.verticalOffset() - CHIP_SPACING
+            first = max(0, (rect.top() + offset) // pitch)
+            last = min(len(self._line_starts) - 1, (rect.bottom() + offset) // pitch)
+            for line in range(first, last + 1):
+                rows = self._line_range(line)
+                lo = max(bisect_right(self._xs, rect.left(), rows.start, rows.stop) - 1, rows.start)
+                if self._xs[lo] + self._ws[lo] <= rect.left():
+                    lo += 1
+                hi = bisect_right(self._xs, rect.right(), rows.start, rows.stop)
+                if lo < hi:
+                    selection.select(model.index(lo, 0), model.index(hi - 1, 0))
+        self.selectionModel().select(selection, command)
+
+    def visualRegionForSelection(self, selection) -> QRegion:
+        viewport = self.viewport().rect()
+        region = QRegion()
+        for rng in selection:
+            if rng.bottom() - rng.top() > 256:
+                return QRegion(viewport)
+            for row in range(rng.top(), rng.bottom() + 1):
+                rect = self.visualRect(self.model().index(row, 0))
+                if rect.intersects(viewport):
+                    region = region.united(rect)
+        return region
+
+    # ───────────── painting ─────────────
+    def paintEvent(self, event) -> None:
+        self._ensure_layout()
+        model = self.model()
+        if model is None or not self._xs:
+            return
+        pitch, height = self._pitch(), self._chip_height()
+        offset = self.verticalOffset()
+        area = event.rect()
+        first = max(0, (area.top() + offset - CHIP_SPACING) // pitch)
+        last = min(len(self._line_starts) - 1, (area.bottom() + offset - CHIP_SPACING) // pitch)
+        option = QStyleOptionViewItem()
+        self.initViewItemOption(option)
+        base_state = option.state
+        selection = self.selectionModel()
+        current = self.currentIndex()
+        delegate = self.itemDelegate()
+        painter = QPainter(self.viewport())
+        for line in range(first, last + 1):
+            y = CHIP_SPACING + line * pitch - offset
+            for row in self._line_range(line):
+                index = model.index(row, 0)
+                option.rect = QRect(self._xs[row], y, self._ws[row], height)
+                state = base_state
+                if selection is not None and selection.isSelected(index):
+                    state |= QStyle.StateFlag.State_Selected
+                if index == current and self.hasFocus():
+                    state |= QStyle.StateFlag.State_HasFocus
+                option.state = state
+                delegate.paint(painter, option, index)
+        painter.end()
+
+    # ───────────── selection by text ─────────────
+    def selected_texts(self) -> List[str]:
+        model, selection = self.model(), self.selectionModel()
+        if model is None or selection is None:
+            return []
+        out: List[str] = []
+        for rng in selection.selection():
+            out.extend(model.visible_texts(rng.top(), rng.bottom() + 1))
+        return out
+
+    def select_texts(self, texts: Set[str]) -> None:
+        """Select the shown chips whose text is in `texts` (e.g. after a filter change)."""
+        model, selection = self.model(), self.selectionModel()
+        if model is None or selection is None:
+            return
+        ranges = QItemSelection()
+        start = None
+        shown = model.visible_texts()
+        for row, text in enumerate(shown + [None]):
+            if text is not None and text in texts:
+                if start is None:
+                    start = row
+            elif start is not None:
+                ranges.select(model.index(start, 0), model.index(row - 1, 0))
+                start = None
+        selection.select(ranges, selection.SelectionFlag.ClearAndSelect)
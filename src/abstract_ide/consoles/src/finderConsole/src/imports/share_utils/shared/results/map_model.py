@@ -0,0 +1,292 @@
+"""
+Lazily expanded directory map.
+
+Nothing is walked up front: a directory is listed (through the shared walker,
+so path filters and ignore files apply) the first time the view asks for its
+children, and only FETCH_BATCH entries at a time, so a huge flat directory
+streams in as it is scrolled. Collapsing a directory drops its subtree again,
+which keeps memory proportional to what is expanded rather than to the tree.
+Full-tree text for copy/save comes from `iter_directory_map` instead.
+
+With stats from `directory_stats` (set_stats) the Size / Files / Newest
+columns are filled in and the model can be sorted on them; a sorted
+directory is listed in full before its rows are ordered.
+"""
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from ..walk.dirstats import DirStats
+from ..walk.walker import walk_entries
+
+FETCH_BATCH = 1000   # entries added per fetchMore() call
+COLUMNS = ("Name", "Size", "Files", "Newest")
+NAME_COL, SIZE_COL, FILES_COL, NEWEST_COL = range(len(COLUMNS))
+
+def human_size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+class MapNode:
+    __slots__ = ("name", "path", "is_dir", "parent", "row", "children", "_source", "_stat")
+
+    def __init__(self, name: str, path: str, is_dir: bool,
+                 parent: Optional["MapNode"] = None, row: int = 0) -> None:
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = row
+        self.children: Optional[List["MapNode"]] = None   # None → not listed yet
+        self._source: Optional[Iterator] = None          # rest of a partial listing
+        self._stat = None                                # files: lazily stat'ed (size, mtime_ns)
+
+    def is_last(self) -> bool:
+        p = self.parent
+        return p is not None and p._source is None and self.row == len(p.children) - 1
+
+    def map_line(self) -> str:
+        """This entry as a line of the tree-style map (see iter_directory_map)."""
+        if self.parent is None or self.parent.parent is None:    # the mapped directory
+            return (self.name or self.path) + "/"
+        prefix, p = [], self.parent
+        while p.parent.parent is not None:
+            prefix.append("    " if p.is_last() else "│   ")
+            p = p.parent
+        return ("".join(reversed(prefix)) + ("└── " if self.is_last() else "├── ")
+                + self.name + ("/" if self.is_dir else ""))
+
+class DirectoryMapModel(QAbstractItemModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root: Optional[MapNode] = None
+        self._cfg: Any = None
+        self._recursive = True
+        self._include_files = True
+        self._stats: Dict[str, DirStats] = {}
+        self._sort: Optional[tuple] = None                # (column, Qt.SortOrder)
+
+    # ───────────── setup ─────────────
+    def set_root(self, directory: str, cfg: Any = None, recursive: bool = True,
+                 include_files: bool = True) -> None:
+        """Show `directory` as the single top-level row; its children load on demand."""
+        self.beginResetModel()
+        path = os.path.abspath(directory)
+        holder = MapNode("", "", True)
+        holder.children = [MapNode(os.path.basename(path) or path, path, True, holder, 0)]
+        self._root = holder
+        self._cfg = cfg
+        self._recursive = recursive
+        self._include_files = include_files
+        self._stats = {}
+        self.endResetModel()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._root = None
+        self.endResetModel()
+
+    def root_index(self) -> QModelIndex:
+        return self.index(0, 0) if self._root is not None else QModelIndex()
+
+    def _listing(self, node: MapNode) -> Iterator[MapNode]:
+        top = self._root.children[0].path
+        for e in walk_entries(node.path, self._cfg, False, include_dirs=True, ignore_root=top):
+            if e.is_dir or self._include_files:
+                yield MapNode(e.name, e.path, e.is_dir, node)
+
+    def _expandable(self, node: MapNode) -> bool:
+        return node.is_dir and (self._recursive or node.parent is self._root)
+
+    # ───────────── lazy loading ─────────────
+    def node(self, index: QModelIndex) -> Optional[MapNode]:
+        if index.isValid():
+            return index.internalPointer()
+        return self._root
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        node = self.node(parent)
+        if node is None:
+            return False
+        if node is self._root:
+            return True
+        return self._expandable(node) and (node.children is None or bool(node.children)
+                                           or node._source is not None)
+
+    def canFetchMore(self, parent) -> bool:
+        node = self.node(parent)
+        return (node is not None and node is not self._root and self._expandable(node)
+                and (node.children is None or node._source is not None))
+
+    def fetchMore(self, parent) -> None:
+        node = self.node(parent)
+        if not self.canFetchMore(parent):
+            return
+        if node.children is None:
+            node.children = []
+            node._source = self._listing(node)
+        if self._custom_sort():
+            rest = list(node._source)
+            node._source = None
+            batch = rest if node.children else self._sorted(rest)   # sort() reorders a mixed listing
+        else:
+            batch = list(islice(node._source, FETCH_BATCH))
+            if len(batch) < FETCH_BATCH:
+                node._source = None
+        if batch:
+            first = len(node.children)
+            self.beginInsertRows(parent, first, first + len(batch) - 1)
+            for i, child in enumerate(batch, first):
+                child.row = i
+            node.children.extend(batch)
+            self.endInsertRows()
+        elif node.children:
+            # the previous last row just became the real last one
+            last = self.index(len(node.children) - 1, 0, parent)
+            self.dataChanged.emit(last, last)
+
+    def release(self, index: QModelIndex) -> None:
+        """Forget a collapsed directory's subtree; it is listed afresh on the next expand."""
+        node = self.node(index)
+        if node is None or node is self._root or not node.children:
+            return
+        self.beginRemoveRows(index, 0, len(node.children) - 1)
+        node.children = None
+        node._source = None
+        self.endRemoveRows()
+
+    # ───────────── stats and sorting ─────────────
+    def set_stats(self, stats: Dict[str, DirStats]) -> None:
+        """Fill the Size / Files / Newest columns from `directory_stats` output."""
+        self.layoutAboutToBeChanged.emit()
+        self._stats = stats or {}
+        self.layoutChanged.emit()
+        if self._sort is not None:
+            self.sort(*self._sort)
+
+    def _custom_sort(self) -> bool:
+        return self._sort is not None and self._sort != (NAME_COL, Qt.SortOrder.AscendingOrder)
+
+    def _value(self, node: MapNode, column: int):
+        if column == NAME_COL:
+            return (node.is_dir, node.name)          # walker order: files, then dirs
+        if node.is_dir:
+            st = self._stats.get(node.path)
+            if st is None:
+                return -1
+            return {SIZE_COL: st.bytes, FILES_COL: st.files, NEWEST_COL: st.newest_mtime_ns}[column]
+        if node._stat is None:
+            try:
+                st = os.stat(node.path)
+                node._stat = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                node._stat = (-1, -1)
+        return {SIZE_COL: node._stat[0], FILES_COL: 1, NEWEST_COL: node._stat[1]}[column]
+
+    def _sorted(self, nodes: List[MapNode]) -> List[MapNode]:
+        column, order = self._sort
+        nodes.sort(key=lambda n: self._value(n, column),
+                   reverse=order == Qt.SortOrder.DescendingOrder)
+        for i, n in enumerate(nodes):
+            n.row = i
+        return nodes
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        """Order every listed directory's rows by `column`; later listings follow suit."""
+        if self._root is None:
+            return
+        self._sort = (column, order)
+        listed = []
+        stack = list(self._root.children or ())
+        while stack:
+            node = stack.pop()
+            if node.children is not None:
+                listed.append(node)
+                stack.extend(node.children)
+        if self._custom_sort():
+            for node in listed:                      # partial listings are completed first
+                while node._source is not None:
+                    self.fetchMore(self.createIndex(node.row, 0, node))
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        targets = [(i.internalPointer(), i.column()) for i in old]
+        for node in listed:
+            self._sorted(node.children)
+        self.changePersistentIndexList(old, [self.createIndex(n.row, c, n) for n, c in targets])
+        self.layoutChanged.emit()
+
+    # ───────────── Qt model API ─────────────
+    def index(self, row, column, parent=QModelIndex()) -> QModelIndex:
+        node = self.node(parent)
+        if (node is None or not 0 <= column < len(COLUMNS) or not node.children
+                or not 0 <= row < len(node.children)):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        p = index.internalPointer().parent
+        if p is None or p is self._root:
+            return QModelIndex()
+        return self.createIndex(p.row, 0, p)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        node = self.node(parent)
+        return len(node.children) if node is not None and node.children else 0
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if column != NAME_COL:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            if (role != Qt.ItemDataRole.DisplayRole or not self._stats
+                    or (node.is_dir and node.path not in self._stats)):
+                return None
+            value = self._value(node, column)
+            if value < 0:
+                return None
+            if column == SIZE_COL:
+                return human_size(value)
+            if column == NEWEST_COL:
+                return time.strftime("%Y-%m-%d %H:%M", time.localtime(value / 1e9)) if value else ""
+            return f"{value:,}" if node.is_dir else ""
+        if role == Qt.ItemDataRole.DisplayRole:
+            return node.name + ("/" if node.is_dir else "")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return node.path
+        if role == Qt.ItemDataRole.UserRole:
+            return {"file_path": node.path, "line": None}
+        return None
+
+    def map_lines(self, indexes) -> List[str]:
+        """Map lines for the given (selected) indexes, in tree order."""
+        nodes = [i.internalPointer() for i in indexes if i.isValid() and i.column() == 0]
+        nodes.sort(key=_tree_order)
+        return [n.map_line() for n in nodes]
+
+def _tree_order(node: MapNode) -> List[int]:
+    key = []
+    while node.parent is not None:
+        key.append(node.row)
+        node = node.parent
+    key.reverse()
+    return key
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QFileDialog,QListWidgetItem
 from abstract_utilities import define_defaults
 from .resolve_directory import resolve_directory_input
+from ..walk.filters import PathFilter
 import os,sys
 # — UI helpers —
 def browse_dir(self):
@@ -102,4 +103,5 @@ def make_params(self):
         "strings": s_raw,
         "recursive": self.chk_recursive.isChecked(),
         "cfg": cfg,
+        "path_filter": PathFilter(cfg),   # compiled, picklable form of cfg
     }
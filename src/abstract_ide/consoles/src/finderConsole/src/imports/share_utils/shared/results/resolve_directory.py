@@ -1,8 +1,39 @@
 import os
 import subprocess
 import shlex
+import threading
+
+GIO_TIMEOUT = 20            # seconds before a hung `gio mount`/`gio info` is abandoned
+
+_resolved: dict = {}        # stripped input → resolved local directory
+_resolved_lock = threading.Lock()
+
+def clear_resolved_directories() -> None:
+    """Forget memoized resolutions (e.g. after unmounting a GVFS share)."""
+    with _resolved_lock:
+        _resolved.clear()
 
 def resolve_directory_input(path: str) -> str:
+    """
+    Memoized `_resolve_directory_input`: a previous resolution is reused while
+    it is still a directory, so sftp:// inputs only shell out to gio once per
+    mount instead of on every make_params() call.
+    """
+    if not path:
+        raise ValueError("Empty directory path")
+    key = path.strip()
+    if "://" not in key and not os.path.isabs(os.path.expanduser(key)):
+        key = os.path.join(os.getcwd(), key)
+    with _resolved_lock:
+        hit = _resolved.get(key)
+    if hit is not None and os.path.isdir(hit):
+        return hit
+    resolved = _resolve_directory_input(key)
+    with _resolved_lock:
+        _resolved[key] = resolved
+    return resolved
+
+def _resolve_directory_input(path: str) -> str:
     """
     Resolve a directory input that may be:
       - local path
@@ -31,6 +62,7 @@ def resolve_directory_input(path: str) -> str:
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 check=False,
+                timeout=GIO_TIMEOUT,
             )
 
             # Ask gio where it mounted it
@@ -38,6 +70,7 @@ def resolve_directory_input(path: str) -> str:
                 ["gio", "info", path],
                 capture_output=True,
                 text=True,
+                timeout=GIO_TIMEOUT,
             )
 
             for line in proc.stdout.splitlines():
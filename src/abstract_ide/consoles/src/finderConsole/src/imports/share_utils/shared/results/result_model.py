@@ -0,0 +1,261 @@
+"""
+Virtualized Find Content results.
+
+Hits are kept in flat arrays instead of one QListWidgetItem per file:
+  _paths            path-id → path
+  _line_start/count per file, a slice into _lines
+  _lines            every hit line number, back to back
+  _row_file/_row_line   the visible rows (file rows have _row_line == -1)
+
+Only rows the view actually paints are turned into text, and per-file line
+hits are inserted as rows only when a file is expanded. Live search patches
+single files with set_file_results(): a replaced file reuses its line slice
+when the new hits fit and is re-appended otherwise, and a dropped file only
+loses its row and path entry. Abandoned slots are counted and _lines is
+compacted once they make up half of it. _row_file never decreases (files are
+appended, their line rows follow them), so a file's row is found by bisect.
+"""
+import linecache
+from array import array
+from bisect import bisect_left
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QEvent, QSize
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+
+ARROW_WIDTH = 18   # px at the left of a file row that toggles expansion
+COMPACT_MIN = 1 << 16   # abandoned _lines slots tolerated before compacting
+
+class SearchResultsModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._reset_storage()
+
+    def _reset_storage(self):
+        self._paths: list[str] = []
+        self._path_ids: dict[str, int] = {}
+        self._line_start = array("I")
+        self._line_count = array("I")
+        self._lines = array("I")
+        self._row_file = array("I")
+        self._row_line = array("i")
+        self._expanded: set[int] = set()
+        self._hits = 0
+        self._garbage = 0                      # _lines slots no file points at
+
+    # ───────────── feeding ─────────────
+    def clear(self):
+        self.beginResetModel()
+        self._reset_storage()
+        linecache.clearcache()
+        self.endResetModel()
+
+    def add_results(self, results: list) -> int:
+        """Append engine hits (dicts or bare paths). Each file is expected once. Returns files added."""
+        new_paths, new_lines = [], []
+        for fp in results or []:
+            if isinstance(fp, dict):
+                path, lines = fp.get("file_path"), fp.get("lines") or []
+            else:
+                path, lines = fp, []
+            if not isinstance(path, str) or path in self._path_ids:
+                continue
+            self._path_ids[path] = -1          # reserve; real id assigned below
+            new_paths.append(path)
+            new_lines.append([obj.get("line") for obj in lines if obj.get("line") is not None])
+        if not new_paths:
+            return 0
+
+        first_row = len(self._row_file)
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(new_paths) - 1)
+        for path, lines in zip(new_paths, new_lines):
+            fid = len(self._paths)
+            self._paths.append(path)
+            self._path_ids[path] = fid
+            self._line_start.append(len(self._lines))
+            self._line_count.append(len(lines))
+            self._lines.extend(lines)
+            self._hits += len(lines)
+            self._row_file.append(fid)
+            self._row_line.append(-1)
+        self.endInsertRows()
+        return len(new_paths)
+
+    # ───────────── live patching ─────────────
+    def set_file_results(self, path: str, result) -> int:
+        """Replace, add or (result falsy) drop one file's hits in place. Returns the change in file count."""
+        linecache.checkcache(path)
+        fid = self._path_ids.get(path)
+        if fid is None:
+            return self.add_results([result]) if result else 0
+        row = self._file_row(fid)
+        was_expanded = fid in self._expanded
+        if was_expanded:
+            self.toggle_expanded(row)
+        start, old_count = self._line_start[fid], self._line_count[fid]
+        self._hits -= old_count
+        if not result:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._row_file[row]
+            del self._row_line[row]
+            del self._path_ids[path]
+            self._line_count[fid] = 0
+            self.endRemoveRows()
+            self._garbage += old_count
+            self._maybe_compact()
+            return -1
+        lines = [obj.get("line") for obj in (result.get("lines") or []) if obj.get("line") is not None]
+        if len(lines) <= old_count:
+            self._lines[start:start + len(lines)] = array("I", lines)
+            self._garbage += old_count - len(lines)
+        else:
+            self._line_start[fid] = len(self._lines)
+            self._lines.extend(lines)
+            self._garbage += old_count
+        self._line_count[fid] = len(lines)
+        self._hits += len(lines)
+        self._maybe_compact()
+        self.dataChanged.emit(self.index(row), self.index(row))
+        if was_expanded:
+            self.toggle_expanded(row)
+        return 0
+
+    def _file_row(self, fid: int) -> int:
+        # a file row precedes its line rows, so it is the first row with its fid
+        return bisect_left(self._row_file, fid)
+
+    def _maybe_compact(self) -> None:
+        if self._garbage < max(COMPACT_MIN, len(self._lines) // 2):
+            return
+        lines = array("I")
+        for fid in self._path_ids.values():
+            start, count = self._line_start[fid], self._line_count[fid]
+            shift = len(lines) - start
+            self._line_start[fid] = len(lines)
+            lines.extend(self._lines[start:start + count])
+            if fid in self._expanded and shift:
+                # expanded line rows index into _lines; the text they show is unchanged
+                first = self._file_row(fid) + 1
+                for r in range(first, first + count):
+                    self._row_line[r] += shift
+        self._lines = lines
+        self._garbage = 0
+
+    # ───────────── expansion ─────────────
+    def is_file_row(self, row: int) -> bool:
+        return 0 <= row < len(self._row_line) and self._row_line[row] == -1
+
+    def is_expanded(self, row: int) -> bool:
+        return self.is_file_row(row) and self._row_file[row] in self._expanded
+
+    def toggle_expanded(self, row: int) -> None:
+        if not self.is_file_row(row):
+            return
+        fid = self._row_file[row]
+        count = self._line_count[fid]
+        if not count:
+            return
+        if fid in self._expanded:
+            self.beginRemoveRows(QModelIndex(), row + 1, row + count)
+            del self._row_file[row + 1:row + 1 + count]
+            del self._row_line[row + 1:row + 1 + count]
+            self._expanded.discard(fid)
+            self.endRemoveRows()
+        else:
+            start = self._line_start[fid]
+            self.beginInsertRows(QModelIndex(), row + 1, row + count)
+            self._row_file[row + 1:row + 1] = array("I", [fid]) * count
+            self._row_line[row + 1:row + 1] = array("i", range(start, start + count))
+            self._expanded.add(fid)
+            self.endInsertRows()
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    # ───────────── queries ─────────────
+    def file_count(self) -> int:
+        return len(self._path_ids)
+
+    def hit_count(self) -> int:
+        return self._hits
+
+    def hits_at(self, row: int) -> int:
+        """Number of line hits for the file shown at `row`."""
+        return self._line_count[self._row_file[row]]
+
+    def entry(self, row: int) -> tuple[str, int | None]:
+        """(path, line) for a visible row; file rows point at their first hit."""
+        fid = self._row_file[row]
+        li = self._row_line[row]
+        if li >= 0:
+            return self._paths[fid], self._lines[li]
+        n = self._line_count[fid]
+        return self._paths[fid], (self._lines[self._line_start[fid]] if n else None)
+
+    def file_lines(self, path: str) -> list[int]:
+        fid = self._path_ids.get(path)
+        if fid is None:
+            return []
+        s = self._line_start[fid]
+        return list(self._lines[s:s + self._line_count[fid]])
+
+    def iter_files(self):
+        """Yield (path, first_line) for every file, expanded or not."""
+        for path, fid in self._path_ids.items():
+            n = self._line_count[fid]
+            yield path, (self._lines[self._line_start[fid]] if n else None)
+
+    # ───────────── Qt model API ─────────────
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._row_file)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            fid, li = self._row_file[row], self._row_line[row]
+            path = self._paths[fid]
+            if li >= 0:
+                line = self._lines[li]
+                return f"{line:>6}: {linecache.getline(path, line).rstrip()}"
+            n = self._line_count[fid]
+            return f"{path}  ({n} hit{'s' if n != 1 else ''})" if n else path
+        if role == Qt.ItemDataRole.UserRole:
+            path, line = self.entry(row)
+            return {"file_path": path, "line": line}
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._paths[self._row_file[row]]
+        return None
+
+class SearchResultsDelegate(QStyledItemDelegate):
+    """Paints file rows with an expand arrow and line rows indented in monospace."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mono = QFont()
+        self._mono.setStyleHint(QFont.StyleHint.TypeWriter)
+        self._mono.setFamily("monospace")
+
+    def paint(self, painter, option, index):
+        model = index.model()
+        row = index.row()
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        if model.is_file_row(row):
+            arrow = ("▾ " if model.is_expanded(row) else "▸ ") if model.hits_at(row) else "  "
+            opt.text = arrow + opt.text
+        else:
+            opt.font = self._mono
+            opt.rect.adjust(ARROW_WIDTH * 2, 0, 0, 0)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and model.is_file_row(index.row())
+                and event.position().x() - option.rect.x() < ARROW_WIDTH):
+            model.toggle_expanded(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def sizeHint(self, option, index):
+        hint = super().sizeHint(option, index)
+        return QSize(hint.width(), max(hint.height(), option.fontMetrics.height() + 4))
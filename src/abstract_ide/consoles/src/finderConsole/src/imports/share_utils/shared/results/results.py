@@ -1,6 +1,11 @@
 from PyQt6.QtWidgets import QListWidgetItem,QLabel,QListWidget
 from .params import *
 from ..imports import *
+from ..walk.snapshot import walk_files
+
+# state keys that change the file listing (strings/line options do not)
+LISTING_KEYS = ("directory", "allowed_exts", "exclude_exts", "allowed_types", "exclude_types",
+                "allowed_dirs", "exclude_dirs", "allowed_patterns", "exclude_patterns", "recursive")
 
 def init_results_ui(self):
     # Wire helpers
@@ -45,12 +50,12 @@ def init_results_ui(self):
         )
 
 
-    # Refresh when the shared bus broadcasts changes (and we’re linked)
-    def _on_bus_change(sender, state):
+    # Refresh only when a flushed bus change touches the listing (and we’re linked)
+    def _on_bus_change(sender, changed):
         if getattr(self, "link_btn", None) and not self.link_btn.isChecked():
             return
         self._refresh_results()
-    self._bus.stateBroadcast.connect(_on_bus_change)
+    self._bus.subscribe(_on_bus_change, keys=LISTING_KEYS)
 
     # Initial fill
     self._refresh_results()
@@ -64,9 +69,10 @@ def _open_result(self, item: QListWidgetItem):
     QDesktopServices.openUrl(QUrl.fromLocalFile(path))
 
 def _refresh_results(self):
-    """Recompute the filtered files and (re)populate the list."""
+    """Recompute the filtered files (served from the shared snapshot cache) and (re)populate the list."""
     try:
-        files = self.make_params()  # pulls from all current filters
+        params = self.make_params(self)
+        files = walk_files(**params)
     except Exception as e:
         if hasattr(self, "log"):
             self.log.append(f"Search failed: {e}\n")
@@ -74,11 +80,12 @@ def _refresh_results(self):
 
     self._last_results = files
     self.results_list.clear()
-
+    self.results_list.setUpdatesEnabled(False)
     for path in files:
         it = QListWidgetItem(path)  # show the path (or os.path.basename(path) if you prefer)
         it.setData(Qt.ItemDataRole.UserRole, path)  # keep full path
         self.results_list.addItem(it)
+    self.results_list.setUpdatesEnabled(True)
 
     if hasattr(self, "status_label"):
         n = len(files)
@@ -0,0 +1,5 @@
+from .cancel import *
+from .matcher import *
+from .trigram_index import *
+from .engine import *
+from .blocks import *
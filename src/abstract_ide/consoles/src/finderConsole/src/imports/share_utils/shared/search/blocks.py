@@ -0,0 +1,148 @@
+"""
+Multi-block matching for the Diff Parser.
+
+A patch is a list of hunks, each with a contiguous block of lines to find
+(its `subs`). Instead of one pass over the tree per hunk, every block is
+located in a single scan of each file:
+
+- blocks are keyed by their first `key_len` characters (the shortest block,
+  capped at KEY_CAP) and the distinct keys are folded into one alternation,
+  so one left-to-right scan serves every hunk; keys all have the same length,
+  so at most one can match at an offset, and the scan resumes one character
+  past each hit so overlapping keys are not skipped;
+- blocks shorter than MIN_KEY (a lone `)` or `}` line) are left out of the
+  alternation, since a key that short would hit at almost every offset;
+  each is found with its own `str.find` loop instead;
+- a key hit is confirmed with `str.startswith` for each block in its group,
+  and per block the hits stay non-overlapping, as `re.finditer` gave them;
+- line numbers come from a newline offset table and `bisect`, and only the
+  matched lines are sliced out.
+
+Files are read once, in text mode like the rest of the tab, and sharded
+across the same pool the content search uses (see engine `_make_executor`).
+"""
+import os
+import re
+from bisect import bisect_left
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .cancel import CancelToken, worker_token
+from .engine import INLINE_FILE_LIMIT, READ_BUFFER, _make_executor, _shards, _task_token, _workers_for
+from ..walk.latency import io_profile
+
+KEY_CAP = 64          # longest prefix used to key a block in the alternation
+MIN_KEY = 8           # shorter blocks are searched on their own
+
+_NEWLINE = re.compile("\n")
+
+# (block index, first line, matched lines)
+BlockHit = Tuple[int, int, List[str]]
+
+class BlockMatcher:
+    """Compiled form of a list of line blocks; cheap to build once per shard."""
+    __slots__ = ("blocks", "groups", "combined", "short")
+
+    def __init__(self, blocks: Sequence[Sequence[str]]) -> None:
+        self.blocks = tuple("\n".join(b) for b in blocks)
+        live = [i for i, b in enumerate(self.blocks) if b]
+        self.short = [i for i in live if len(self.blocks[i]) < MIN_KEY]
+        keyed = [i for i in live if len(self.blocks[i]) >= MIN_KEY]
+        key_len = min([len(self.blocks[i]) for i in keyed] + [KEY_CAP])
+        self.groups: Dict[str, List[int]] = {}
+        for i in keyed:
+            self.groups.setdefault(self.blocks[i][:key_len], []).append(i)
+        if self.groups:
+            keys = "|".join(re.escape(k) for k in self.groups)
+            self.combined = re.compile(keys)
+        else:
+            self.combined = None
+
+    def offsets(self, text: str) -> List[Tuple[int, int]]:
+        """(block index, char offset) for every hit, in file order."""
+        out = []
+        if self.combined is not None:
+            ends = [0] * len(self.blocks)
+            search = self.combined.search
+            m = search(text)
+            while m is not None:
+                pos = m.start()
+                for i in self.groups[m.group()]:
+                    block = self.blocks[i]
+                    if pos >= ends[i] and text.startswith(block, pos):
+                        ends[i] = pos + len(block)
+                        out.append((i, pos))
+                m = search(text, pos + 1)
+        for i in self.short:
+            block = self.blocks[i]
+            pos = text.find(block)
+            while pos != -1:
+                out.append((i, pos))
+                pos = text.find(block, pos + len(block))
+        if self.short:
+            out.sort(key=lambda hit: (hit[1], hit[0]))
+        return out
+
+    def scan(self, text: str) -> List[BlockHit]:
+        """Hits resolved to line numbers, each with the lines it covers."""
+        found = self.offsets(text)
+        if not found:
+            return []
+        newlines = [m.start() for m in _NEWLINE.finditer(text)]
+        last = len(newlines)
+
+        def line(n: int) -> str:
+            start = newlines[n - 1] + 1 if n else 0
+            return text[start:newlines[n] if n < last else len(text)]
+
+        hits = []
+        for i, pos in found:
+            first = bisect_left(newlines, pos)
+            count = self.blocks[i].count("\n") + 1
+            hits.append((i, first, [line(n) for n in range(first, first + count)]))
+        return hits
+
+def read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8", buffering=READ_BUFFER) as f:
+        return f.read()
+
+def _match_shard(paths: List[str], blocks: Tuple[Tuple[str, ...], ...],
+                 token: Optional[CancelToken] = None) -> List[Tuple[str, List[BlockHit]]]:
+    """Pool entry point: scan a batch of files (must stay module-level to pickle)."""
+    token = token if token is not None else worker_token()
+    matcher = BlockMatcher(blocks)
+    out = []
+    for p in paths:
+        if token is not None and token.cancelled:
+            break
+        try:
+            hits = matcher.scan(read_text(p))
+        except (OSError, UnicodeDecodeError, ValueError):
+            continue
+        if hits:
+            out.append((p, hits))
+    return out
+
+def match_blocks(files: Sequence[str], blocks: Sequence[Sequence[str]],
+                 max_workers: Optional[int] = None,
+                 token: Optional[CancelToken] = None) -> Dict[str, List[BlockHit]]:
+    """
+    Locate every block in `files` with one read per file.
+    Returns {path: [(block index, first line, lines), ...]} for files with at
+    least one hit, in `files` order; empty blocks never match.
+    """
+    files = list(files)
+    blocks = tuple(tuple(b) for b in blocks)
+    if not files or not any(blocks):
+        return {}
+    profile = io_profile(os.path.dirname(files[0]) or ".")
+    workers = _workers_for(profile, max_workers)
+    inline_limit = 1 if profile.remote else INLINE_FILE_LIMIT
+    if workers <= 1 or len(files) <= inline_limit:
+        return dict(_match_shard(files, blocks, token))
+    out: Dict[str, List[BlockHit]] = {}
+    with _make_executor(workers, token, profile) as ex:
+        for shard in ex.map(_match_shard, _shards(files, workers), repeat(blocks),
+                            repeat(_task_token(ex, token))):
+            out.update(shard)
+    return out
@@ -0,0 +1,42 @@
+"""
+Cooperative cancellation for content searches.
+
+A CancelToken wraps a multiprocessing Event. Pool workers cannot receive it as
+a task argument (Events only travel by inheritance), so the executor installs
+it once per worker via `install_worker_token`; shard functions then fall back
+to `worker_token()` when no token is passed explicitly.
+"""
+import multiprocessing
+from typing import Optional
+
+class SearchCancelled(Exception):
+    """Raised inside a file scan when the active token has been cancelled."""
+
+class CancelToken:
+    """Stop flag shared by the search thread and its (forked) pool workers."""
+
+    def __init__(self) -> None:
+        ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() \
+            else multiprocessing.get_context()
+        self._event = ctx.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise SearchCancelled()
+
+_WORKER_TOKEN: Optional[CancelToken] = None
+
+def install_worker_token(token: Optional[CancelToken]) -> None:
+    """Pool initializer: remember the token for this worker process."""
+    global _WORKER_TOKEN
+    _WORKER_TOKEN = token
+
+def worker_token() -> Optional[CancelToken]:
+    return _WORKER_TOKEN
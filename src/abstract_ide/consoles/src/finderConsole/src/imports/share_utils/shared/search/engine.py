@@ -0,0 +1,389 @@
+"""
+In-process content search used by the Find Content tab.
+
+The candidate file list is built once in the calling thread, then split into
+shards that are searched in a process pool. Each file is read with one large
+buffered read (or mmap past MMAP_THRESHOLD) and the raw bytes are checked for
+the encoded needles in one pass (see matcher); literal searches stay on bytes throughout and decode only
+the matched lines, and files that look binary are skipped.
+
+A CancelToken is checked before every file and between SCAN_CHUNK windows of
+large files, so a stop request lands within one chunk rather than one shard.
+
+Under a high-latency mount (GVFS/FUSE, see walk.latency) the search runs on
+the IOProfile instead: I/O threads rather than CPU processes, larger
+buffered reads, no mmap, and no inline path for small file sets.
+"""
+import os
+import mmap
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from itertools import islice, repeat
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from .cancel import CancelToken, SearchCancelled, install_worker_token, worker_token
+from ..walk.filters import PathFilter
+from ..walk.latency import LOCAL_PROFILE, IOProfile, io_profile
+from ..walk.snapshot import default_snapshot_cache
+from .matcher import Matcher
+from .trigram_index import BINARY_SNIFF, TrigramIndex
+
+MMAP_THRESHOLD = LOCAL_PROFILE.mmap_threshold   # files at/above this size are mmapped
+READ_BUFFER = LOCAL_PROFILE.read_buffer         # buffered read size for smaller files
+SHARD_SIZE = 256                   # max files handed to a worker at once
+INLINE_FILE_LIMIT = 64             # below this, a pool costs more than it saves
+FIRST_SHARD_SIZE = 16              # streaming: small first shards → fast first hit
+SCAN_CHUNK = 8 * 1024 * 1024       # files past this are probed this much at a time (mmapped or not)
+
+# ───────────────────────── Models ─────────────────────────
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """Picklable description of what to look for in each file."""
+    strings: tuple = ()
+    total_strings: bool = False
+    parse_lines: bool = False
+    spec_line: int = 0
+    get_lines: bool = True
+    regex: bool = False
+
+    @classmethod
+    def from_params(cls, strings=None, total_strings=False, parse_lines=False,
+                    spec_line=False, get_lines=True, regex=False, **_) -> "SearchSpec":
+        if isinstance(strings, str):
+            strings = [s.strip() for s in strings.split(",")]
+        return cls(
+            strings=tuple(s for s in (strings or []) if s),
+            total_strings=bool(total_strings),
+            parse_lines=bool(parse_lines),
+            spec_line=int(spec_line or 0),
+            get_lines=bool(get_lines),
+            regex=bool(regex),
+        )
+
+    @property
+    def needles(self) -> tuple:
+        """Literal byte needles; empty in regex mode (no raw-bytes prefilter)."""
+        return () if self.regex else tuple(s.encode("utf-8") for s in self.strings)
+
+@dataclass
+class SearchProgress:
+    """Running counters reported alongside each streamed batch."""
+    files_found: int = 0      # candidates discovered by the walk so far
+    files_pruned: int = 0     # candidates ruled out by the trigram index
+    files_scanned: int = 0
+    bytes_read: int = 0
+    hits: int = 0
+    walking: bool = True
+    cancelled: bool = False
+    current_path: str = ""    # last file finished (approximate under a pool)
+    started: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> dict:
+        """Counters plus derived rates (elapsed, files_per_sec, mb_per_sec)."""
+        d = asdict(self)
+        elapsed = max(time.monotonic() - d.pop("started"), 1e-6)
+        d["elapsed"] = elapsed
+        d["files_per_sec"] = self.files_scanned / elapsed
+        d["mb_per_sec"] = self.bytes_read / 1e6 / elapsed
+        return d
+
+# ───────────────────── Candidate files ─────────────────────
+
+def iter_candidate_files(directory: str, cfg: Any = None, recursive: bool = True,
+                         token: Optional[CancelToken] = None) -> Iterator[str]:
+    """Yield files under `directory` that pass `cfg`, via the shared snapshot cache / walker."""
+    for entry in default_snapshot_cache().iter_entries(directory, cfg, recursive, token=token):
+        if not entry.is_dir:
+            yield entry.path
+
+# ─────────────────────── File I/O ─────────────────────────
+
+def read_file_bytes(path: str) -> bytes:
+    """Read a whole file as bytes with one large buffered read."""
+    with open(path, "rb", buffering=READ_BUFFER) as f:
+        return f.read()
+
+def is_binary(buf) -> bool:
+    """Quick sniff: a NUL byte in the first BINARY_SNIFF bytes marks the file as binary."""
+    return buf.find(b"\0", 0, BINARY_SNIFF) != -1
+
+def _matches(buf, matcher: Matcher, require_all: bool) -> bool:
+    if not matcher.needles:
+        return True
+    return not matcher.unseen(buf, matcher.needles, require_all)
+
+def _matches_chunked(buf, matcher: Matcher, require_all: bool, token: CancelToken) -> bool:
+    needles = matcher.needles
+    if not needles:
+        return True
+    # windows overlap by len(needle) - 1 so a needle straddling a boundary is still seen
+    overlap = len(needles[0]) - 1
+    remaining = list(needles)
+    for start in range(0, len(buf), SCAN_CHUNK):
+        token.raise_if_cancelled()
+        remaining = matcher.unseen(buf, remaining, require_all, start, start + SCAN_CHUNK + overlap)
+        if not remaining:
+            return True
+    return False
+
+# ─────────────────────── Matching ─────────────────────────
+
+def _line_hits(buf, spec: SearchSpec, matcher: Matcher) -> List[dict]:
+    want_all = spec.total_strings and (spec.parse_lines or spec.spec_line)
+    if spec.spec_line:
+        line = matcher.nth_line(buf, spec.spec_line - 1)
+        if line is not None and matcher.line_matches(line, want_all):
+            return [{"line": spec.spec_line, "content": matcher.decode(line)}]
+        return []
+    return matcher.iter_line_hits(buf, want_all)
+
+def search_file(path: str, spec: SearchSpec, matcher: Optional[Matcher] = None) -> Optional[dict]:
+    """Search one file; see `_search_one` for the matching rules."""
+    return _search_one(path, spec, matcher)[0]
+
+def _search_one(path: str, spec: SearchSpec, matcher: Optional[Matcher] = None,
+                token: Optional[CancelToken] = None,
+                profile: IOProfile = LOCAL_PROFILE) -> Tuple[Optional[dict], int]:
+    """
+    Search one file. Returns {'file_path': str, 'lines': [{'line': int, 'content': str}]}
+    (or None when the file does not match) plus the bytes read. Line numbers are 1-based.
+
+    - total_strings: every string must appear (per file, or per line with parse_lines/spec_line)
+    - parse_lines:   strings are matched line by line instead of against the whole file
+    - spec_line:     only that (1-based) line is considered
+    - get_lines:     include matching lines in the result
+    - regex:         strings are regular expressions instead of literals
+
+    Files past the profile's mmap_threshold are searched through mmap without
+    copying, and files that fail the binary sniff are skipped.
+    """
+    if not spec.strings:
+        return {"file_path": path, "lines": []}, 0
+    matcher = matcher if matcher is not None else Matcher.from_spec(spec)
+    try:
+        with open(path, "rb", buffering=profile.read_buffer) as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return None, 0
+            if size >= profile.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return _search_buffer(path, mm, size, spec, matcher, token), size
+            return _search_buffer(path, f.read(), size, spec, matcher, token), size
+    except (OSError, ValueError):
+        return None, 0
+
+def _search_buffer(path: str, buf, size: int, spec: SearchSpec, matcher: Matcher,
+                   token: Optional[CancelToken]) -> Optional[dict]:
+    if is_binary(buf):
+        return None
+    # chunking follows size, not the read path: the remote profile never mmaps
+    if size > SCAN_CHUNK and token is not None:
+        found = _matches_chunked(buf, matcher, spec.total_strings, token)
+    else:
+        found = _matches(buf, matcher, spec.total_strings)
+    if not found:
+        return None
+    if matcher.regex:
+        buf = bytes(buf).decode("utf-8", errors="replace")
+        if not (spec.parse_lines or spec.spec_line) and not matcher.text_match(buf, spec.total_strings):
+            return None
+
+    if spec.parse_lines or spec.spec_line:
+        hits = _line_hits(buf, spec, matcher)
+        if not hits:
+            return None
+    else:
+        hits = _line_hits(buf, spec, matcher) if spec.get_lines else []
+    return {"file_path": path, "lines": hits if spec.get_lines else []}
+
+def _search_shard(paths: List[str], spec: SearchSpec, token: Optional[CancelToken] = None,
+                  profile: IOProfile = LOCAL_PROFILE) -> Tuple[List[dict], int, int]:
+    """
+    Pool entry point: search a batch of files (must stay module-level to pickle).
+    Returns (hits, bytes_read, files_scanned); stops early once the token is
+    cancelled. Pool workers pick the token up from `install_worker_token`.
+    """
+    token = token if token is not None else worker_token()
+    matcher = Matcher.from_spec(spec)
+    out, nbytes, scanned = [], 0, 0
+    for p in paths:
+        if token is not None and token.cancelled:
+            break
+        try:
+            r, size = _search_one(p, spec, matcher, token, profile)
+        except SearchCancelled:
+            break
+        scanned += 1
+        nbytes += size
+        if r is not None:
+            out.append(r)
+    return out, nbytes, scanned
+
+# ─────────────────────── Execution ────────────────────────
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def _workers_for(profile: IOProfile, max_workers: Optional[int]) -> int:
+    return max_workers or profile.io_workers or default_workers()
+
+def _make_executor(workers: int, token: Optional[CancelToken] = None,
+                   profile: IOProfile = LOCAL_PROFILE):
+    # Remote mounts are latency-bound, so threads overlap the round trips.
+    # Otherwise fork is required: the app entry points have no __main__ guard,
+    # so a spawned child would re-launch the GUI. Elsewhere fall back to threads.
+    if profile.io_workers:
+        return ThreadPoolExecutor(max_workers=workers)
+    if "fork" in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                   initializer=install_worker_token, initargs=(token,))
+    return ThreadPoolExecutor(max_workers=workers)
+
+def _task_token(ex, token: Optional[CancelToken]) -> Optional[CancelToken]:
+    # Events cannot be pickled into process tasks (workers got theirs at
+    # start-up); threads and inline calls take it directly.
+    return None if isinstance(ex, ProcessPoolExecutor) else token
+
+def _shards(files: List[str], workers: int) -> List[List[str]]:
+    # ~4 shards per worker keeps the pool balanced when file sizes vary
+    size = max(16, min(SHARD_SIZE, -(-len(files) // (workers * 4))))
+    return [files[i:i + size] for i in range(0, len(files), size)]
+
+def narrow_with_index(files: List[str], spec: SearchSpec, index: TrigramIndex, executor=None) -> List[str]:
+    """Refresh `index` for `files` and keep only those that may contain the needles."""
+    if not spec.needles:
+        return files
+    index.refresh(files, executor)
+    keep = index.candidate_paths(spec.needles, spec.total_strings)
+    return files if keep is None else [f for f in files if f in keep]
+
+def iter_search(directory: str, spec: SearchSpec, cfg: Any = None, recursive: bool = True,
+                max_workers: Optional[int] = None, index: Optional[TrigramIndex] = None,
+                token: Optional[CancelToken] = None) -> Iterator[dict]:
+    """Yield match dicts in walk order, sharding the file list across a process pool."""
+    files = list(iter_candidate_files(directory, cfg, recursive, token))
+    profile = io_profile(directory)
+    workers = _workers_for(profile, max_workers)
+    inline_limit = 1 if profile.remote else INLINE_FILE_LIMIT
+    inline = not spec.strings or workers <= 1 or len(files) <= inline_limit
+    with (nullcontext() if inline else _make_executor(workers, token, profile)) as ex:
+        if index is not None and not (token is not None and token.cancelled):
+            files = narrow_with_index(files, spec, index, ex)
+        if inline or len(files) <= inline_limit:
+            yield from _search_shard(files, spec, token, profile)[0]
+            return
+        shards = ex.map(_search_shard, _shards(files, workers), repeat(spec),
+                        repeat(_task_token(ex, token)), repeat(profile))
+        for shard_hits, _, _ in shards:
+            yield from shard_hits
+
+def _growing_chunks(items: Iterable[str], first: int, limit: int) -> Iterator[List[str]]:
+    it, size = iter(items), first
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+        size = min(limit, size * 2)
+
+def iter_search_batches(directory: str, spec: SearchSpec, cfg: Any = None, recursive: bool = True,
+                        max_workers: Optional[int] = None, index: Optional[TrigramIndex] = None,
+                        token: Optional[CancelToken] = None,
+                        ) -> Iterator[Tuple[List[dict], SearchProgress]]:
+    """
+    Streaming variant of `iter_search`: yield (hits, progress) as each shard
+    finishes. Shards are submitted while the walk is still running, starting
+    small and doubling up to SHARD_SIZE, so the first hits arrive long before
+    the tree has been fully listed. Hits arrive in completion order; a final
+    ([], progress) carries the finished counters.
+
+    With an `index`, the walk is completed and narrowed up front instead.
+    Once `token` is cancelled no further shards are submitted, queued ones
+    are dropped, and the final progress has `cancelled` set.
+    """
+    progress = SearchProgress()
+    profile = io_profile(directory)
+    workers = _workers_for(profile, max_workers)
+    inline = not spec.strings or workers <= 1
+    with (nullcontext() if inline else _make_executor(workers, token, profile)) as ex:
+        source = iter_candidate_files(directory, cfg, recursive, token)
+        if index is not None and spec.needles:
+            files = list(source)
+            source = narrow_with_index(files, spec, index, ex)
+            progress.files_pruned = len(files) - len(source)
+        chunks = _growing_chunks(source, FIRST_SHARD_SIZE, SHARD_SIZE)
+        yield from _drain_batches(ex, chunks, spec, progress, workers, token, profile)
+
+def _drain_batches(ex, chunks: Iterator[List[str]], spec: SearchSpec, progress: SearchProgress,
+                   workers: int, token: Optional[CancelToken] = None,
+                   profile: IOProfile = LOCAL_PROFILE,
+                   ) -> Iterator[Tuple[List[dict], SearchProgress]]:
+
+    def account(chunk, result):
+        hits, nbytes, scanned = result
+        progress.files_scanned += scanned
+        progress.bytes_read += nbytes
+        progress.hits += len(hits)
+        if scanned:
+            progress.current_path = chunk[scanned - 1]
+        return hits
+
+    def stopped():
+        if token is not None and token.cancelled:
+            progress.cancelled = True
+        return progress.cancelled
+
+    task_token = _task_token(ex, token)
+    if ex is None:
+        for chunk in chunks:
+            progress.files_found += len(chunk)
+            yield account(chunk, _search_shard(chunk, spec, token, profile)), progress
+            if stopped():
+                break
+        progress.walking = False
+        yield [], progress
+        return
+
+    pending = {}
+    for chunk in chunks:
+        if stopped():
+            break
+        progress.files_found += len(chunk)
+        pending[ex.submit(_search_shard, chunk, spec, task_token, profile)] = chunk
+        if len(pending) >= workers * 2:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield account(pending.pop(fut), fut.result()), progress
+    progress.walking = False
+    while pending:
+        if stopped():
+            for fut in pending:
+                fut.cancel()
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            chunk = pending.pop(fut)
+            if not fut.cancelled():
+                yield account(chunk, fut.result()), progress
+    stopped()
+    yield [], progress
+
+def search_content(directory: str, strings=None, total_strings: bool = False,
+                   parse_lines: bool = False, spec_line=False, get_lines: bool = True,
+                   regex: bool = False, recursive: bool = True, cfg: Any = None, max_workers: Optional[int] = None,
+                   use_index: bool = False, token: Optional[CancelToken] = None,
+                   path_filter: Optional[PathFilter] = None, **_) -> List[dict]:
+    """Drop-in replacement for `findContent(**make_params(...))`."""
+    spec = SearchSpec.from_params(strings=strings, total_strings=total_strings,
+                                  parse_lines=parse_lines, spec_line=spec_line,
+                                  get_lines=get_lines, regex=regex)
+    index = TrigramIndex(directory) if use_index and spec.needles else None
+    try:
+        return list(iter_search(directory, spec, cfg=path_filter or cfg, recursive=recursive,
+                                max_workers=max_workers, index=index, token=token))
+    finally:
+        if index is not None:
+            index.close()
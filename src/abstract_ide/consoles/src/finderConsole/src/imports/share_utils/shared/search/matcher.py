@@ -0,0 +1,193 @@
+"""
+Multi-pattern matching for Find Content.
+
+All search strings (literals, or regexes in regex mode) are folded into one
+alternation, so the line phase is a single left-to-right scan per file no
+matter how many strings were given: each hit resolves to its line, the rest
+of that line is skipped, and only lines that hit are sliced out. For
+`total_strings`, a candidate line is then checked against each string
+individually, which also covers overlapping needles the alternation can
+shadow ("foo" inside "foobar").
+
+Literals are matched on the raw bytes (bytes or mmap): needles are encoded
+once, line bounds come from scanning for b"\\n" around each hit, and only the
+matched lines are decoded. Regex mode works on decoded text.
+
+The file-level prefilter (`unseen`, used by engine `_matches`; regex mode
+has none) is one scan of the same alternation: each hit retires its needle
+and the scan resumes at that hit with the rest, so overlapping needles are
+still seen and require-all stops as soon as every needle has been. How fast
+`re` runs an alternation depends on the needles: with a shared prefix it is
+a single fast literal search, while unrelated identifiers make it try every
+branch at most offsets, which is slower than one `bytes.find` per needle.
+So the first large buffer times both on a PROBE_BYTES sample and the
+Matcher keeps the cheaper one; a single needle always uses `find`.
+"""
+import re
+from functools import lru_cache
+from time import perf_counter
+from typing import List, Optional, Sequence, Tuple
+
+PROBE_BYTES = 256 * 1024       # sample timed once per Matcher to pick the prefilter
+
+def _count_newlines(buf, start: int, end: int, nl) -> int:
+    # mmap has find/rfind but no count
+    if hasattr(buf, "count"):
+        return buf.count(nl, start, end)
+    return buf[start:end].count(nl)
+
+@lru_cache(maxsize=256)
+def _alternation(needles: Tuple[bytes, ...]):
+    return re.compile(b"|".join(re.escape(n) for n in needles))
+
+class Matcher:
+    """Compiled form of a spec's strings; cheap to build once per shard."""
+    __slots__ = ("strings", "regex", "needles", "patterns", "combined", "_scan")
+
+    def __init__(self, strings: Tuple[str, ...], regex: bool = False) -> None:
+        self.strings = tuple(strings)
+        self.regex = regex
+        if regex:
+            self.needles: Tuple[bytes, ...] = ()
+            sources = list(self.strings)
+        else:
+            # longest first: for require-all the longer needle is usually the rarer one
+            self.needles = tuple(sorted((s.encode("utf-8") for s in self.strings), key=len, reverse=True))
+            sources = [re.escape(n) for n in self.needles]
+        self.patterns = tuple(re.compile(p) for p in sources)
+        if not sources:
+            self.combined = None
+        elif regex:
+            self.combined = re.compile("|".join(f"(?:{p})" for p in sources))
+        else:
+            self.combined = _alternation(self.needles)
+        # prefilter strategy: None until a large buffer has been probed
+        self._scan: Optional[bool] = False if len(self.needles) < 2 else None
+
+    @classmethod
+    def from_spec(cls, spec) -> "Matcher":
+        return cls(spec.strings, spec.regex)
+
+    # ───────────── file level ─────────────
+    def unseen(self, buf, wanted: Sequence[bytes], require_all: bool,
+               start: int = 0, end: Optional[int] = None) -> List[bytes]:
+        """
+        Needles of `wanted` (longest first) not found in buf[start:end]. Without
+        `require_all` the first hit settles it and [] is returned; over the
+        whole buffer the first miss settles require-all, and only it is returned.
+        """
+        end = len(buf) if end is None else end
+        if len(wanted) > 1 and self._use_scan(buf):
+            return self._scan_unseen(buf, list(wanted), require_all, start, end)
+        if require_all:
+            whole = start == 0 and end >= len(buf)
+            missing = []
+            # longest (usually rarest) first, so a miss ends it early
+            for n in wanted:
+                if buf.find(n, start, end) == -1:
+                    missing.append(n)
+                    if whole:
+                        break
+            return missing
+        # shortest (usually commonest) first
+        if any(buf.find(n, start, end) != -1 for n in reversed(wanted)):
+            return []
+        return list(wanted)
+
+    def _scan_unseen(self, buf, remaining: List[bytes], require_all: bool, start: int, end: int) -> List[bytes]:
+        pos = start
+        while remaining:
+            m = _alternation(tuple(remaining)).search(buf, pos, end)
+            if m is None:
+                break
+            if not require_all:
+                return []
+            remaining.remove(m.group())
+            # a shorter or overlapping needle may start at or after this hit
+            pos = m.start()
+        return remaining
+
+    def _use_scan(self, buf) -> bool:
+        if self._scan is None:
+            if len(buf) < PROBE_BYTES:
+                return False
+            sample = bytes(buf[:PROBE_BYTES])
+            t0 = perf_counter()
+            self.combined.findall(sample)
+            t1 = perf_counter()
+            for n in self.needles:
+                sample.count(n)
+            self._scan = t1 - t0 < perf_counter() - t1
+        return self._scan
+
+    def text_match(self, text: str, require_all: bool) -> bool:
+        """File-level check after decoding (regex mode); literals are decided on the raw bytes."""
+        if self.combined is None or not self.regex:
+            return True
+        if require_all:
+            return all(p.search(text) for p in self.patterns)
+        return self.combined.search(text) is not None
+
+    # ───────────── line level ─────────────
+    def line_matches(self, line, require_all: bool) -> bool:
+        """`line` is str in regex mode, raw bytes otherwise."""
+        if self.regex:
+            hits = (p.search(line) for p in self.patterns)
+        else:
+            hits = (n in line for n in self.needles)
+        return all(hits) if require_all else any(hits)
+
+    def decode(self, line) -> str:
+        return line if self.regex else bytes(line).decode("utf-8", errors="replace")
+
+    def iter_line_hits(self, buf, require_all: bool = False) -> List[dict]:
+        """
+        [{'line', 'content'}] for every line with a hit, in one scan of `buf`
+        (str in regex mode, bytes/mmap for literals).
+        """
+        out: List[dict] = []
+        if self.combined is None:
+            return out
+        nl = "\n" if self.regex else b"\n"
+        search = self.combined.search
+        check_each = require_all and len(self.patterns) > 1
+        line_no, counted_to, pos = 1, 0, 0
+        n = len(buf)
+        while pos <= n:
+            m = search(buf, pos)
+            if m is None:
+                break
+            start = m.start()
+            line_start = buf.rfind(nl, 0, start) + 1
+            line_end = buf.find(nl, start)
+            if line_end == -1:
+                line_end = n
+            line_no += _count_newlines(buf, counted_to, line_start, nl)
+            counted_to = line_start
+            raw = buf[line_start:line_end]
+            if not check_each or self.line_matches(raw, True):
+                out.append({"line": line_no, "content": self.decode(raw)})
+            pos = line_end + 1
+        return out
+
+    def nth_line(self, buf, idx: int) -> Optional[object]:
+        """Raw 0-based line `idx` of `buf` (same type as the buffer slice), or None."""
+        nl = "\n" if self.regex else b"\n"
+        start = 0
+        for _ in range(idx):
+            start = buf.find(nl, start) + 1
+            if start == 0:
+                return None
+        end = buf.find(nl, start)
+        return buf[start:end if end != -1 else len(buf)]
+
+def compile_error(strings, regex: bool) -> Optional[str]:
+    """Return a message for the first invalid pattern in regex mode, else None."""
+    if not regex:
+        return None
+    for s in strings:
+        try:
+            re.compile(s)
+        except re.error as e:
+            return f"{s!r}: {e}"
+    return None
@@ -0,0 +1,250 @@
+"""
+Optional on-disk trigram index used to narrow Find Content candidates.
+
+One SQLite file per root directory (under ~/.cache/abstract_ide/trigram).
+`files` rows are keyed by path with mtime_ns/size; a file whose stat changed
+gets a fresh id, so stale postings simply point at dead ids. Postings are
+written in append-only segments (one per refresh batch) and merged by
+`compact()` once there are more than MAX_SEGMENTS of them.
+
+The index only answers "which files could contain these needles"; the exact
+match is still done by the search engine on that short list.
+"""
+import os
+import sqlite3
+import hashlib
+import zlib
+from array import array
+from typing import Iterable, List, Optional, Set
+
+INDEX_VERSION = "1"
+MAX_INDEXED_SIZE = 16 * 1024 * 1024   # larger files are never narrowed away
+BINARY_SNIFF = 8192                   # NUL in this prefix → treat as binary
+SEGMENT_FILES = 4000                  # files per posting segment
+MAX_SEGMENTS = 32                     # compact past this many segments
+
+def default_index_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "abstract_ide", "trigram")
+
+def _gram_key(g: bytes) -> int:
+    return int.from_bytes(g, "big")
+
+def needle_trigrams(needle: bytes) -> Set[int]:
+    return {_gram_key(needle[i:i + 3]) for i in range(len(needle) - 2)}
+
+def file_trigrams(data: bytes) -> array:
+    grams = {data[i:i + 3] for i in range(len(data) - 2)}
+    return array("I", sorted(_gram_key(g) for g in grams))
+
+def _index_shard(paths: List[str]) -> list:
+    """Pool entry point: (path, mtime_ns, size, trigrams|None) per readable file."""
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            if st.st_size > MAX_INDEXED_SIZE:
+                out.append((p, st.st_mtime_ns, st.st_size, None))
+                continue
+            with open(p, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        grams = None if b"\0" in data[:BINARY_SNIFF] else file_trigrams(data)
+        out.append((p, st.st_mtime_ns, st.st_size, grams))
+    return out
+
+class TrigramIndex:
+    """Per-root trigram index; use from a single thread (the search worker)."""
+
+    def __init__(self, root: str, index_dir: Optional[str] = None) -> None:
+        self.root = os.path.realpath(root)
+        index_dir = index_dir or default_index_dir()
+        os.makedirs(index_dir, exist_ok=True)
+        digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()[:16]
+        self.db_path = os.path.join(index_dir, f"{digest}.sqlite")
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        # path -> (id, mtime_ns, size, indexed)
+        self._rows: dict = {}
+        self._load_rows()
+
+    # ───────────── schema / bookkeeping ─────────────
+    def _init_schema(self) -> None:
+        c = self._conn
+        c.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
+        row = c.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        if row and row[0] != INDEX_VERSION:
+            c.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS postings; DELETE FROM meta;")
+        c.executescript("""
+            CREATE TABLE IF NOT EXISTS files(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT UNIQUE NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                indexed INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS postings(
+                tri INTEGER NOT NULL,
+                seg INTEGER NOT NULL,
+                ids BLOB NOT NULL,
+                PRIMARY KEY(tri, seg)) WITHOUT ROWID;
+        """)
+        c.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('version', ?)", (INDEX_VERSION,))
+        c.execute("INSERT OR IGNORE INTO meta(key, value) VALUES('root', ?)", (self.root,))
+        c.commit()
+
+    def _load_rows(self) -> None:
+        self._rows = {
+            path: (fid, mtime, size, bool(indexed))
+            for fid, path, mtime, size, indexed in
+            self._conn.execute("SELECT id, path, mtime_ns, size, indexed FROM files")
+        }
+
+    def _next_segment(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(MAX(seg), -1) + 1 FROM postings").fetchone()
+        return int(row[0])
+
+    def segment_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(DISTINCT seg) FROM postings").fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ─────────────────── refresh ───────────────────
+    def stale_paths(self, files: Iterable[str]) -> List[str]:
+        """Paths that are new or whose (mtime, size) differs from the index."""
+        stale = []
+        for p in files:
+            row = self._rows.get(p)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            if row is None or row[1] != st.st_mtime_ns or row[2] != st.st_size:
+                stale.append(p)
+        return stale
+
+    def refresh(self, files: List[str], executor=None) -> int:
+        """
+        Bring the index up to date for `files` (the current candidate list).
+        Only new/changed files are read. Indexed paths that no longer exist
+        are dropped. Returns the number of files (re)indexed.
+        """
+        stale = self.stale_paths(files)
+        if stale:
+            batches = [stale[i:i + SEGMENT_FILES] for i in range(0, len(stale), SEGMENT_FILES)]
+            if executor is not None and len(stale) > SEGMENT_FILES // 8:
+                shards = [b[j:j + 256] for b in batches for j in range(0, len(b), 256)]
+                entries = [e for part in executor.map(_index_shard, shards) for e in part]
+            else:
+                entries = [e for b in batches for e in _index_shard(b)]
+            for i in range(0, len(entries), SEGMENT_FILES):
+                self._write_segment(entries[i:i + SEGMENT_FILES])
+        self._drop_missing(set(files))
+        if self.segment_count() > MAX_SEGMENTS:
+            self.compact()
+        return len(stale)
+
+    def _write_segment(self, entries: list) -> None:
+        c = self._conn
+        seg = self._next_segment()
+        postings: dict = {}
+        with c:
+            c.executemany("DELETE FROM files WHERE path=?", [(e[0],) for e in entries])
+            for path, mtime, size, grams in entries:
+                cur = c.execute(
+                    "INSERT INTO files(path, mtime_ns, size, indexed) VALUES(?,?,?,?)",
+                    (path, mtime, size, int(grams is not None)),
+                )
+                fid = cur.lastrowid
+                self._rows[path] = (fid, mtime, size, grams is not None)
+                if grams is None:
+                    continue
+                for t in grams:
+                    lst = postings.get(t)
+                    if lst is None:
+                        postings[t] = lst = array("I")
+                    lst.append(fid)
+            c.executemany(
+                "INSERT INTO postings(tri, seg, ids) VALUES(?,?,?)",
+                ((t, seg, zlib.compress(ids.tobytes(), 1)) for t, ids in postings.items()),
+            )
+
+    def _drop_missing(self, current: Set[str]) -> None:
+        gone = [p for p in self._rows.keys() - current
+                if p.startswith(self.root) and not os.path.exists(p)]
+        if not gone:
+            return
+        with self._conn:
+            self._conn.executemany("DELETE FROM files WHERE path=?", [(p,) for p in gone])
+        for p in gone:
+            self._rows.pop(p, None)
+
+    def compact(self) -> None:
+        """Merge all segments into one, dropping ids of deleted/replaced files."""
+        live = {row[0] for row in self._rows.values()}
+        c = self._conn
+        with c:
+            c.execute("DROP TABLE IF EXISTS postings_new")
+            c.execute("CREATE TABLE postings_new(tri INTEGER NOT NULL, seg INTEGER NOT NULL, "
+                      "ids BLOB NOT NULL, PRIMARY KEY(tri, seg)) WITHOUT ROWID")
+            cur = c.execute("SELECT tri, ids FROM postings ORDER BY tri, seg")
+            tri_cur, merged = None, array("I")
+
+            def flush():
+                if tri_cur is not None and merged:
+                    c.execute("INSERT INTO postings_new VALUES(?,0,?)",
+                              (tri_cur, zlib.compress(merged.tobytes(), 1)))
+
+            for tri, blob in cur:
+                if tri != tri_cur:
+                    flush()
+                    tri_cur, merged = tri, array("I")
+                ids = array("I"); ids.frombytes(zlib.decompress(blob))
+                merged.extend(i for i in ids if i in live)
+            flush()
+            c.execute("DROP TABLE postings")
+            c.execute("ALTER TABLE postings_new RENAME TO postings")
+        c.execute("VACUUM")
+
+    # ─────────────────── query ────────────────────
+    def _posting(self, tri: int) -> Set[int]:
+        ids: Set[int] = set()
+        for (blob,) in self._conn.execute("SELECT ids FROM postings WHERE tri=?", (tri,)):
+            arr = array("I"); arr.frombytes(zlib.decompress(blob))
+            ids.update(arr)
+        return ids
+
+    def _ids_for_needle(self, needle: bytes) -> Optional[Set[int]]:
+        grams = needle_trigrams(needle)
+        if not grams:
+            return None
+        ids: Optional[Set[int]] = None
+        for t in grams:
+            post = self._posting(t)
+            ids = post if ids is None else ids & post
+            if not ids:
+                return set()
+        return ids
+
+    def candidate_paths(self, needles: Iterable[bytes], require_all: bool = False) -> Optional[Set[str]]:
+        """
+        Paths that may contain the needles (any, or all with `require_all`).
+        Unindexed files (binary/oversized) are always included. Returns None
+        when the index cannot narrow the search (e.g. an `any` needle shorter
+        than three bytes).
+        """
+        per_needle = []
+        for n in needles:
+            ids = self._ids_for_needle(n)
+            if ids is None:
+                if require_all:
+                    continue
+                return None
+            per_needle.append(ids)
+        if not per_needle:
+            return None
+        ids = set.intersection(*per_needle) if require_all else set().union(*per_needle)
+        return {p for p, (fid, _, _, indexed) in self._rows.items() if not indexed or fid in ids}
@@ -1,58 +1,54 @@
-from PyQt6.QtWidgets import QListWidgetItem, QFileDialog
+from PyQt6.QtWidgets import QListWidgetItem, QFileDialog, QLineEdit, QCheckBox
 from PyQt6.QtCore import QSignalBlocker
 from .utils import *
 
+def state_widgets(h) -> list:
+    """(state key, widget) for every shared field, in broadcast order."""
+    return [
+        ("directory",        h.dir_in),
+        ("strings",          h.strings_in),
+        ("allowed_exts",     h.allowed_exts_in),
+        ("exclude_exts",     h.exclude_exts_in),
+        ("allowed_types",    h.allowed_types_in),
+        ("exclude_types",    h.exclude_types_in),
+        ("allowed_dirs",     h.allowed_dirs_in),
+        ("exclude_dirs",     h.exclude_dirs_in),
+        ("allowed_patterns", h.allowed_patterns_in),
+        ("exclude_patterns", h.exclude_patterns_in),
+        ("add",              h.chk_add),
+        ("recursive",        h.chk_recursive),
+        ("total_strings",    h.chk_total),
+        ("parse_lines",      h.chk_parse),
+        ("get_lines",        h.chk_getlines),
+        ("spec_line",        h.spec_spin),
+    ]
+
 def _read_state(h) -> dict:
-    return dict(
-        directory=h.dir_in.text(),
-        strings=h.strings_in.text(),
-        allowed_exts=h.allowed_exts_in.text(),
-        exclude_exts=h.exclude_exts_in.text(),
-        allowed_types=h.allowed_types_in.text(),
-        exclude_types=h.exclude_types_in.text(),
-        allowed_dirs=h.allowed_dirs_in.text(),
-        exclude_dirs=h.exclude_dirs_in.text(),
-        allowed_patterns=h.allowed_patterns_in.text(),
-        exclude_patterns=h.exclude_patterns_in.text(),
-        add=h.chk_add.isChecked(),
-        recursive=h.chk_recursive.isChecked(),
-        total_strings=h.chk_total.isChecked(),
-        parse_lines=h.chk_parse.isChecked(),
-        get_lines=h.chk_getlines.isChecked(),
-        spec_line=h.spec_spin.value(),
-    )
+    state = {}
+    for key, w in state_widgets(h):
+        if isinstance(w, QLineEdit):
+            state[key] = w.text()
+        elif isinstance(w, QCheckBox):
+            state[key] = w.isChecked()
+        else:
+            state[key] = w.value()
+    return state
 
 def _write_state(h, s: dict):
+    """Apply `s` to the widgets; keys missing from `s` are left untouched (diff payloads)."""
     h._applying_remote = True
     try:
-        for w, val, setter in (
-            (h.dir_in,              s.get("directory",""), lambda w,v: w.setText(v)),
-            (h.strings_in,          s.get("strings",""),   lambda w,v: w.setText(v)),
-            (h.allowed_exts_in,     s.get("allowed_exts",""), lambda w,v: w.setText(v)),
-            (h.exclude_exts_in,     s.get("exclude_exts",""), lambda w,v: w.setText(v)),
-
-            (h.allowed_types_in,    s.get("allowed_types",""), lambda w,v: w.setText(v)),
-            (h.exclude_types_in,    s.get("exclude_types",""), lambda w,v: w.setText(v)),
-
-            (h.allowed_dirs_in,     s.get("allowed_dirs",""), lambda w,v: w.setText(v)),
-            (h.exclude_dirs_in,     s.get("exclude_dirs",""), lambda w,v: w.setText(v)),
-
-            (h.allowed_patterns_in, s.get("allowed_patterns",""), lambda w,v: w.setText(v)),
-            (h.exclude_patterns_in, s.get("exclude_patterns",""), lambda w,v: w.setText(v)),
-        ):
-            with QSignalBlocker(w): setter(w, val)
-
-        for w, val in (
-            (h.chk_add,       s.get("add", False)),
-            (h.chk_recursive, s.get("recursive", True)),
-            (h.chk_total,     s.get("total_strings", False)),
-            (h.chk_parse,     s.get("parse_lines", False)),
-            (h.chk_getlines,  s.get("get_lines", True)),
-        ):
-            with QSignalBlocker(w): w.setChecked(val)
-
-        with QSignalBlocker(h.spec_spin):
-            h.spec_spin.setValue(int(s.get("spec_line", 0)) or 0)
+        for key, w in state_widgets(h):
+            if key not in s:
+                continue
+            val = s[key]
+            with QSignalBlocker(w):
+                if isinstance(w, QLineEdit):
+                    w.setText(val or "")
+                elif isinstance(w, QCheckBox):
+                    w.setChecked(bool(val))
+                else:
+                    w.setValue(int(val or 0))
     finally:
         h._applying_remote = False
 read_state = _read_state
@@ -0,0 +1,7 @@
+from .filters import *
+from .ignore import *
+from .latency import *
+from .walker import *
+from .snapshot import *
+from .watch import *
+from .dirstats import *
@@ -0,0 +1,129 @@
+"""
+Per-directory size / file-count / newest-mtime aggregation.
+
+One walk (filters and ignore files applied) groups files by their parent
+directory; each directory's own files are then stat'ed in a thread pool,
+and totals are folded bottom-up in reverse pre-order. A directory's own
+figures are cached against its mtime_ns, so revisiting an unchanged tree
+costs one stat per directory. In-place edits that do not touch the
+directory entry (e.g. appending to an existing file) keep the cached
+figures until the directory itself changes or `refresh=True` is passed.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .filters import PathFilter
+from .latency import io_profile
+from .snapshot import default_snapshot_cache
+
+STATS_WORKERS = 8            # threads stat'ing directories on a local disk
+DIRSTATS_LIMIT = 500_000     # cached directories before the cache is emptied
+
+@dataclass
+class DirStats:
+    bytes: int = 0
+    files: int = 0
+    dirs: int = 0
+    newest_mtime_ns: int = 0
+
+    def add(self, other: "DirStats") -> None:
+        self.bytes += other.bytes
+        self.files += other.files
+        self.dirs += other.dirs
+        if other.newest_mtime_ns > self.newest_mtime_ns:
+            self.newest_mtime_ns = other.newest_mtime_ns
+
+class DirStatsCache:
+    """(dir, PathFilter) → (dir mtime_ns, own-files DirStats); thread-safe."""
+
+    def __init__(self, limit: int = DIRSTATS_LIMIT) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._own: Dict[Tuple[str, PathFilter], Tuple[int, DirStats]] = {}
+
+    def get(self, key: Tuple[str, PathFilter], mtime_ns: int) -> Optional[DirStats]:
+        hit = self._own.get(key)
+        return hit[1] if hit is not None and hit[0] == mtime_ns else None
+
+    def put(self, key: Tuple[str, PathFilter], mtime_ns: int, own: DirStats) -> None:
+        with self._lock:
+            if len(self._own) >= self.limit:
+                self._own.clear()
+            self._own[key] = (mtime_ns, own)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._own.clear()
+
+_DEFAULT_DIRSTATS: Optional[DirStatsCache] = None
+
+def default_dirstats_cache() -> DirStatsCache:
+    global _DEFAULT_DIRSTATS
+    if _DEFAULT_DIRSTATS is None:
+        _DEFAULT_DIRSTATS = DirStatsCache()
+    return _DEFAULT_DIRSTATS
+
+def _own_stats(dirpath: str, files: List[Any], flt: PathFilter, cache: DirStatsCache,
+               refresh: bool) -> DirStats:
+    """Stats of the files directly in `dirpath` (cached by the directory's mtime)."""
+    try:
+        mtime = os.stat(dirpath).st_mtime_ns
+    except OSError:
+        mtime = -1
+    key = (dirpath, flt)
+    if not refresh and mtime >= 0:
+        hit = cache.get(key, mtime)
+        if hit is not None:
+            return hit
+    own = DirStats()
+    for e in files:
+        st = e.stat()
+        if st is None:
+            continue
+        own.bytes += st.st_size
+        own.files += 1
+        if st.st_mtime_ns > own.newest_mtime_ns:
+            own.newest_mtime_ns = st.st_mtime_ns
+    if mtime >= 0:
+        cache.put(key, mtime, own)
+    return own
+
+def directory_stats(directory: str, cfg: Any = None, recursive: bool = True, *,
+                    path_filter: Optional[PathFilter] = None, workers: Optional[int] = None,
+                    token: Any = None, refresh: bool = False,
+                    cache: Optional[DirStatsCache] = None, **_) -> Dict[str, DirStats]:
+    """
+    Recursive totals for `directory` and every directory under it:
+    {dirpath: DirStats(bytes, files, dirs, newest_mtime_ns)}. Returns {} if
+    `token` is cancelled part way.
+    """
+    root = os.path.abspath(directory)
+    flt = PathFilter.coerce(path_filter or cfg)
+    cache = cache or default_dirstats_cache()
+    order: List[str] = [root]                    # pre-order, parents first
+    files: Dict[str, List[Any]] = {root: []}
+    for e in default_snapshot_cache().iter_entries(root, flt, recursive, token=token):
+        if e.is_dir:
+            order.append(e.path)
+            files.setdefault(e.path, [])
+        else:
+            files.setdefault(os.path.dirname(e.path), []).append(e)
+    if token is not None and token.cancelled:
+        return {}
+
+    n = workers or max(STATS_WORKERS, io_profile(root).io_workers)
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        owns = list(ex.map(lambda d: _own_stats(d, files.get(d, ()), flt, cache, refresh), order))
+    if token is not None and token.cancelled:
+        return {}
+
+    totals = {d: DirStats(o.bytes, o.files, 0, o.newest_mtime_ns) for d, o in zip(order, owns)}
+    for d in reversed(order[1:]):               # children are folded before their parents
+        parent = totals.get(os.path.dirname(d))
+        if parent is not None:
+            parent.add(totals[d])
+            parent.dirs += 1
+    return totals
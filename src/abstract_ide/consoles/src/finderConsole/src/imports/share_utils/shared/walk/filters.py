@@ -0,0 +1,231 @@
+import os
+import re
+from fnmatch import translate
+from typing import Any, Iterable, List, Optional
+
+# ───────────────────── type buckets ──────────────────────
+# allowed_types / exclude_types name categories, not extensions.
+FILE_TYPE_EXTS: dict[str, frozenset] = {
+    "image":       frozenset({".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".svg", ".ico", ".tif", ".tiff"}),
+    "video":       frozenset({".mp4", ".mkv", ".mov", ".avi", ".webm", ".flv", ".wmv", ".m4v"}),
+    "audio":       frozenset({".mp3", ".wav", ".flac", ".ogg", ".aac", ".m4a"}),
+    "compression": frozenset({".zip", ".tar", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst"}),
+    "document":    frozenset({".pdf", ".doc", ".docx", ".odt", ".rtf", ".xls", ".xlsx", ".ppt", ".pptx"}),
+    "binary":      frozenset({".so", ".dll", ".dylib", ".exe", ".bin", ".o", ".a", ".pyc", ".pyo", ".class", ".whl"}),
+    "text":        frozenset({".txt", ".md", ".rst", ".csv", ".log", ".ini", ".cfg", ".toml", ".yaml", ".yml", ".json", ".xml"}),
+    "code":        frozenset({".py", ".js", ".jsx", ".ts", ".tsx", ".c", ".h", ".cpp", ".hpp", ".rs", ".go",
+                              ".java", ".sh", ".html", ".css", ".scss", ".sql", ".php", ".rb"}),
+}
+
+# ───────────────────── cfg accessors ─────────────────────
+
+def cfg_value(cfg: Any, key: str, default=None):
+    """Read `key` from the `define_defaults` cfg (dict or attribute object)."""
+    if cfg is None:
+        return default
+    if isinstance(cfg, dict):
+        return cfg.get(key, default)
+    return getattr(cfg, key, default)
+
+def as_tuple(value) -> tuple:
+    """Normalize a filter value (None/bool/str/iterable) to a tuple of strings."""
+    if value is None or isinstance(value, bool):
+        return ()
+    if isinstance(value, str):
+        splitter = "|" if "|" in value else ","
+        return tuple(v.strip() for v in value.split(splitter) if v.strip())
+    if isinstance(value, Iterable):
+        return tuple(str(v).strip() for v in value if str(v).strip())
+    return (str(value),)
+
+def _norm_ext(e: str) -> str:
+    e = e.lower()
+    return e if e.startswith(".") else "." + e
+
+def _types_to_exts(types: Iterable[str]) -> set:
+    exts = set()
+    for t in types:
+        exts |= FILE_TYPE_EXTS.get(t.lower(), frozenset())
+    return exts
+
+# ───────────────────── path predicates ───────────────────
+
+def _dir_hit(dirpath: str, parts: tuple, dirs: tuple) -> bool:
+    for d in dirs:
+        if os.sep in d or "/" in d:
+            d_abs = os.path.normpath(d)
+            if dirpath == d_abs or dirpath.startswith(d_abs + os.sep):
+                return True
+        elif d in parts:
+            return True
+    return False
+
+def dir_allowed(dirpath: str, cfg: Any) -> bool:
+    """Return False when a directory should be pruned from the walk."""
+    exclude_dirs = as_tuple(cfg_value(cfg, "exclude_dirs"))
+    if not exclude_dirs:
+        return True
+    dirpath = os.path.normpath(dirpath)
+    return not _dir_hit(dirpath, (os.path.basename(dirpath),), exclude_dirs)
+
+def path_allowed(path: str, cfg: Any) -> bool:
+    """Apply the extension/type/dir/pattern filters from `cfg` to one file path.
+
+    Compiles `cfg` on every call; hot loops should build a PathFilter once.
+    """
+    if cfg is None:
+        return True
+    return PathFilter.coerce(cfg)(os.path.normpath(path))
+
+# ───────────────────── compiled filter ───────────────────
+
+def _compile_globs(patterns: Iterable[str]) -> Optional["re.Pattern"]:
+    patterns = tuple(patterns)
+    return re.compile("|".join(translate(p) for p in patterns)) if patterns else None
+
+def _split_dirs(dirs: tuple) -> tuple:
+    """exclude/allowed dirs → (frozenset of bare names, tuple of normalized path prefixes)."""
+    names = frozenset(d for d in dirs if "/" not in d and os.sep not in d)
+    prefixes = tuple(os.path.normpath(d) for d in dirs if "/" in d or os.sep in d)
+    return names, prefixes
+
+def _split_patterns(patterns: tuple) -> tuple:
+    """Glob patterns → (regex on the file name, regex on the full path); None when unused."""
+    by_path = tuple(p for p in patterns if "/" in p or os.sep in p)
+    by_name = tuple(p for p in patterns if p not in by_path)
+    return _compile_globs(by_name), _compile_globs(by_path)
+
+def _prefix_hit(path: str, prefixes: tuple) -> bool:
+    for p in prefixes:
+        if path == p or path.startswith(p + os.sep):
+            return True
+    return False
+
+class PathFilter:
+    """
+    Compiled, picklable form of the `cfg` path filters.
+
+    Extensions (including expanded type buckets) become frozensets, bare dir
+    names a frozenset checked with `isdisjoint`, and each pattern list one
+    combined regex, so a path costs a handful of set lookups and at most two
+    regex matches. Semantics match `path_allowed`; paths are expected to be
+    normalized already (the walker yields them that way).
+    """
+    __slots__ = ("allowed_exts", "exclude_exts",
+                 "allowed_dir_names", "allowed_dir_prefixes",
+                 "exclude_dir_names", "exclude_dir_prefixes",
+                 "allowed_name_rx", "allowed_path_rx",
+                 "exclude_name_rx", "exclude_path_rx", "noop")
+
+    def __init__(self, cfg: Any = None) -> None:
+        allowed = {_norm_ext(e) for e in as_tuple(cfg_value(cfg, "allowed_exts"))}
+        allowed |= _types_to_exts(as_tuple(cfg_value(cfg, "allowed_types")))
+        excluded = {_norm_ext(e) for e in as_tuple(cfg_value(cfg, "exclude_exts"))}
+        excluded |= _types_to_exts(as_tuple(cfg_value(cfg, "exclude_types")))
+        self.allowed_exts = frozenset(allowed) if allowed else None
+        self.exclude_exts = frozenset(excluded)
+        self.allowed_dir_names, self.allowed_dir_prefixes = _split_dirs(as_tuple(cfg_value(cfg, "allowed_dirs")))
+        self.exclude_dir_names, self.exclude_dir_prefixes = _split_dirs(as_tuple(cfg_value(cfg, "exclude_dirs")))
+        self.allowed_name_rx, self.allowed_path_rx = _split_patterns(as_tuple(cfg_value(cfg, "allowed_patterns")))
+        self.exclude_name_rx, self.exclude_path_rx = _split_patterns(as_tuple(cfg_value(cfg, "exclude_patterns")))
+        self.noop = not any((
+            self.allowed_exts, self.exclude_exts,
+            self.allowed_dir_names, self.allowed_dir_prefixes,
+            self.exclude_dir_names, self.exclude_dir_prefixes,
+            self.allowed_name_rx, self.allowed_path_rx,
+            self.exclude_name_rx, self.exclude_path_rx,
+        ))
+
+    def key(self) -> tuple:
+        """Hashable identity of the filter state (regexes compare by source)."""
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PathFilter) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    @classmethod
+    def coerce(cls, cfg: Any) -> "PathFilter":
+        """Accept either a ready PathFilter or a raw cfg."""
+        return cfg if isinstance(cfg, cls) else cls(cfg)
+
+    def __call__(self, path: str) -> bool:
+        if self.noop:
+            return True
+        sep = path.rfind(os.sep)
+        dirpath = path[:sep] if sep > 0 else path[:sep + 1]
+        return self.dir_ok(dirpath) and self.name_ok(path, path[sep + 1:])
+
+    def dir_ok(self, dirpath: str) -> bool:
+        """allowed_dirs / exclude_dirs check for a file's parent directory."""
+        if self.allowed_dir_names or self.allowed_dir_prefixes:
+            if (self.allowed_dir_names.isdisjoint(dirpath.split(os.sep))
+                    and not _prefix_hit(dirpath, self.allowed_dir_prefixes)):
+                return False
+        if self.exclude_dir_names and not self.exclude_dir_names.isdisjoint(dirpath.split(os.sep)):
+            return False
+        return not (self.exclude_dir_prefixes and _prefix_hit(dirpath, self.exclude_dir_prefixes))
+
+    def name_ok(self, path: str, name: str) -> bool:
+        """Extension and pattern checks for one file."""
+        i = name.rfind(".")
+        ext = name[i:].lower() if i > 0 and name[:i].strip(".") else ""
+        if self.allowed_exts is not None and ext not in self.allowed_exts:
+            return False
+        if ext in self.exclude_exts:
+            return False
+        if self.allowed_name_rx is not None or self.allowed_path_rx is not None:
+            if not ((self.allowed_name_rx is not None and self.allowed_name_rx.match(name))
+                    or (self.allowed_path_rx is not None and self.allowed_path_rx.match(path))):
+                return False
+        if self.exclude_name_rx is not None and self.exclude_name_rx.match(name):
+            return False
+        return not (self.exclude_path_rx is not None and self.exclude_path_rx.match(path))
+
+    def select(self, paths: Iterable[str]) -> List[str]:
+        """
+        Filter many paths at once. The directory verdict is computed once per
+        directory and the extension sets are checked inline; the pattern
+        regexes only run when patterns were given.
+        """
+        if self.noop:
+            return list(paths)
+        sep_char, dir_ok, name_ok = os.sep, self.dir_ok, self.name_ok
+        allowed, excluded = self.allowed_exts, self.exclude_exts
+        has_patterns = any((self.allowed_name_rx, self.allowed_path_rx,
+                            self.exclude_name_rx, self.exclude_path_rx))
+        seen: dict = {}
+        out = []
+        append = out.append
+        for path in paths:
+            sep = path.rfind(sep_char)
+            dirpath = path[:sep] if sep > 0 else path[:sep + 1]
+            ok = seen.get(dirpath)
+            if ok is None:
+                ok = seen[dirpath] = dir_ok(dirpath)
+            if not ok:
+                continue
+            if has_patterns:
+                if name_ok(path, path[sep + 1:]):
+                    append(path)
+                continue
+            dot = path.rfind(".")
+            ext = path[dot:].lower() if dot > sep + 1 and path[sep + 1:dot].strip(".") else ""
+            if (allowed is None or ext in allowed) and ext not in excluded:
+                append(path)
+        return out
+
+    def prunes_dir(self, path: str, name: str) -> bool:
+        """True when the walker should not descend into `path` (exclude_dirs/exclude_patterns)."""
+        if name in self.exclude_dir_names:
+            return True
+        if self.exclude_dir_prefixes and _prefix_hit(path, self.exclude_dir_prefixes):
+            return True
+        if self.exclude_name_rx is not None and self.exclude_name_rx.match(name):
+            return True
+        return self.exclude_path_rx is not None and bool(self.exclude_path_rx.match(path))
+
+def compile_filter(cfg: Any) -> PathFilter:
+    return PathFilter.coerce(cfg)
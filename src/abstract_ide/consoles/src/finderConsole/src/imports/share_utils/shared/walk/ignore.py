@@ -0,0 +1,147 @@
+"""
+Minimal .gitignore / .ignore support for the directory walker.
+
+Rules follow gitignore semantics closely enough for pruning: `#` comments,
+`!` negation, trailing `/` for directory-only rules, patterns containing a
+`/` are anchored to the ignore file's directory, `**` spans directories, and
+the last matching rule wins (deeper files are consulted after shallower ones).
+"""
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+IGNORE_FILES = (".gitignore", ".ignore")
+PARENT_SEARCH_LIMIT = 32   # stop climbing for a repo root after this many levels
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    regex: "re.Pattern"
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+def _glob_to_regex(pat: str) -> str:
+    out, i, n = [], 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if c == "*":
+            if pat[i:i + 3] == "**/":
+                out.append("(?:.*/)?"); i += 3; continue
+            if pat[i:i + 2] == "**":
+                out.append(".*"); i += 2; continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pat.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pat[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pat[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+def parse_ignore_line(line: str) -> Optional[IgnoreRule]:
+    line = line.rstrip("\n").rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    if line.endswith("/**"):
+        rx = _glob_to_regex(line[:-3]) + "/.*"
+    else:
+        rx = _glob_to_regex(line)
+    return IgnoreRule(re.compile(rx + r"\Z"), negate, dir_only, anchored)
+
+class IgnoreRules:
+    """The rules of one ignore file, matched relative to its directory."""
+    __slots__ = ("base", "rules")
+
+    def __init__(self, base: str, rules: Iterable[IgnoreRule]) -> None:
+        self.base = base.rstrip(os.sep)
+        self.rules = tuple(rules)
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["IgnoreRules"]:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                rules = [r for r in map(parse_ignore_line, f) if r is not None]
+        except OSError:
+            return None
+        return cls(os.path.dirname(path), rules) if rules else None
+
+    def decide(self, path: str, name: str, is_dir: bool) -> Optional[bool]:
+        """True (ignored) / False (re-included) / None (no rule matched)."""
+        if not path.startswith(self.base + os.sep):
+            return None
+        rel = path[len(self.base) + 1:]
+        if os.sep != "/":
+            rel = rel.replace(os.sep, "/")
+        verdict = None
+        for r in self.rules:
+            if r.dir_only and not is_dir:
+                continue
+            if r.regex.match(rel if r.anchored else name):
+                verdict = not r.negate
+        return verdict
+
+IgnoreChain = Tuple[IgnoreRules, ...]
+
+def is_ignored(chain: IgnoreChain, path: str, name: str, is_dir: bool) -> bool:
+    ignored = False
+    for rules in chain:
+        verdict = rules.decide(path, name, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+def rules_in_dir(dirpath: str, names: Iterable[str]) -> List[IgnoreRules]:
+    """Load the ignore files present in `names` (a directory listing of `dirpath`)."""
+    present = set(names)
+    found = (IgnoreRules.from_file(os.path.join(dirpath, n)) for n in IGNORE_FILES if n in present)
+    return [r for r in found if r is not None]
+
+def parent_rules(root: str, ceiling: Optional[str] = None) -> IgnoreChain:
+    """
+    Ignore files between the enclosing repository root (the nearest parent
+    holding `.git`) and `root`, outermost first. Empty when `root` is not
+    inside a repository, unless `ceiling` (an ancestor of `root`, e.g. the
+    directory a walk started from) is reached first.
+    """
+    parents, cur = [], os.path.dirname(os.path.abspath(root))
+    ceiling = os.path.abspath(ceiling) if ceiling else None
+    if ceiling is not None and not (os.path.abspath(root) + os.sep).startswith(ceiling.rstrip(os.sep) + os.sep):
+        ceiling = None
+    for _ in range(PARENT_SEARCH_LIMIT):
+        parents.append(cur)
+        if cur == ceiling or os.path.exists(os.path.join(cur, ".git")):
+            break
+        nxt = os.path.dirname(cur)
+        if nxt == cur:
+            return ()
+        cur = nxt
+    else:
+        return ()
+    chain: List[IgnoreRules] = []
+    for d in reversed(parents):
+        chain.extend(r for r in (IgnoreRules.from_file(os.path.join(d, n)) for n in IGNORE_FILES) if r)
+    return tuple(chain)
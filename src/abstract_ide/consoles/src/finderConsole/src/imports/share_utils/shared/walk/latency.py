@@ -0,0 +1,170 @@
+"""
+High-latency mount detection and the I/O profile used on such mounts.
+
+GVFS (sftp://, smb://) and other FUSE/network filesystems answer every stat,
+listing and read with a round trip, so the serial one-syscall-at-a-time walk
+that is ideal on a local disk spends most of its time waiting. `io_profile`
+maps a path to LOCAL_PROFILE or REMOTE_PROFILE from the mount table; the
+walker, snapshot cache and search engine consult it to list directories
+ahead in a small thread pool, keep metadata for longer, read in larger
+sequential blocks and search with I/O threads instead of CPU processes.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MOUNT_TTL = 5.0             # seconds the parsed mount table is reused
+METADATA_LIMIT = 200_000    # cached stat results before the cache is emptied
+
+# fuse.* types that are local despite going through FUSE
+LOCAL_FUSE_TYPES = frozenset({"fuseblk", "fuse.lxcfs", "fuse.portal", "fuse.snapfuse",
+                              "fuse.appimagefuse", "fuse.gocryptfs", "fuse.encfs"})
+NETWORK_FS_TYPES = frozenset({"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs",
+                              "ceph", "glusterfs", "davfs", "fuse"})
+
+@dataclass(frozen=True)
+class IOProfile:
+    """How aggressively to overlap I/O under a given root (picklable)."""
+    name: str
+    remote: bool
+    list_workers: int       # directory listings in flight during a walk (<= 1: serial)
+    list_ahead: int         # max listings fetched ahead of the walk
+    io_workers: int         # search threads (0: default process pool)
+    read_buffer: int        # buffered read size per file
+    mmap_threshold: int     # files at/above this size are mmapped
+    meta_ttl: float         # seconds stat results / snapshot validation are trusted
+
+LOCAL_PROFILE = IOProfile("local", False, 0, 0, 0, 1024 * 1024, 4 * 1024 * 1024, 1.0)
+REMOTE_PROFILE = IOProfile("remote", True, 8, 256, 16, 4 * 1024 * 1024, 1 << 62, 30.0)
+
+# ───────────────────────── mounts ─────────────────────────
+
+_mounts: List[Tuple[str, str]] = []      # (mount point, fs type), longest first
+_mounts_read = 0.0
+_overrides: Dict[str, IOProfile] = {}
+
+def _unescape(field: str) -> str:
+    # mountinfo escapes space, tab, newline and backslash as \ooo
+    return field.replace("\\040", " ").replace("\\011", "\t").replace("\\012", "\n").replace("\\134", "\\")
+
+def mount_table() -> List[Tuple[str, str]]:
+    """(mount point, fs type) pairs from /proc/self/mountinfo, longest mount point first."""
+    global _mounts, _mounts_read
+    now = time.monotonic()
+    if now - _mounts_read < MOUNT_TTL:
+        return _mounts
+    table = []
+    try:
+        with open("/proc/self/mountinfo", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                left, _, right = line.partition(" - ")
+                fields = left.split()
+                if len(fields) >= 5 and right:
+                    table.append((_unescape(fields[4]), right.split()[0]))
+    except OSError:
+        pass
+    table.sort(key=lambda m: len(m[0]), reverse=True)
+    _mounts, _mounts_read = table, now
+    return table
+
+def mount_type(path: str) -> str:
+    """Filesystem type of the mount holding `path` ("" when unknown)."""
+    path = os.path.abspath(path)
+    for point, fstype in mount_table():
+        if path == point or path.startswith(point.rstrip("/") + "/"):
+            return fstype
+    return ""
+
+def is_high_latency(path: str) -> bool:
+    """True for GVFS mounts and FUSE/network filesystems."""
+    if "/gvfs/" in os.path.abspath(path) + "/":
+        return True
+    fstype = mount_type(path)
+    if fstype in LOCAL_FUSE_TYPES:
+        return False
+    return fstype in NETWORK_FS_TYPES or fstype.startswith("fuse.")
+
+def set_io_profile(root: str, profile: Optional[IOProfile] = None) -> None:
+    """Force `profile` for everything under `root` (None removes the override)."""
+    root = os.path.abspath(root)
+    if profile is None:
+        _overrides.pop(root, None)
+    else:
+        _overrides[root] = profile
+
+def io_profile(path: str) -> IOProfile:
+    path = os.path.abspath(path)
+    for root, profile in _overrides.items():
+        if path == root or path.startswith(root + os.sep):
+            return profile
+    return REMOTE_PROFILE if is_high_latency(path) else LOCAL_PROFILE
+
+# ───────────────────────── metadata ─────────────────────────
+
+class MetadataCache:
+    """stat() results kept for `ttl` seconds; misses can be fetched in parallel."""
+
+    def __init__(self, ttl: float = REMOTE_PROFILE.meta_ttl, limit: int = METADATA_LIMIT) -> None:
+        self.ttl = ttl
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+
+    def _fresh(self, path: str, now: float):
+        hit = self._stats.get(path)
+        return hit if hit is not None and now - hit[0] < self.ttl else None
+
+    def stat(self, path: str) -> Optional[os.stat_result]:
+        hit = self._fresh(path, time.monotonic())
+        if hit is not None:
+            return hit[1]
+        try:
+            st = os.stat(path)
+        except OSError:
+            st = None
+        with self._lock:
+            if len(self._stats) >= self.limit:
+                self._stats.clear()
+            self._stats[path] = (time.monotonic(), st)
+        return st
+
+    def stat_many(self, paths: Iterable[str], workers: int = REMOTE_PROFILE.list_workers
+                  ) -> Dict[str, Optional[os.stat_result]]:
+        now = time.monotonic()
+        out, missing = {}, []
+        for p in paths:
+            hit = self._fresh(p, now)
+            if hit is None:
+                missing.append(p)
+            else:
+                out[p] = hit[1]
+        out.update(zip(missing, parallel_map(self.stat, missing, workers)))
+        return out
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._stats.clear()
+            else:
+                self._stats.pop(path, None)
+
+_DEFAULT_METADATA: Optional[MetadataCache] = None
+
+def default_metadata_cache() -> MetadataCache:
+    global _DEFAULT_METADATA
+    if _DEFAULT_METADATA is None:
+        _DEFAULT_METADATA = MetadataCache()
+    return _DEFAULT_METADATA
+
+def parallel_map(fn: Callable[[T], R], items: List[T], workers: int) -> List[R]:
+    """Ordered map over a bounded thread pool; serial for one worker or item."""
+    if workers <= 1 or len(items) <= 1:
+        return [fn(x) for x in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as ex:
+        return list(ex.map(fn, items))
@@ -0,0 +1,218 @@
+"""
+Process-wide cache of walked trees, shared by every Finder tab.
+
+A snapshot is keyed by (resolved root, PathFilter, recursive, ignore-files)
+and holds the walk in pre-order (path, is_dir, depth, last), so one walk
+serves file lists, (dirs, files) pairs and the directory map alike. Its
+fingerprint is the mtime of every listed directory plus every .gitignore/
+.ignore seen: adding, removing or renaming anything changes a directory
+mtime, so revalidating costs one stat per directory instead of a re-walk.
+On high-latency mounts those stats run in parallel and a validated snapshot
+is trusted for the profile's meta_ttl instead of VALIDATE_INTERVAL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .filters import PathFilter
+from .ignore import IGNORE_FILES
+from .latency import default_metadata_cache, io_profile, parallel_map
+from .walker import WalkEntry, walk_entries
+
+SNAPSHOT_LIMIT = 8          # snapshots kept (LRU)
+VALIDATE_INTERVAL = 1.0     # seconds a validated snapshot is trusted without re-stat
+
+@dataclass
+class TreeSnapshot:
+    root: str
+    entries: List[Tuple[str, bool, int, bool]]      # (path, is_dir, depth, last), pre-order
+    fingerprint: Dict[str, int]                     # listed dir / ignore file → mtime_ns
+    checked: float = field(default_factory=time.monotonic)
+
+    @property
+    def files(self) -> List[str]:
+        return [p for p, is_dir, _, _ in self.entries if not is_dir]
+
+    @property
+    def dirs(self) -> List[str]:
+        return [p for p, is_dir, _, _ in self.entries if is_dir]
+
+    def is_current(self) -> bool:
+        profile = io_profile(self.root)
+        if profile.remote:
+            paths = list(self.fingerprint)
+            stats = parallel_map(_stat_or_none, paths, profile.list_workers)
+            return all(st is not None and st.st_mtime_ns == self.fingerprint[p]
+                       for p, st in zip(paths, stats))
+        for path, mtime in self.fingerprint.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+SnapshotKey = Tuple[str, PathFilter, bool, bool]
+
+class SnapshotCache:
+    """Thread-safe LRU of TreeSnapshots; walks run outside the lock."""
+
+    def __init__(self, limit: int = SNAPSHOT_LIMIT) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._snaps: "OrderedDict[SnapshotKey, TreeSnapshot]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(directory: str, cfg: Any = None, recursive: bool = True,
+                 use_ignore_files: bool = True) -> SnapshotKey:
+        return (os.path.abspath(directory), PathFilter.coerce(cfg), bool(recursive), bool(use_ignore_files))
+
+    def lookup(self, key: SnapshotKey) -> Optional[TreeSnapshot]:
+        """A still-valid snapshot for `key`, or None (stale ones are dropped)."""
+        with self._lock:
+            snap = self._snaps.get(key)
+            if snap is not None:
+                self._snaps.move_to_end(key)
+        if snap is None:
+            return None
+        now = time.monotonic()
+        if now - snap.checked > max(VALIDATE_INTERVAL, io_profile(snap.root).meta_ttl):
+            if not snap.is_current():
+                self.invalidate(key)
+                return None
+            snap.checked = now
+        return snap
+
+    def store(self, key: SnapshotKey, snap: TreeSnapshot) -> None:
+        with self._lock:
+            self._snaps[key] = snap
+            self._snaps.move_to_end(key)
+            while len(self._snaps) > self.limit:
+                self._snaps.popitem(last=False)
+
+    def invalidate(self, key: Optional[SnapshotKey] = None, root: Optional[str] = None) -> None:
+        """Drop one key, every snapshot under `root`, or (no args) everything."""
+        with self._lock:
+            if key is not None:
+                self._snaps.pop(key, None)
+            elif root is not None:
+                root = os.path.abspath(root)
+                for k in [k for k in self._snaps if k[0] == root or k[0].startswith(root + os.sep)
+                          or root.startswith(k[0] + os.sep)]:
+                    del self._snaps[k]
+            else:
+                self._snaps.clear()
+
+    # ───────────── consumers ─────────────
+    def iter_entries(self, directory: str, cfg: Any = None, recursive: bool = True, *,
+                     use_ignore_files: bool = True, token: Any = None) -> Iterator[WalkEntry]:
+        """
+        Pre-order entries (dirs included) from the cache, or from a fresh walk
+        that is streamed through and stored once it completes uncancelled.
+        Cached rows are replayed as CachedEntry objects.
+        """
+        key = self.make_key(directory, cfg, recursive, use_ignore_files)
+        snap = self.lookup(key)
+        if snap is not None:
+            self.hits += 1
+            for row in snap.entries:
+                yield CachedEntry(*row)
+            return
+        self.misses += 1
+        entries: List[Tuple[str, bool, int, bool]] = []
+        fingerprint: Dict[str, int] = {}
+
+        # remote walks have already fetched these stats while listing ahead
+        stat = default_metadata_cache().stat if io_profile(key[0]).remote else _stat_or_none
+
+        def on_listing(dirpath, listing):
+            st = stat(dirpath)
+            if st is not None:
+                fingerprint[dirpath] = st.st_mtime_ns
+            for e in listing:
+                if e.name in IGNORE_FILES:
+                    st = stat(e.path)
+                    if st is not None:
+                        fingerprint[e.path] = st.st_mtime_ns
+
+        for e in walk_entries(key[0], key[1], recursive, include_dirs=True,
+                              use_ignore_files=use_ignore_files, token=token, on_listing=on_listing):
+            entries.append((e.path, e.is_dir, e.depth, e.last))
+            yield e
+        if token is not None and token.cancelled:
+            return
+        self.store(key, TreeSnapshot(key[0], entries, fingerprint))
+
+    def files(self, directory: str, cfg: Any = None, recursive: bool = True, **kw) -> List[str]:
+        return [e.path for e in self.iter_entries(directory, cfg, recursive, **kw) if not e.is_dir]
+
+class CachedEntry:
+    """Replayed snapshot row; mirrors the WalkEntry attributes consumers use."""
+    __slots__ = ("path", "is_dir", "depth", "last")
+
+    def __init__(self, path: str, is_dir: bool, depth: int, last: bool) -> None:
+        self.path, self.is_dir, self.depth, self.last = path, is_dir, depth, last
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def stat(self) -> Optional[os.stat_result]:
+        try:
+            return os.stat(self.path)
+        except OSError:
+            return None
+
+_DEFAULT_CACHE: Optional[SnapshotCache] = None
+
+def default_snapshot_cache() -> SnapshotCache:
+    """The cache shared by all tabs in this process (also exposed as `SharedStateBus.snapshots`)."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = SnapshotCache()
+    return _DEFAULT_CACHE
+
+# ───────────────────── listing helpers ─────────────────────
+
+def walk_files(directory: str, cfg: Any = None, recursive: bool = True,
+               path_filter: Optional[PathFilter] = None, **_) -> List[str]:
+    """Filtered file paths under `directory` (replaces `collect_filepaths(**make_params(...))`)."""
+    return default_snapshot_cache().files(directory, path_filter or cfg, recursive)
+
+def iter_walk_files(directory: str, cfg: Any = None, recursive: bool = True,
+                    path_filter: Optional[PathFilter] = None, token: Any = None, **_) -> Iterator[str]:
+    """Streaming `walk_files`: paths are yielded as the walk (or cached snapshot) produces them."""
+    for e in default_snapshot_cache().iter_entries(directory, path_filter or cfg, recursive, token=token):
+        if not e.is_dir:
+            yield e.path
+
+def walk_files_and_dirs(directory: str, cfg: Any = None, recursive: bool = True,
+                        path_filter: Optional[PathFilter] = None, **_) -> Tuple[List[str], List[str]]:
+    """(dirs, files) under `directory` (replaces `get_files_and_dirs(**make_params(...))`)."""
+    dirs, files = [], []
+    for e in default_snapshot_cache().iter_entries(directory, path_filter or cfg, recursive):
+        (dirs if e.is_dir else files).append(e.path)
+    return dirs, files
+
+def iter_directory_map(directory: str, cfg: Any = None, recursive: bool = True,
+                       path_filter: Optional[PathFilter] = None, **_) -> Iterator[str]:
+    """Yield the lines of a tree-style map of `directory`, one per entry."""
+    root = os.path.abspath(directory)
+    yield (os.path.basename(root) or root) + "/"
+    lasts: List[bool] = []
+    for e in default_snapshot_cache().iter_entries(root, path_filter or cfg, recursive):
+        del lasts[e.depth - 1:]
+        prefix = "".join("    " if last else "│   " for last in lasts)
+        lasts.append(e.last)
+        yield f"{prefix}{'└── ' if e.last else '├── '}{e.name}{'/' if e.is_dir else ''}"
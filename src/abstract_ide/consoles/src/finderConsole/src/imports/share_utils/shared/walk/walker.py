@@ -0,0 +1,224 @@
+"""
+Shared os.scandir walker for the Finder tabs.
+
+One pass over the tree with early pruning: excluded dirs, exclude_patterns,
+DEFAULT_SKIP_DIRS and anything matched by .gitignore/.ignore are dropped
+before they are listed. Entries carry the scandir DirEntry, so `is_dir` costs
+no syscall on most filesystems and `stat()` is done at most once per file.
+
+Traversal is depth-first pre-order with names sorted per directory (files
+first, then subdirectories), which gives stable output for maps and lists.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .filters import PathFilter
+from .ignore import IGNORE_FILES, IgnoreChain, is_ignored, parent_rules, rules_in_dir
+from .latency import IOProfile, default_metadata_cache, io_profile
+
+DEFAULT_SKIP_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__"})
+
+# ───────────────────────── entries ─────────────────────────
+
+class WalkEntry:
+    """A walked file or directory with a lazily cached stat."""
+    __slots__ = ("path", "name", "is_dir", "depth", "last", "_entry", "_stat")
+
+    def __init__(self, entry: os.DirEntry, is_dir: bool, depth: int, last: bool = False) -> None:
+        self.path = entry.path
+        self.name = entry.name
+        self.is_dir = is_dir
+        self.depth = depth          # 1 for direct children of the walk root
+        self.last = last            # last child yielded for its parent directory
+        self._entry = entry
+        self._stat = None
+
+    def stat(self) -> Optional[os.stat_result]:
+        if self._stat is None:
+            try:
+                self._stat = self._entry.stat()
+            except OSError:
+                return None
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        st = self.stat()
+        return st.st_size if st else 0
+
+    @property
+    def mtime_ns(self) -> int:
+        st = self.stat()
+        return st.st_mtime_ns if st else 0
+
+    def __repr__(self) -> str:
+        return f"WalkEntry({self.path!r}, is_dir={self.is_dir}, depth={self.depth})"
+
+# ───────────────────────── listing ─────────────────────────
+
+def _list_sorted(dirpath: str) -> Optional[List[os.DirEntry]]:
+    try:
+        with os.scandir(dirpath) as it:
+            return sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+
+def _list_remote(dirpath: str) -> Optional[List[os.DirEntry]]:
+    """Listing plus the round trips the walk would make next (dir stat, d_type, ignore files)."""
+    meta = default_metadata_cache()
+    meta.invalidate(dirpath)            # stat before listing, never a stale one
+    meta.stat(dirpath)
+    listing = _list_sorted(dirpath)
+    for e in listing or ():
+        try:
+            e.is_dir()
+        except OSError:
+            pass
+        if e.name in IGNORE_FILES:
+            meta.invalidate(e.path)
+            meta.stat(e.path)
+    return listing
+
+class _Prefetcher:
+    """
+    Lists directories ahead of the depth-first walk on high-latency mounts.
+    Each fetched listing queues its own subdirectories (those `keep` accepts),
+    so deep trees overlap too; the walk drops whatever it later prunes.
+    """
+
+    def __init__(self, profile: IOProfile, keep: Callable[[os.DirEntry], bool]) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=profile.list_workers)
+        self._pending = {}
+        self._limit = profile.list_ahead
+        self._keep = keep
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def want(self, paths: Iterable[str]) -> None:
+        with self._lock:
+            for p in paths:
+                if self._closed or len(self._pending) >= self._limit:
+                    return
+                if p not in self._pending:
+                    self._pending[p] = self._pool.submit(self._fetch, p)
+
+    def _fetch(self, dirpath: str) -> Optional[List[os.DirEntry]]:
+        listing = _list_remote(dirpath)
+        if listing:
+            self.want(e.path for e in listing if _descends(e) and self._keep(e))
+        return listing
+
+    def drop(self, paths: Iterable[str]) -> None:
+        with self._lock:
+            for p in paths:
+                fut = self._pending.pop(p, None)
+                if fut is not None:
+                    fut.cancel()
+
+    def listing(self, dirpath: str) -> Optional[List[os.DirEntry]]:
+        with self._lock:
+            fut = self._pending.pop(dirpath, None)
+        return fut.result() if fut is not None else _list_remote(dirpath)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for fut in self._pending.values():
+                fut.cancel()
+            self._pending.clear()
+        self._pool.shutdown(wait=False)
+
+def _descends(e: os.DirEntry) -> bool:
+    try:
+        return e.is_dir() and not e.is_symlink()
+    except OSError:
+        return False
+
+# ───────────────────────── walking ─────────────────────────
+
+def walk_entries(directory: str, cfg: Any = None, recursive: bool = True, *,
+                 include_dirs: bool = False, use_ignore_files: bool = True,
+                 token: Any = None, ignore_root: Optional[str] = None,
+                 on_listing: Optional[Callable[[str, list], None]] = None) -> Iterator[WalkEntry]:
+    """
+    Yield WalkEntry objects under `directory`. `cfg` is a define_defaults cfg
+    or a ready PathFilter (e.g. params["path_filter"]); files are kept when it
+    accepts them and directories are yielded only with `include_dirs`. Symlinked directories
+    are listed but never descended into. `token.cancelled` is checked once
+    per directory, and `on_listing(dirpath, dir_entries)` sees every raw
+    listing (used by the snapshot cache to fingerprint the tree).
+    `ignore_root` lets a walk of a subdirectory inherit ignore files up to
+    the directory the original walk started from. On high-latency mounts
+    (see latency.io_profile) subdirectories are listed ahead in a thread pool;
+    the output order is unchanged.
+    """
+    root = os.path.abspath(directory)
+    flt = PathFilter.coerce(cfg)
+    skip = DEFAULT_SKIP_DIRS if use_ignore_files else frozenset()
+    keep = None if flt.noop else flt
+    chain: IgnoreChain = parent_rules(root, ignore_root) if use_ignore_files else ()
+    # stack of (dir entry to announce, dir path, depth, inherited ignore chain)
+    stack: List[Tuple[Optional[WalkEntry], Optional[str], int, IgnoreChain]] = [(None, root, 0, chain)]
+    profile = io_profile(root)
+    list_dir = _list_remote if profile.remote else _list_sorted
+    lister = None
+    if recursive and profile.list_workers > 1:
+        lister = _Prefetcher(profile, lambda e: e.name not in skip and not flt.prunes_dir(e.path, e.name))
+    try:
+        while stack:
+            if token is not None and token.cancelled:
+                return
+            announce, dirpath, depth, chain = stack.pop()
+            if announce is not None and include_dirs:
+                yield announce
+            if dirpath is None:
+                continue
+            listing = lister.listing(dirpath) if lister else list_dir(dirpath)
+            if listing is None:
+                continue
+            if on_listing is not None:
+                on_listing(dirpath, listing)
+            if use_ignore_files:
+                local = rules_in_dir(dirpath, (e.name for e in listing))
+                if local:
+                    chain = chain + tuple(local)
+
+            files_ok = keep is None or flt.dir_ok(dirpath)   # one dir verdict per listing
+            files, subdirs = [], []
+            for e in listing:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    continue
+                if chain and is_ignored(chain, e.path, e.name, is_dir):
+                    continue
+                if is_dir:
+                    if e.name not in skip and not flt.prunes_dir(e.path, e.name):
+                        subdirs.append(e)
+                elif files_ok and (keep is None or flt.name_ok(e.path, e.name)):
+                    files.append(e)
+
+            n_children = len(files) + (len(subdirs) if include_dirs else 0)
+            for i, e in enumerate(files):
+                yield WalkEntry(e, False, depth + 1, last=(i == n_children - 1))
+            dir_entries = [WalkEntry(e, True, depth + 1, last=(len(files) + i == n_children - 1))
+                           for i, e in enumerate(subdirs)]
+            if not recursive:
+                if include_dirs:
+                    yield from dir_entries
+                continue
+            for we in reversed(dir_entries):
+                if we._entry.is_symlink():
+                    if include_dirs:
+                        stack.append((we, None, depth + 1, chain))   # announced, not listed
+                    continue
+                stack.append((we, we.path, depth + 1, chain))
+            if lister:
+                kept = {e.path for e in subdirs}
+                lister.drop(e.path for e in listing if e.path not in kept and _descends(e))
+                lister.want(we.path for we in dir_entries if not we._entry.is_symlink())
+    finally:
+        if lister:
+            lister.close()
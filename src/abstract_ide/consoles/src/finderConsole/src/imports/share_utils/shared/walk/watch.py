@@ -0,0 +1,204 @@
+"""
+Filesystem change feeds for live search.
+
+`make_watcher` returns an InotifyWatcher on Linux (libc inotify through
+ctypes, one watch per walked directory) and falls back to a PollingWatcher
+(re-walk + stat diff every POLL_INTERVAL) elsewhere or when the inotify
+watch limit is exhausted. Both expose
+
+    read_events(timeout) -> [(path, kind)]   kind in WATCH_KINDS
+    close()
+
+Directories are discovered with the shared walker, so ignored/pruned trees
+are never watched.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .filters import PathFilter
+from .latency import io_profile, parallel_map
+from .walker import WalkEntry, walk_entries
+
+POLL_INTERVAL = 2.0   # seconds between polling re-walks
+
+CHANGED, DELETED, DIR_CREATED, DIR_DELETED, OVERFLOW = "changed", "deleted", "dir_created", "dir_deleted", "overflow"
+WATCH_KINDS = (CHANGED, DELETED, DIR_CREATED, DIR_DELETED, OVERFLOW)
+
+WatchEvent = Tuple[str, str]
+
+def listed_paths(dirpath: str, cfg: Any = None, root: Optional[str] = None,
+                 include_dirs: bool = False) -> Set[str]:
+    """Paths a walk from `root` would yield directly under `dirpath` (filters and ignore files applied)."""
+    return {e.path for e in walk_entries(dirpath, cfg, False, include_dirs=include_dirs, ignore_root=root)}
+
+# ───────────────────────── inotify ─────────────────────────
+
+IN_MODIFY      = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ISDIR       = 0x40000000
+IN_NONBLOCK    = os.O_NONBLOCK
+IN_CLOEXEC     = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+def _inotify_libc():
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux"):
+            try:
+                lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                if hasattr(lib, "inotify_init1"):
+                    _libc = lib
+            except OSError:
+                pass
+    return _libc or None
+
+class InotifyWatcher:
+    def __init__(self, root: str, cfg: Any = None, recursive: bool = True) -> None:
+        self._lib = _inotify_libc()
+        if self._lib is None:
+            raise OSError(errno.ENOSYS, "inotify not available")
+        self.root = os.path.abspath(root)
+        self.filter = PathFilter.coerce(cfg)
+        self.recursive = recursive
+        fd = self._lib.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        self._wd: Dict[int, str] = {}
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self.close()
+            raise
+
+    def _add(self, path: str) -> None:
+        wd = self._lib.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:        # watch limit: let the caller fall back to polling
+                raise OSError(err, "inotify watch limit reached")
+            return                          # vanished / unreadable: skip
+        self._wd[wd] = path
+
+    def _watch_tree(self, top: str) -> None:
+        self._add(top)
+        if not self.recursive:
+            return
+        for e in walk_entries(top, self.filter, True, include_dirs=True, ignore_root=self.root):
+            if e.is_dir:
+                self._add(e.path)
+
+    def read_events(self, timeout: float) -> List[WatchEvent]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events: List[WatchEvent] = []
+        off = 0
+        while off + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, off)
+            raw = data[off + _EVENT.size: off + _EVENT.size + length].rstrip(b"\0")
+            off += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                events.append((self.root, OVERFLOW))
+                continue
+            base = self._wd.get(wd)
+            if base is None:
+                continue
+            if mask & IN_IGNORED:
+                self._wd.pop(wd, None)
+                continue
+            path = os.path.join(base, os.fsdecode(raw)) if raw else base
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    if self.recursive and path in listed_paths(base, self.filter, self.root, include_dirs=True):
+                        try:
+                            self._watch_tree(path)
+                        except OSError:
+                            pass
+                        events.append((path, DIR_CREATED))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append((path, DIR_DELETED))
+            elif mask & IN_DELETE_SELF:
+                events.append((path, DIR_DELETED))
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                events.append((path, DELETED))
+            else:
+                events.append((path, CHANGED))
+        return events
+
+    def close(self) -> None:
+        if getattr(self, "_fd", -1) >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+# ───────────────────────── polling ─────────────────────────
+
+class PollingWatcher:
+    """Fallback: re-walk every `interval` seconds and diff (mtime_ns, size)."""
+
+    def __init__(self, root: str, cfg: Any = None, recursive: bool = True,
+                 interval: float = POLL_INTERVAL) -> None:
+        self.root = os.path.abspath(root)
+        self.filter = PathFilter.coerce(cfg)
+        self.recursive = recursive
+        self.interval = interval
+        self._state = self._scan()
+        self._last = time.monotonic()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        entries = list(walk_entries(self.root, self.filter, self.recursive))
+        workers = io_profile(self.root).list_workers
+        state = {}
+        for e, st in zip(entries, parallel_map(WalkEntry.stat, entries, workers)):
+            if st is not None:
+                state[e.path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def read_events(self, timeout: float) -> List[WatchEvent]:
+        wait = self.interval - (time.monotonic() - self._last)
+        if wait > 0:
+            time.sleep(min(wait, timeout))
+            if wait > timeout:
+                return []
+        new = self._scan()
+        self._last = time.monotonic()
+        old, self._state = self._state, new
+        events = [(p, CHANGED) for p, sig in new.items() if old.get(p) != sig]
+        events += [(p, DELETED) for p in old.keys() - new.keys()]
+        return events
+
+    def close(self) -> None:
+        self._state = {}
+
+def make_watcher(root: str, cfg: Any = None, recursive: bool = True, prefer_polling: bool = False):
+    """InotifyWatcher when possible, else PollingWatcher."""
+    if not prefer_polling and _inotify_libc() is not None:
+        try:
+            return InotifyWatcher(root, cfg, recursive)
+        except OSError:
+            pass
+    return PollingWatcher(root, cfg, recursive)
@@ -1,6 +1,37 @@
 from ..imports import *
+import time
+
+class CollectWorker(QThread):
+    """Stream collected paths in batches so the UI sees at most one update per FLUSH_INTERVAL."""
+    log = pyqtSignal(str)
+    batch = pyqtSignal(list)
+    done = pyqtSignal(int)
+    FLUSH_INTERVAL = 0.05          # seconds between batch emits
+    FLUSH_FILES = 5000             # ...or after this many paths
+    def __init__(self, params):
+        super().__init__()
+        self.params = params
+    def run(self):
+        n, pending, last_emit = 0, [], time.monotonic()
+        try:
+            for path in iter_walk_files(**self.params):
+                pending.append(path)
+                now = time.monotonic()
+                if ((not n and len(pending) == 1)          # first path goes out immediately
+                        or len(pending) >= self.FLUSH_FILES
+                        or now - last_emit >= self.FLUSH_INTERVAL):
+                    n += len(pending)
+                    self.batch.emit(pending)
+                    pending, last_emit = [], now
+            if pending:
+                n += len(pending)
+                self.batch.emit(pending)
+        except Exception:
+            self.log.emit(traceback.format_exc())
+        self.done.emit(n)
+
 def start_collect(self):
-    self.list.clear()
+    reset_collect(self)
     self.btn_run.setEnabled(False)
     try:
         self.params = make_params(self)
@@ -8,37 +39,35 @@ def start_collect(self):
         QMessageBox.critical(self, "Bad input", str(e))
         self.btn_run.setEnabled(True)
         return
-    class CollectWorker(QThread):
-        log = pyqtSignal(str)
-        done = pyqtSignal(list)
-        def __init__(self, params):
-            super().__init__()
-            self.params = params
-        def run(self):
-            try:
-                results = collect_filepaths(**self.params)
-                self.done.emit(results)
-            except Exception:
-                self.log.emit(traceback.format_exc())
-                self.done.emit([])
     self.worker = CollectWorker(self.params)
     self.worker.log.connect(self.append_log)
-    self.worker.done.connect(self.populate_results)
+    self.worker.batch.connect(self.append_collected)
+    self.worker.done.connect(self.finish_collect)
     self.worker.finished.connect(lambda: self.btn_run.setEnabled(True))
     self.worker.start()
 def append_log(self, text: str):
-    self.log.moveCursor(self.log.textCursor().MoveOperation.End)
-    self.log.insertPlainText(text)
+    sink = log_sink(self)
+    if sink is not None:
+        sink.write(text)
+def reset_collect(self):
+    self._last_results = []
+    self.results_model.clear()
+    sink = log_sink(self)
+    if sink is not None:
+        sink.clear()
+def append_collected(self, batch: list):
+    """One model insert and one log write per worker batch."""
+    self._last_results.extend(batch)
+    self.results_model.add_results(batch)
+    self.append_log("\n".join(batch) + "\n")
+def finish_collect(self, n: int):
+    self.append_log(f"✅ Found {n} file(s).\n" if n else "✅ No files found.\n")
+    if hasattr(self, "btn_secondary"):
+        self.btn_secondary.setEnabled(bool(n))
 def populate_results(self, results: list):
-    self._last_results = results or []
-    if not results:
-        self.append_log("✅ No files found.\n")
-        self.btn_secondary.setEnabled(False)
-        return
-    self.append_log(f"✅ Found {len(results)} file(s).\n")
-    self.btn_secondary.setEnabled(True)
-    for file_path in results:
-        if isinstance(file_path, str):
-            self.list.addItem(QListWidgetItem(file_path))
-            self.append_log(file_path + "\n")
-
+    """Non-streaming entry point: show a ready list of paths."""
+    reset_collect(self)
+    paths = [p for p in results or [] if isinstance(p, str)]
+    if paths:
+        append_collected(self, paths)
+    finish_collect(self, len(paths))
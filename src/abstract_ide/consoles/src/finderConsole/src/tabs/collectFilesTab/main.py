@@ -10,7 +10,10 @@ class collectFilesTab(QWidget):
             primary_btn=("Collect Files", self.start_collect)
         )
         self.layout().addWidget(QLabel("Results"))
-        self.list = QListWidget()
-        self.list.itemDoubleClicked.connect(self.open_all_hits)
+        self.results_model = SearchResultsModel(self)
+        self.list = QListView()
+        self.list.setModel(self.results_model)
+        self.list.setUniformItemSizes(True)
+        self.list.doubleClicked.connect(lambda _: self.open_all_hits())
         self.layout().addWidget(self.list, stretch=3)
         self._last_results = []
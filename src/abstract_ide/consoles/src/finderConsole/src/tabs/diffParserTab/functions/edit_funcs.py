@@ -1,4 +1,5 @@
 from .imports import *
+from functools import partial
 # ───────────────── helpers to read tree state ─────────────────
 
 def _iter_tree_rows(self):
@@ -21,7 +22,7 @@ def _gather_checked(self):
 # ───────────── logging to log pane (if present) ─────────────
 def get_files(self) -> list[str]:
     params = make_params(self)
-    dirs, files = get_files_and_dirs(**params)
+    dirs, files = walk_files_and_dirs(**params)
     return files
 def append_log(self, text: str):
     if not hasattr(self, "log") or self.log is None:
@@ -64,17 +65,17 @@ def get_all_subs(self, hunks: list[Hunk]) -> list[str]:
     return flat
 
 def find_matches_for_hunks(files: list[str], hunks: list[Hunk]) -> tuple[list[str], list[dict]]:
-    all_files: set[str] = set()
-    all_found: list[dict] = []
-    for h in hunks:
-        if not h.subs:
-            continue
-        nu_files, found_paths = getPaths(files, h.subs)
-        all_files.update(nu_files)
-        for fp in found_paths:
-            fp["hunk"] = h
-        all_found.extend(found_paths)
-    return sorted(all_files), all_found
+    """Match every hunk's `subs` in one read per file; found paths are tagged with their hunk."""
+    per_hunk: list[list[dict]] = [[] for _ in hunks]
+    for fp, hits in match_blocks(files, [h.subs for h in hunks]).items():
+        for i, start, lines in hits:
+            per_hunk[i].append({
+                "file_path": fp,
+                "lines": [{"line": start + j, "content": c} for j, c in enumerate(lines)],
+                "hunk": hunks[i],
+            })
+    all_found = [fp for found in per_hunk for fp in found]
+    return sorted({fp["file_path"] for fp in all_found}), all_found
 
 def get_test_diff(self) -> str:
     diff_text = """\
@@ -152,11 +153,51 @@ def apply_custom_diff(original_lines: List[str], diff_lines: List[str]) -> str:
     for r in reversed(replacements):
         out = out[:r["start"]] + r["adds"] + out[r["end"]:]
     return "\n".join(out)
-def save_all_checked(self, make_backup: bool = True, backup_ext: str = ".bak"):
+def _patch_text(diff_lines: List[str], text: str) -> str | None:
+    """Batch transform: the patched text, or None if the file needs no change."""
+    original = text.splitlines()
+    patched_text = apply_custom_diff(original, diff_lines)
+    original_text = "\n".join(original)
+    if patched_text == original_text or patched_text + "\n" == original_text:
+        return None
+    return patched_text
+
+class _BatchWorker(QThread):
+    """Run a batch apply or undo off the UI thread; `done` carries the BatchResult."""
+    log = pyqtSignal(str)
+    done = pyqtSignal(object)
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+    def run(self):
+        try:
+            result = self.fn(*self.args, log=self.log.emit, **self.kwargs)
+        except Exception as e:
+            self.log.emit(traceback.format_exc())
+            result = BatchResult(failed=[("", str(e))])
+        self.done.emit(result)
+
+def _start_batch(self, worker: "_BatchWorker", on_done) -> bool:
+    if getattr(self, "apply_worker", None) is not None and self.apply_worker.isRunning():
+        set_status(self, "Apply already running.", "warn")
+        return False
+    self.apply_worker = worker
+    worker.log.connect(lambda text: append_log(self, text))
+    worker.done.connect(on_done)
+    buttons = [b for b in (getattr(self, "btn_third", None), getattr(self, "btn_undo", None)) if b is not None]
+    for b in buttons:
+        b.setEnabled(False)
+    worker.finished.connect(lambda: [b.setEnabled(True) for b in buttons])
+    worker.start()
+    return True
+
+def save_all_checked(self, record_undo: bool = True):
     """
-    Save the current diff preview into ALL rows where:
+    Save the current diff into ALL rows where:
       - Apply is checked, and
       - Overwrite determines whether we replace the file or write *.new
+    Every file is written, or none: see shared.patch.apply_batch. The
+    reverse deltas go to the undo journal (Undo Last Apply) instead of .bak copies.
     """
     diff_text = self.diff_text.toPlainText().strip()
     if not diff_text:
@@ -176,62 +217,43 @@ def save_all_checked(self, make_backup: bool = True, backup_ext: str = ".bak"):
         set_status(self, "No rows checked.", "warn")
         return
 
-    # Pre-parse once for speed
-    diff_lines = diff_text.splitlines()
-
-    changed, skipped, failed = 0, 0, 0
-    for t in targets:
-        path = t["path"]
-        ow   = t["overwrite"]
-
-        if not os.path.isfile(path):
-            append_log(self, f"Skip (not a file): {path}\n")
-            skipped += 1
-            continue
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                original = f.read().splitlines()
-
-            # Recompute patch for THIS file (not using the preview text area)
-            patched_text = apply_custom_diff(original, diff_lines)
-
-            # If nothing changed, count as skipped to avoid churn
-            original_text = "\n".join(original)
-            if patched_text == original_text or patched_text + "\n" == original_text:
-                append_log(self, f"No changes needed: {path}\n")
-                skipped += 1
-                continue
-
-            out_path = path if ow else f"{path}.new"
-
-            # Optional safety backup
-            if make_backup and ow and os.path.exists(path):
-                try:
-                    shutil.copy2(path, path + backup_ext)
-                    append_log(self, f"Backup written: {path + backup_ext}\n")
-                except Exception as e:
-                    append_log(self, f"Backup failed ({path}): {e}\n")
-
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(patched_text if patched_text.endswith("\n") else patched_text + "\n")
-
-            append_log(self, f"Saved: {out_path}\n")
-            changed += 1
-
-        except ValueError as e:
-            # apply_custom_diff may raise on overlapping hunks, etc.
-            append_log(self, f"Patch error for {path}: {e}\n")
-            failed += 1
-        except Exception as e:
-            append_log(self, f"Unexpected error for {path}: {e}\n")
-            failed += 1
-
-    # User feedback
+    # routed rows get only their own hunks (see route_funcs.route_patch)
+    routes = getattr(self, "_routes", None) or {}
+    items = [(t["path"], t["path"] if t["overwrite"] else f"{t['path']}.new",
+              partial(_patch_text, hunks_to_diff_lines(routes[t["path"]])) if t["path"] in routes else None)
+             for t in targets]
+    worker = _BatchWorker(apply_batch, items, partial(_patch_text, diff_text.splitlines()),
+                          undo=UndoJournal() if record_undo else None)
+    if _start_batch(self, worker, lambda result: _apply_finished(self, result)):
+        set_status(self, f"Applying to {len(items)} file(s)…", "info")
+
+def _apply_finished(self, result: BatchResult):
+    changed, skipped, failed = len(result.changed), len(result.skipped), len(result.failed)
     msg = f"Saved: {changed}, Skipped: {skipped}, Failed: {failed}"
+    if failed and not result.committed:
+        msg += " (nothing written)"
     set_status(self, msg, "ok" if changed and not failed else ("warn" if changed else "error"))
     QMessageBox.information(self, "Apply finished", msg)
 
+def undo_last_apply(self):
+    """Restore the files changed by the most recent Save All."""
+    journal = UndoJournal()
+    if not journal.records():
+        set_status(self, "Nothing to undo.", "warn")
+        return
+    if _start_batch(self, _BatchWorker(journal.undo_last), lambda result: _undo_finished(self, result)):
+        set_status(self, "Undoing last apply…", "info")
+
+def _undo_finished(self, result: BatchResult | None):
+    if result is None:
+        set_status(self, "Nothing to undo.", "warn")
+    elif result.committed:
+        set_status(self, f"Undo restored {len(result.changed)} file(s).", "ok")
+    else:
+        reasons = "\n".join(f"{p}: {why}" if p else why for p, why in result.failed)
+        set_status(self, "Undo failed; nothing restored.", "error")
+        QMessageBox.warning(self, "Undo failed", reasons or "Nothing restored.")
+
 def apply_diff_to_directory(self, diff_text: str) -> ApplyReport:
     report = ApplyReport()
     try:
@@ -253,6 +275,10 @@ def apply_diff_to_directory(self, diff_text: str) -> ApplyReport:
         return report
 
     file_to_replacements: dict[str, list] = defaultdict(list)
+    _, all_found = find_matches_for_hunks(files, hunks)
+    by_hunk: dict[int, list[dict]] = defaultdict(list)
+    for fp in all_found:
+        by_hunk[id(fp.pop("hunk"))].append(fp)
 
     for h in hunks:
         if not h.subs:
@@ -260,7 +286,8 @@ def apply_diff_to_directory(self, diff_text: str) -> ApplyReport:
             append_log(self, "Skipping hunk with empty subs\n")
             continue
 
-        nu_files, found_paths = getPaths(files, h.subs)
+        found_paths = by_hunk.get(id(h), [])
+        nu_files = {fp["file_path"] for fp in found_paths}
         h.content = found_paths
         any_applied = False
 
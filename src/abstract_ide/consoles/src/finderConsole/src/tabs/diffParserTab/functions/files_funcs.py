@@ -35,5 +35,5 @@ def _collect_checked_files(self) -> tuple[list[str], list[str]]:
 
 def get_files(self) -> list[str]:
     params = make_params(self)
-    dirs, files = get_files_and_dirs(**params)
+    dirs, files = walk_files_and_dirs(**params)
     return files
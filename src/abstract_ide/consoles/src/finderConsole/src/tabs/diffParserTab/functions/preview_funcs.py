@@ -0,0 +1,137 @@
+from .imports import *
+from .edit_funcs import append_log, apply_custom_diff
+from .route_funcs import diff_for_path
+import threading
+from functools import partial
+from typing import Callable
+
+PREFETCH_NEIGHBOURS = 3        # rows rendered ahead on each side of the selection
+
+def _preview_text(diff_lines: List[str], text: str) -> str:
+    return apply_custom_diff(text.splitlines(), diff_lines)
+
+class PreviewWorker(QThread):
+    """Long-lived renderer: the newest request replaces whatever is still queued."""
+    ready = pyqtSignal(object, object)        # PreviewKey | None, PreviewResult
+    def __init__(self):
+        super().__init__()
+        self._cond = threading.Condition()
+        self._queue: list[tuple[str, str]] = []      # (path, dhash)
+        self._transforms: dict[str, Callable] = {}   # dhash -> transform, for the queued items
+        self._stopping = False
+    def request(self, items: list[tuple[str, str, str]]):
+        """Queue (path, diff_text, dhash) items; each path renders its own routed diff."""
+        with self._cond:
+            transforms = {}
+            for _, diff_text, dhash in items:
+                if dhash not in transforms:
+                    transforms[dhash] = (self._transforms.get(dhash)
+                                         or partial(_preview_text, diff_text.splitlines()))
+            self._transforms = transforms
+            self._queue = [(path, dhash) for path, _, dhash in items]
+            self._cond.notify()
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.wait(1000)
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                path, dhash = self._queue.pop(0)
+                transform = self._transforms[dhash]
+            key = preview_key(path, dhash)
+            try:
+                result = render_preview(path, transform)
+            except Exception as e:
+                result = PreviewResult(path, error=str(e))
+            self.ready.emit(key, result)
+
+def _preview_worker(self) -> PreviewWorker:
+    if getattr(self, "preview_worker", None) is None:
+        self.preview_cache = PreviewCache()
+        self.preview_worker = PreviewWorker()
+        self.preview_worker.ready.connect(lambda key, result: _on_preview_ready(self, key, result))
+        self.destroyed.connect(lambda *_: self.preview_worker.stop())
+        self.preview_worker.start()
+    return self.preview_worker
+
+def _neighbour_paths(self) -> list[str]:
+    """Rows around the current one, nearest first, next before previous."""
+    it = self.files_list.currentItem()
+    if it is None:
+        return []
+    row = self.files_list.indexOfTopLevelItem(it)
+    count = self.files_list.topLevelItemCount()
+    out = []
+    for d in range(1, PREFETCH_NEIGHBOURS + 1):
+        for r in (row + d, row - d):
+            if 0 <= r < count:
+                item = self.files_list.topLevelItem(r)
+                out.append(item.data(0, Qt.ItemDataRole.UserRole) or item.text(0))
+    return out
+
+def request_preview(self, path: str, full_diff: str):
+    """Show the cached preview for `path` or queue it, then prefetch the neighbouring rows.
+
+    `full_diff` is the whole pasted diff; each path is rendered (and cached)
+    with the part of it routed to that path.
+    """
+    worker = _preview_worker(self)
+    items = []
+    for i, p in enumerate([path] + [n for n in _neighbour_paths(self) if n != path]):
+        diff_text = diff_for_path(self, p, full_diff)
+        dhash = diff_hash(diff_text)
+        cached = self.preview_cache.get(preview_key(p, dhash))
+        if i == 0:
+            # renders of an older diff for the same path must not be shown
+            self._preview_target = (path, dhash)
+            if cached is not None:
+                _show_preview(self, cached)
+            else:
+                # never leave another file's preview up: Save writes what is shown
+                self._preview_shown = None
+                self.preview.clear()
+                set_status(self, f"Rendering preview: {path}", "info")
+        if cached is None:
+            items.append((p, diff_text, dhash))
+    worker.request(items)
+
+def _on_preview_ready(self, key, result: PreviewResult):
+    if result.error is None:
+        self.preview_cache.put(key, result)
+    if _is_current(self, key, result):
+        _show_preview(self, result)
+
+def _is_current(self, key, result: PreviewResult) -> bool:
+    """True when `result` is the path and routed diff the view is waiting for."""
+    target = getattr(self, "_preview_target", None)
+    if target is None or result.path != target[0]:
+        return False
+    # the key's stat part may have moved on since the request; its diff hash must not
+    # (no key: the file could not be stat'ed, and the error is shown)
+    return key is None or key[-1] == target[1]
+
+def _show_preview(self, result: PreviewResult):
+    self._preview_shown = result if result.error is None else None
+    if result.error is not None:
+        self.preview.clear()
+        set_status(self, f"Error: {result.error}", "error")
+        append_log(self, f"Error in preview: {result.error}\n")
+        return
+    self.preview.setPlainText(result.text)
+    note = " (around hunks only)" if result.windowed else ""
+    set_status(self, f"Preview generated for: {result.path}{note}", "ok" if result.changed else "warn")
+
+def preview_full_text(self) -> str:
+    """Text to save: the preview as shown, or the whole patched file when it was windowed."""
+    shown = getattr(self, "_preview_shown", None)
+    if shown is None or not shown.windowed:
+        return self.preview.toPlainText()
+    diff = diff_for_path(self, shown.path, self.diff_text.toPlainText().strip())
+    with open(shown.path, "r", encoding="utf-8") as f:
+        return _preview_text(diff.splitlines(), f.read())
@@ -0,0 +1,59 @@
+from .imports import *
+from .edit_funcs import append_log, find_matches_for_hunks, get_files
+
+def _strip_level(self) -> int | None:
+    """Strip level from the spin box; None means auto-detect."""
+    spin = getattr(self, "spin_strip", None)
+    if spin is None or spin.value() < 0:
+        return None
+    return spin.value()
+
+def route_patch(self, diff_text: str) -> tuple[dict[str, list[Hunk]], list[Hunk]]:
+    """
+    Map each file to the hunks it should receive. A hunk goes to the file
+    its headers name when it matches there; only the rest are searched for
+    in the tree. Returns (routes, unresolved hunks).
+    """
+    root = resolve_directory_input(self.dir_in.text())
+    strip = _strip_level(self)
+    routes: dict[str, list[Hunk]] = defaultdict(list)
+    pending: list[Hunk] = []
+    for fp in parse_file_patches(diff_text):
+        path = resolve_patch_path((fp.new_path, fp.old_path), root, strip) if (fp.old_path or fp.new_path) else None
+        if path is None:
+            if fp.old_path is None and fp.new_path:
+                append_log(self, f"New file, not created: {fp.new_path}\n")
+            elif fp.old_path or fp.new_path:
+                append_log(self, f"No file for header {fp.new_path or fp.old_path}\n")
+            pending.extend(fp.hunks)
+            continue
+        try:
+            found = {i for i, _, _ in BlockMatcher([h.subs for h in fp.hunks]).scan(read_text(path))}
+        except (OSError, UnicodeDecodeError) as e:
+            append_log(self, f"Cannot read {path}: {e}\n")
+            found = set()
+        for i, h in enumerate(fp.hunks):
+            (routes[path] if i in found else pending).append(h)
+
+    searchable = [h for h in pending if h.subs]
+    matched: set[int] = set()
+    if searchable:
+        append_log(self, f"Searching the tree for {len(searchable)} unrouted hunk(s)\n")
+        _, found_paths = find_matches_for_hunks(get_files(self), searchable)
+        for fp in found_paths:
+            h = fp["hunk"]
+            matched.add(id(h))
+            if not any(x is h for x in routes[fp["file_path"]]):
+                routes[fp["file_path"]].append(h)
+    unresolved = [h for h in pending if id(h) not in matched]
+    return dict(routes), unresolved
+
+def diff_for_path(self, path: str, diff_text: str) -> str:
+    """The part of the diff routed to `path`, or the whole diff outside routed mode."""
+    routes = getattr(self, "_routes", None)
+    if routes and path in routes:
+        return "\n".join(hunks_to_diff_lines(routes[path]))
+    return diff_text
+
+def _clear_routes(self):
+    self._routes = None
@@ -34,7 +34,7 @@ def _on_tree_selection_changed(self):
     if path and os.path.exists(path):
         self._preview_for_path(path)
 
-def _pick_preview_target(self, files_from_filters: list[str], hunks) -> str | None:
+def _pick_preview_target(self, files_from_filters: list[str], hunks, found: list[dict] | None = None) -> str | None:
     # Priority A/B/C as before
     path = _get_selected_path_from_tree(self)
     if path and os.path.exists(path): return path
@@ -45,7 +45,10 @@ def _pick_preview_target(self, files_from_filters: list[str], hunks) -> str | No
     first = next((h for h in hunks if h.subs), None)
     candidates = files_from_filters[:]
     if first and first.subs:
-        _, found = getPaths(files_from_filters, first.subs)
+        if found is None:
+            _, found = getPaths(files_from_filters, first.subs)
+        else:
+            found = [fp for fp in found if fp.get("hunk") is first]
         candidates = sorted({fp['file_path'] for fp in found}) or files_from_filters
 
     # last resort: ask
@@ -2,7 +2,7 @@ from ..imports import *
 import re
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple, Union, Set
-from PyQt6.QtWidgets import QFileDialog, QMessageBox, QTreeWidgetItem
+from PyQt6.QtWidgets import QCheckBox, QFileDialog, QMessageBox, QSpinBox, QTreeWidgetItem
 from PyQt6.QtGui import QFont, QColor, QPalette
 from PyQt6.QtCore import Qt
 import os
@@ -77,33 +77,14 @@ def getPaths(files: List[str], strings: List[str] | str) -> Tuple[List[str], Lis
       {'file_path': str, 'lines': [{'line': int, 'content': str}, ...]}
     """
     strings_list = make_list(strings)
-    tot = "\n".join(strings_list) if len(strings_list) > 1 else (strings_list[0] if strings_list else "")
-    if not tot: 
+    if not "\n".join(strings_list):
         return [], []
-
-    found_paths: List[Dict[str, Any]] = []
-    uniq = set()
-    for fp in files:
-        try:
-            txt = read_any_file(fp)
-            if tot not in txt: 
-                continue
-            uniq.add(fp)
-            lines = txt.split("\n")
-            for m in re.finditer(re.escape(tot), txt):
-                start_byte = m.start()
-                start_line = txt[:start_byte].count("\n")
-                block = []
-                ok = True
-                for j in range(len(strings_list)):
-                    ln = start_line + j
-                    if ln >= len(lines): ok = False; break
-                    block.append({"line": ln, "content": lines[ln]})
-                if ok:
-                    found_paths.append({"file_path": fp, "lines": block})
-        except Exception as e:
-            logger.error(f"Error in getPaths for {fp}: {e}")
-    return sorted(uniq), found_paths
+    found_paths = [
+        {"file_path": fp, "lines": [{"line": start + j, "content": c} for j, c in enumerate(lines)]}
+        for fp, hits in match_blocks(files, [strings_list]).items()
+        for _, start, lines in hits
+    ]
+    return sorted({fp["file_path"] for fp in found_paths}), found_paths
 
 # ───────────────────── Diff parsing ───────────────────────
 
@@ -164,3 +145,60 @@ def parse_unified_diff(diff_text: str) -> List[Hunk]:
     flush()
     logger.debug("parse_unified_diff -> %d hunks", len(hunks))
     return hunks
+
+# ───────────────── Multi-file patches ─────────────────────
+
+_HUNK_COUNTS = re.compile(r'^@@\s*-\d+(?:,(\d+))?\s+\+\d+(?:,(\d+))?\s*@@')
+
+@dataclass
+class FilePatch:
+    old_path: str | None                                      # header paths, None for /dev/null
+    new_path: str | None
+    hunks: List[Hunk] = field(default_factory=list)
+
+def parse_file_patches(diff_text: str) -> List[FilePatch]:
+    """
+    Split a multi-file patch on its ---/+++ headers. Hunk line counts decide
+    where each hunk ends, so removed lines that look like headers stay body.
+    Hunks before the first header are returned under (None, None).
+    """
+    sections: List[Tuple[str | None, str | None, List[str]]] = [(None, None, [])]
+    lines = diff_text.splitlines()
+    old_left = new_left = 0
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip("\r")
+        in_body = old_left > 0 or new_left > 0
+        if not in_body and line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            sections.append((header_path(line), header_path(lines[i + 1].rstrip("\r")), []))
+            i += 2
+            continue
+        m = _HUNK_COUNTS.match(line) if not in_body else None
+        if m:
+            old_left = int(m.group(1)) if m.group(1) is not None else 1
+            new_left = int(m.group(2)) if m.group(2) is not None else 1
+        elif in_body:
+            if line.startswith("-"):
+                old_left -= 1
+            elif line.startswith("+"):
+                new_left -= 1
+            elif not line.startswith("\\"):
+                old_left -= 1
+                new_left -= 1
+        sections[-1][2].append(line)
+        i += 1
+    out = []
+    for old, new, body in sections:
+        hunks = parse_unified_diff("\n".join(body))
+        if hunks or old or new:
+            out.append(FilePatch(old, new, hunks))
+    return out
+
+def hunks_to_diff_lines(hunks: List[Hunk]) -> List[str]:
+    """Diff lines that parse back to `hunks` (context folds into the -/+ blocks)."""
+    out: List[str] = []
+    for h in hunks:
+        out.append(f"@@ -1,{len(h.subs)} +1,{len(h.adds)} @@")
+        out.extend("-" + s for s in h.subs)
+        out.extend("+" + a for a in h.adds)
+    return out
@@ -16,6 +16,21 @@ class diffParserTab(QWidget):
             default_exclude_dirs_in=True
         )
 
+        # Routing: hunks go to the files their ---/+++ headers name
+        self.chk_route = QCheckBox("Route by file headers"); self.chk_route.setChecked(True)
+        self.chk_route.setToolTip("Apply each hunk to the file its header names; only hunks that do not resolve are searched for in the tree.")
+        self.chk_route.toggled.connect(lambda *_: self._clear_routes())
+        self.spin_strip = QSpinBox(); self.spin_strip.setRange(-1, 9); self.spin_strip.setValue(-1)
+        self.spin_strip.setSpecialValueText("auto"); self.spin_strip.setPrefix("-p")
+        self.spin_strip.setToolTip("Leading path components stripped from header paths, as in patch -p.")
+        self.spin_strip.valueChanged.connect(lambda *_: self._clear_routes())
+        route_row = QHBoxLayout()
+        route_row.addWidget(self.chk_route)
+        route_row.addWidget(QLabel("Strip:"))
+        route_row.addWidget(self.spin_strip)
+        route_row.addStretch(1)
+        root.addLayout(route_row)
+
         # Files tree (match results)
         root.addWidget(QLabel("Files found:"))
         self.files_list = QTreeWidget()
@@ -37,6 +52,7 @@ class diffParserTab(QWidget):
         lv.addWidget(QLabel("Diff:"))
         self.diff_text = QTextEdit()
         self.diff_text.setPlaceholderText("Paste the diff here...")
+        self.diff_text.textChanged.connect(lambda: self._clear_routes())
         lv.addWidget(self.diff_text, stretch=1)
 
         right = QWidget(); rv = QVBoxLayout(right); rv.setContentsMargins(0,0,0,0)
@@ -64,31 +80,22 @@ class diffParserTab(QWidget):
 ##        root.addWidget(self.saveAllBtn)
         
         # Status line
+        status_row = QHBoxLayout()
         self.status_label = QLabel("Ready.")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
         self.status_label.setStyleSheet("color: #4caf50; padding: 4px 0;")
-        root.addWidget(self.status_label)
+        status_row.addWidget(self.status_label, stretch=1)
+        self.btn_undo = QPushButton("Undo Last Apply")
+        self.btn_undo.clicked.connect(lambda: self.undo_last_apply())
+        status_row.addWidget(self.btn_undo)
+        root.addLayout(status_row)
 
     def _preview_for_path(self, target_file: str):
-        """Preview ONLY for the provided path (no re-populate / no re-match)."""
+        """Preview ONLY for the provided path (no re-populate / no re-match); rendered off-thread."""
         diff = self.diff_text.toPlainText().strip()
         if not diff or not target_file or not os.path.exists(target_file):
             return
-        try:
-            with open(target_file, "r", encoding="utf-8") as f:
-                original_lines = f.read().splitlines()
-            patched = apply_custom_diff(original_lines, diff.splitlines())
-            self.preview.setPlainText(patched)
-            set_status(self, f"Preview generated for: {target_file}", "ok")
-            append_log(self, f"Preview generated for {target_file}\n")
-        except ValueError as e:
-            QMessageBox.critical(self, "Error", str(e))
-            set_status(self, f"Error: {e}", "error")
-            append_log(self, f"Error in preview: {e}\n")
-        except Exception as e:
-            QMessageBox.critical(self, "Unexpected Error", f"An unexpected error occurred: {e}")
-            set_status(self, f"Unexpected Error: {e}", "error")
-            append_log(self, f"Unexpected error in preview: {e}\n")
+        self.request_preview(target_file, diff)
 
     def preview_patch(self):
         diff = self.diff_text.toPlainText().strip()
@@ -97,6 +104,11 @@ class diffParserTab(QWidget):
             set_status(self, "Error: No diff provided.", "error")
             return
 
+        self._routes = None
+        if self.chk_route.isChecked():
+            self._preview_routed(diff)
+            return
+
         try:
             files = get_files(self)
         except Exception as e:
@@ -121,7 +133,7 @@ class diffParserTab(QWidget):
         self._fill_files_tree(matched_files, default_apply=True, default_overwrite=True)
 
         # Choose preview target:
-        path = self._pick_preview_target(files, hunks)
+        path = self._pick_preview_target(files, hunks, found_paths)
         if not path:
             # fallback to first match if present
             if matched_files:
@@ -133,7 +145,28 @@ class diffParserTab(QWidget):
             set_status(self, "No matches found in any file.", "warn")
             return
 
-        _preview_for_path(self, path)
+        self._preview_for_path(path)
+
+    def _preview_routed(self, diff: str):
+        try:
+            routes, unresolved = self.route_patch(diff)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to route patch: {e}")
+            set_status(self, f"Error: {e}", "error")
+            return
+        if not routes and not unresolved:
+            QMessageBox.warning(self, "Warning", "No valid hunks found in diff.")
+            set_status(self, "No valid hunks found.", "warn")
+            return
+        if unresolved:
+            self.append_log(f"{len(unresolved)} hunk(s) matched no file\n")
+        if not routes:
+            set_status(self, "No matches found in any file.", "warn")
+            return
+        self._routes = routes
+        matched_files = sorted(routes)
+        self._fill_files_tree(matched_files, default_apply=True, default_overwrite=True)
+        self._preview_for_path(matched_files[0])
     def _selected_tree_row_flags(self):
         """
         Returns (path, apply_checked, overwrite_checked) for the current tree row,
@@ -157,7 +190,12 @@ class diffParserTab(QWidget):
                 return it.data(0, Qt.ItemDataRole.UserRole) or it.text(0)
         return None
     def save_patch(self):
-        patched = self.preview.toPlainText()
+        try:
+            patched = self.preview_full_text()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to rebuild preview: {e}")
+            set_status(self, f"Error: {e}", "error")
+            return
         if not patched:
             QMessageBox.warning(self, "Warning", "No preview to save. Generate a preview first.")
             set_status(self, "No preview to save.", "warn")
@@ -1,4 +1,55 @@
 from .imports import *
+import io
+
+class _MapExportWorker(QThread):
+    """Stream `iter_directory_map` into a file, or into one string for the clipboard."""
+    log = pyqtSignal(str)
+    done = pyqtSignal(str, int)    # clipboard text ('' when written to a file), line count
+    failed = pyqtSignal(str)
+
+    def __init__(self, params, out_path: str | None = None):
+        super().__init__()
+        self.params = params
+        self.out_path = out_path
+
+    def run(self):
+        n = 0
+        try:
+            if self.out_path:
+                with open(self.out_path, "w", encoding="utf-8") as f:
+                    for line in iter_directory_map(**self.params):
+                        f.write(line)
+                        f.write("\n")
+                        n += 1
+                self.done.emit("", n)
+                return
+            buf = io.StringIO()
+            for line in iter_directory_map(**self.params):
+                if n:
+                    buf.write("\n")
+                buf.write(line)
+                n += 1
+            self.done.emit(buf.getvalue(), n)
+        except Exception as e:
+            self.log.emit(traceback.format_exc())
+            self.failed.emit(str(e))
+
+class _DirStatsWorker(QThread):
+    """Aggregate per-directory sizes off the UI thread (see directory_stats)."""
+    log = pyqtSignal(str)
+    done = pyqtSignal(dict)
+
+    def __init__(self, params):
+        super().__init__()
+        self.params = params
+
+    def run(self):
+        try:
+            self.done.emit(directory_stats(**self.params))
+        except Exception:
+            self.log.emit(traceback.format_exc())
+            self.done.emit({})
+
 def wire_map_copy_ui(self):
     self.btn_copy_sel.clicked.connect(lambda: copy_map(self, only_selected=True))
     self.btn_copy_all.clicked.connect(lambda: copy_map(self, only_selected=False))
@@ -6,58 +57,76 @@ def wire_map_copy_ui(self):
 
     # Shortcuts (PyQt6)
     copy_seq = QKeySequence(QKeySequence.StandardKey.Copy)           # maps to Cmd+C on macOS
-    QShortcut(copy_seq, self.list, activated=lambda: copy_map(self, only_selected=True))
+    QShortcut(copy_seq, self.tree, activated=lambda: copy_map(self, only_selected=True))
     QShortcut(QKeySequence("Ctrl+Shift+C"), self, activated=lambda: copy_map(self, only_selected=False))
 
     # Context menu
-    self.list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-    self.list.customContextMenuRequested.connect(lambda pos: _map_context_menu(self, pos))
+    self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+    self.tree.customContextMenuRequested.connect(lambda pos: _map_context_menu(self, pos))
 
     # Optional: monospace font for pretty maps
-    f = self.list.font()
+    f = self.tree.font()
     f.setStyleHint(QFont.StyleHint.TypeWriter)
-    self.list.setFont(f)
-
-def _gather_map_text(self, only_selected: bool) -> str:
-    items = self.list.selectedItems() if only_selected else [self.list.item(i) for i in range(self.list.count())]
-    return "\n".join(i.text() for i in items if i is not None)
+    self.tree.setFont(f)
+
+def _start_export(self, out_path: str | None = None) -> bool:
+    """Run a full-tree export for the last generated map; False when there is none."""
+    params = getattr(self, "params", None)
+    if not params:
+        return False
+    worker = getattr(self, "export_worker", None)
+    if worker is not None and worker.isRunning():
+        self.append_log("Map export already running.\n")
+        return True
+    self.export_worker = _MapExportWorker(params, out_path)
+    self.export_worker.log.connect(self.append_log)
+    self.export_worker.done.connect(lambda text, n: _export_done(self, out_path, text, n))
+    self.export_worker.failed.connect(
+        lambda err: QMessageBox.critical(self, "Save failed" if out_path else "Copy failed", err))
+    self.export_worker.start()
+    return True
+
+def _export_done(self, out_path: str | None, text: str, n: int) -> None:
+    if out_path:
+        self.append_log(f"💾 Saved map ({n} line(s)) to {out_path}\n")
+    elif text:
+        QtWidgets.QApplication.clipboard().setText(text)
+        self.append_log(f"📋 Copied {n} line(s) to clipboard.\n")
+    else:
+        QMessageBox.information(self, "Copy Map", "Nothing to copy.")
 
 def copy_map(self, only_selected: bool = False) -> None:
-    text = _gather_map_text(self, only_selected)
-    if not text:
-        QMessageBox.information(self, "Copy Map", "Nothing to copy.")
+    if only_selected:
+        lines = self.map_model.map_lines(self.tree.selectionModel().selectedIndexes())
+        if not lines:
+            QMessageBox.information(self, "Copy Map", "Nothing to copy.")
+            return
+        QtWidgets.QApplication.clipboard().setText("\n".join(lines))
+        self.append_log(f"📋 Copied {len(lines)} line(s) to clipboard.\n")
         return
-    QtWidgets.QApplication.clipboard().setText(text)
-    if hasattr(self, "append_log"):
-        self.append_log(f"📋 Copied {len(text.splitlines())} line(s) to clipboard.\n")
+    if not _start_export(self):
+        QMessageBox.information(self, "Copy Map", "Nothing to copy.")
 
 def save_map_to_file(self) -> None:
-    text = _gather_map_text(self, only_selected=False)
-    if not text:
+    if not getattr(self, "params", None):
         QMessageBox.information(self, "Save Map", "Nothing to save.")
         return
     fn, _ = QFileDialog.getSaveFileName(self, "Save Directory Map", "directory_map.txt",
                                         "Text Files (*.txt);;All Files (*)")
     if not fn:
         return
-    try:
-        with open(fn, "w", encoding="utf-8") as f:
-            if not text.endswith("\n"): text += "\n"
-            f.write(text)
-        if hasattr(self, "append_log"):
-            self.append_log(f"💾 Saved map to {fn}\n")
-    except Exception as e:
-        QMessageBox.critical(self, "Save failed", str(e))
+    _start_export(self, fn)
 
 def _map_context_menu(self, pos: QtCore.QPoint) -> None:
-    menu = QMenu(self.list)
+    menu = QMenu(self.tree)
     a_copy     = menu.addAction("Copy")
     a_copy_all = menu.addAction("Copy All")
     a_save     = menu.addAction("Save…")
-    act = menu.exec(self.list.viewport().mapToGlobal(pos))
+    act = menu.exec(self.tree.viewport().mapToGlobal(pos))
     if act == a_copy:     copy_map(self, True)
     elif act == a_copy_all: copy_map(self, False)
     elif act == a_save:   save_map_to_file(self)
+
 def start_map(self):
     self.btn_run.setEnabled(False)
     try:
@@ -66,33 +135,59 @@ def start_map(self):
         QMessageBox.critical(self, "Bad input", str(e))
         self.btn_run.setEnabled(True)
         return
+    try:
+        self.map_model.set_root(
+            self.params["directory"],
+            self.params.get("path_filter") or self.params.get("cfg"),
+            self.params.get("recursive", True),
+            include_files=self.chk_include_files.isChecked(),
+        )
+        self.tree.expand(self.map_model.root_index())
+        if self.chk_sizes.isChecked():
+            start_dir_stats(self)
+    except Exception:
+        self.append_log(traceback.format_exc())
+    finally:
+        self.btn_run.setEnabled(True)
 
-    class MapWorker(QThread):
-        log = pyqtSignal(str)
-        done = pyqtSignal(list)   # emit list of results instead of plain str
-
-        def __init__(self, params):
-            super().__init__()
-            self.params = params
-
-        def run(self):
-            try:
-                # assume get_directory_map returns str -> split into lines
-                map_str = get_directory_map(**self.params)
-                results = [line for line in map_str.splitlines() if line.strip()]
-                self.done.emit(results)
-            except Exception:
-                tb = traceback.format_exc()
-                self.log.emit(tb)
-                self.done.emit([])
-
-    self.worker = MapWorker(self.params)
-    self.worker.log.connect(self.append_log)      # errors → logs
-    self.worker.done.connect(self.display_map)    # results → results list
-    self.worker.finished.connect(lambda: self.btn_run.setEnabled(True))
-    self.worker.start()
-
+# — Sizes —
+def show_stat_columns(self, on: bool):
+    self.tree.setHeaderHidden(not on)
+    for col in (SIZE_COL, FILES_COL, NEWEST_COL):
+        self.tree.setColumnHidden(col, not on)
+
+def toggle_sizes(self, on: bool):
+    show_stat_columns(self, on)
+    if on and getattr(self, "params", None):
+        start_dir_stats(self)
+
+def start_dir_stats(self):
+    worker = getattr(self, "stats_worker", None)
+    if worker is not None and worker.isRunning():
+        worker.done.disconnect()
+        worker.done.connect(lambda _: start_dir_stats(self))   # rerun for the current params
+        return
+    show_stat_columns(self, True)
+    self.stats_worker = _DirStatsWorker(self.params)
+    self.stats_worker.log.connect(self.append_log)
+    self.stats_worker.done.connect(lambda stats: apply_dir_stats(self, stats))
+    self.stats_worker.start()
+
+def apply_dir_stats(self, stats: dict):
+    root = os.path.abspath(self.params["directory"])
+    total = stats.get(root)
+    if total is None:
+        return
+    self.map_model.set_stats(stats)
+    self.tree.sortByColumn(SIZE_COL, Qt.SortOrder.DescendingOrder)
+    self.append_log(f"📊 {human_size(total.bytes)} in {total.files:,} file(s), "
+                    f"{total.dirs:,} dir(s)\n")
 
+def open_map_entry(self, index):
+    """Double-click: directories expand (Qt default), files open in the editor."""
+    node = self.map_model.node(index)
+    if node is not None and not node.is_dir:
+        open_in_editor(node.path)
 
 def append_log(self, text: str):
     """
@@ -123,11 +218,3 @@ def append_log(self, text: str):
         print(text, end="" if text.endswith("\n") else "\n")
     except Exception:
         pass
-
-def display_map(self, results: list[str]):
-    """Display map results in the Results list widget."""
-    self.list.clear()
-    if results:
-        self.list.addItems(results)
-    else:
-        self.append_log("No map generated.\n")
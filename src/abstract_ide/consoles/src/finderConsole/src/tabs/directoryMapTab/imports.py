@@ -1,3 +1,4 @@
 from ..imports import *
+from PyQt6.QtWidgets import QAbstractItemView, QTreeView
 
 
@@ -0,0 +1,33 @@
+from .imports import *
+
+# ---------- dependency graph views on the Files list ----------
+def _wire_graph_menu(self):
+    self.module_paths.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+    self.module_paths.customContextMenuRequested.connect(lambda pos: _graph_context_menu(self, pos))
+
+def _graph_context_menu(self, pos):
+    item = self.module_paths.itemAt(pos)
+    graph = getattr(self, "_graph", None)
+    if item is None or graph is None or item.text() not in graph:
+        return
+    path = item.text()
+    menu = QMenu(self.module_paths)
+    a_deps  = menu.addAction("Show Imports (transitive)")
+    a_users = menu.addAction("Show Dependents (impact)")
+    a_cycle = menu.addAction("Show Import Cycle")
+    a_all   = menu.addAction("Show All Files")
+    act = menu.exec(self.module_paths.viewport().mapToGlobal(pos))
+    if act == a_deps:    _show_related(self, path, graph.dependencies(path), "imports")
+    elif act == a_users: _show_related(self, path, graph.dependents(path), "is imported by")
+    elif act == a_cycle: _show_related(self, path, graph.cycle_of(path), "is in a cycle with")
+    elif act == a_all:   self._fill_files(self._last_module_paths)
+
+def _show_related(self, path: str, files: list[str], verb: str):
+    self.append_log(f"{os.path.basename(path)} {verb} {len(files)} file(s)\n")
+    self._fill_files([path] + [f for f in files if f != path])
+
+def _log_cycles(self, graph):
+    cycles = graph.cycles()
+    if not cycles:
+        return
+    self.append_log(f"{len(cycles)} import cycle(s); largest has {len(cycles[0])} file(s)\n")
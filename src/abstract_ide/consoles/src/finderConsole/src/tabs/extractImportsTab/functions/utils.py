@@ -1,20 +1,34 @@
 from .imports import *
 class _ExtractWorker(QThread):
     log = pyqtSignal(str)
-    done = pyqtSignal(tuple)   # (module_paths: list[str], imports: list[str])
+    done = pyqtSignal(tuple)   # (module_paths, imports, import_to_files, ModuleGraph | None)
 
-    def __init__(self, params):
+    def __init__(self, params, graph=None):
         super().__init__()
         self.params = params
+        self.graph = graph
 
     def run(self):
         try:
-            py_files = collect_filepaths(**self.params)  # from your lib
-            module_paths, imports = get_py_script_paths(py_files)  # your function
-            self.done.emit((module_paths, imports))
+            py_files = sorted({f for f in walk_files(**self.params) if f.endswith(".py")})
+            # one ast parse per changed file, in the pool; unchanged files come from the cache
+            idx = ImportIndex(self.params["directory"])
+            try:
+                parsed = idx.refresh(py_files)
+                reverse = idx.reverse(py_files)
+                # the previous run's graph is patched in place when it covers the same root
+                graph = self.graph
+                if graph is None or graph.root != idx.root:
+                    graph = ModuleGraph.from_index(idx, py_files)
+                else:
+                    graph.sync(idx, py_files)
+            finally:
+                idx.close()
+            self.log.emit(f"Indexed {len(py_files)} file(s), {parsed} parsed\n")
+            self.done.emit((py_files, sorted(reverse), reverse, graph))
         except Exception:
             self.log.emit(traceback.format_exc())
-            self.done.emit(([], []))
+            self.done.emit(([], [], {}, None))
 
 # ------------- Actions -------------
 def start_extract(self):
@@ -27,7 +41,9 @@ def start_extract(self):
         self.btn_run.setEnabled(True)
         return
 
-    self.worker = _ExtractWorker(self.params)
+    # the worker owns the graph until it is done
+    graph, self._graph = getattr(self, "_graph", None), None
+    self.worker = _ExtractWorker(self.params, graph)
     self.worker.log.connect(self.append_log)
     self.worker.done.connect(self.display_imports)
     self.worker.finished.connect(lambda: self.btn_run.setEnabled(True))
@@ -42,40 +58,30 @@ def append_log(self, text: str):
     self.log.insertPlainText(text)
     self.log.ensureCursorVisible()
 
-# Build a reverse index import -> [files] (cheap pass over files)
+# Reverse index import -> [files] from the on-disk import cache
 def _build_import_index(self, module_paths: list[str]) -> dict[str, list[str]]:
-    idx: dict[str, list[str]] = {}
-    for fp in module_paths:
-        try:
-            content = read_from_file(fp)
-        except Exception:
-            continue
-        # very simple: reuse your extractor on this file
-        for mod in extract_python_imports(fp):
-            idx.setdefault(mod, []).append(fp)
-        # handle “from .x import y” quick pass (optional)
-        for line in content.splitlines():
-            s = line.strip()
-            if s.startswith("from "):
-                parts = s.split()
-                if len(parts) > 1:
-                    base = parts[1].split('.')[0]
-                    if base:
-                        idx.setdefault(base, []).append(fp)
-    # dedupe lists
-    for k in list(idx.keys()):
-        idx[k] = sorted(set(idx[k]))
-    return idx
+    directory = getattr(self, "params", {}).get("directory") or os.path.commonpath(module_paths or ["."])
+    idx = ImportIndex(directory)
+    try:
+        idx.refresh(module_paths)
+        return idx.reverse(module_paths)
+    finally:
+        idx.close()
 
 def display_imports(self, results: tuple):
-    module_paths, imports = results or ([], [])
+    results = tuple(results or ([], []))
+    module_paths, imports = results[:2]
+    import_to_files = results[2] if len(results) > 2 else None
+    self._graph = results[3] if len(results) > 3 else None
 
     # Save whole sets
     self._last_module_paths = sorted(set(module_paths))
     self._last_imports = sorted(set(s.strip() for s in imports if s and s.strip()))
 
-    # Build / update reverse index
-    self._import_to_files = self._build_import_index(self._last_module_paths)
+    # Reverse index comes from the worker; rebuild only if it was not sent
+    if import_to_files is None:
+        import_to_files = self._build_import_index(self._last_module_paths)
+    self._import_to_files = import_to_files
 
     # ---- populate files (default: all) ----
     self._fill_files(self._last_module_paths)
@@ -83,6 +89,8 @@ def display_imports(self, results: tuple):
     # ---- populate imports (wrapped chips) ----
     self._fill_imports(self._last_imports)
 
+    if self._graph is not None:
+        self._log_cycles(self._graph)
     if not self._last_imports:
         self.append_log("No imports found.\n")
     if not self._last_module_paths:
@@ -95,19 +103,23 @@ def _fill_files(self, files: list[str]):
         self.module_paths.addItems(files)
 
 def _fill_imports(self, imports: list[str]):
-    self.modules_list.clear()
-    fm = self.modules_list.fontMetrics()
-    for s in imports:
-        it = QListWidgetItem(s)
-        # make a “chip” size hint that wraps nicely
-        w = fm.horizontalAdvance(s) + 24
-        h = fm.height() + 10
-        it.setSizeHint(QSize(min(max(w, 80), 380), h))
-        self.modules_list.addItem(it)
+    # one model reset; the view measures each distinct string once
+    self.imports_model.set_items(imports)
+
+def _filter_imports(self, text: str):
+    keep = set(self.modules_list.selected_texts())
+    self.imports_proxy.set_filter(text)     # resets the selection without a selectionChanged
+    if keep:
+        sm = self.modules_list.selectionModel()
+        sm.blockSignals(True)
+        self.modules_list.select_texts(keep)
+        sm.blockSignals(False)
+        self.modules_list.viewport().update()
+        self._on_import_selection_changed()
 
 # selection handler: filter files by selected imports
 def _on_import_selection_changed(self):
-    selected = [it.text() for it in self.modules_list.selectedItems()]
+    selected = self.modules_list.selected_texts()
     if not selected:
         # Show all
         self._fill_files(self._last_module_paths)
@@ -126,9 +138,9 @@ def _open_selected_module_path(self, item: QListWidgetItem):
 
 def _copy_imports(self):
     # Copy selected imports; if none selected, copy all
-    items = self.modules_list.selectedItems()
+    items = self.modules_list.selected_texts()
     if items:
-        text = ", ".join(sorted({it.text() for it in items}))
+        text = ", ".join(sorted(set(items)))
     else:
         text = ", ".join(self._last_imports)
     QGuiApplication.clipboard().setText(text, QClipboard.Mode.Clipboard)           
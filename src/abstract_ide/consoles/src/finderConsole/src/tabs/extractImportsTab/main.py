@@ -22,6 +22,7 @@ class extractImportsTab(QWidget):
         self.module_paths.setUniformItemSizes(True)
         self.module_paths.setSelectionMode(self.module_paths.SelectionMode.ExtendedSelection)
         self.module_paths.itemDoubleClicked.connect(self._open_selected_module_path)
+        self._wire_graph_menu()
         self.layout().addWidget(self.module_paths, stretch=3)
 
         # ---------- IMPORTS header + Copy ----------
@@ -33,23 +34,25 @@ class extractImportsTab(QWidget):
         self.copy_btn.clicked.connect(self._copy_imports)
         self.layout().addLayout(hdr)
 
-        # ---------- IMPORTS as wrapped “chips” ----------
-        self.modules_list = QListWidget()
-        self.modules_list.setSelectionMode(self.modules_list.SelectionMode.ExtendedSelection)
-        self.modules_list.setViewMode(QListView.ViewMode.IconMode)  # horizontal flow
-        self.modules_list.setWrapping(True)
-        self.modules_list.setResizeMode(QListView.ResizeMode.Adjust)
-        self.modules_list.setMovement(QListView.Movement.Static)
-        self.modules_list.setSpacing(6)
-        # optional: make items compact and readable
-        fm = self.fontMetrics()
-        self.modules_list.setIconSize(QSize(1, fm.height() + 8))  # tiny “icon” height to get nicer grid rows
+        self.imports_filter = QLineEdit()
+        self.imports_filter.setPlaceholderText("Filter imports…")
+        self.imports_filter.setClearButtonEnabled(True)
+        self.imports_filter.textChanged.connect(self._filter_imports)
+        self.layout().addWidget(self.imports_filter)
+
+        # ---------- IMPORTS as wrapped “chips” (virtualized) ----------
+        self.imports_model = ChipModel(self)
+        self.imports_proxy = ChipFilterProxy(self)
+        self.imports_proxy.setSourceModel(self.imports_model)
+        self.modules_list = ChipView()
+        self.modules_list.setModel(self.imports_proxy)
         self.layout().addWidget(self.modules_list, stretch=2)
 
         # selection → filter files that contain the import
-        self.modules_list.itemSelectionChanged.connect(self._on_import_selection_changed)
+        self.modules_list.selectionModel().selectionChanged.connect(lambda *_: self._on_import_selection_changed())
 
         # last results + index
         self._last_module_paths: list[str] = []
         self._last_imports: list[str] = []
         self._import_to_files: dict[str, list[str]] = {}
+        self._graph = None
@@ -18,19 +18,38 @@ def start_search(self):
             params = self.make_params(self)
         except Exception as e:
             logger.info(f"{e}")
+        params["regex"] = self.chk_regex.isChecked() if hasattr(self, "chk_regex") else False
+        bad = compile_error(params.get("strings") or [], params["regex"])
+        if bad:
+            QMessageBox.critical(self, "Bad regex", bad)
+            enable_widget(self, "primary_btn", True)
+            enable_widget(self, "btn_secondary", False)
+            return
         logger.info(f"params == {params}")
-        self.worker = SearchWorker(params)
+        stop_live(self)
+        self._live_params = params
+        streaming = self.chk_stream.isChecked() if hasattr(self, "chk_stream") else False
+        use_index = self.chk_index.isChecked() if hasattr(self, "chk_index") else False
+        self.worker = SearchWorker(params, streaming=streaming, use_index=use_index)
         
         self.worker.log.connect(self.append_log)
-        self.worker.done.connect(self.populate_results)
+        if streaming:
+            reset_results(self)
+            self.worker.batch.connect(self.append_results)
+            self.worker.progress.connect(self.on_search_progress)
+            self.worker.done.connect(self.finish_results)
+        else:
+            self.worker.done.connect(self.populate_results)
         
         self.worker.finished.connect(lambda: enable_widget(self,"primary_btn",True))
+        self.worker.finished.connect(lambda: _resume_live(self))
         self.worker.start()
     except Exception as e:
         logger.info(e)
 def stop_search(self):
     if hasattr(self, "worker") and self.worker.isRunning():
         request_find_console_stop()
+        self.worker.cancel()
         enable_widget(self, "primary_btn", True)
         enable_widget(self, "btn_secondary", False)
 
@@ -66,10 +85,58 @@ def append_log(self, text: str):
             pass
     except Exception as e:
         logger.info(e)
+def reset_results(self):
+    self._last_results = []
+    self.results_model.clear()
+
+def _add_result_hits(self, results: list):
+    """Append hits to the results model, one row per file; line hits expand under it."""
+    self.results_model.add_results(results)
+
+def append_results(self, batch: list):
+    """Streaming: grow the list with a partial batch from SearchWorker."""
+    try:
+        self._last_results.extend(batch or [])
+        _add_result_hits(self, batch or [])
+    except Exception as e:
+        logger.info(e)
+
+def on_search_progress(self, stats: dict):
+    label = getattr(self, "status_label", None)
+    if label is None:
+        return
+    if stats.get("cancelled"):
+        state = "stopped"
+    else:
+        state = "walking" if stats.get("walking") else "scanning"
+    pruned = stats.get("files_pruned", 0)
+    label.setText(
+        f"{state}: {stats.get('files_scanned', 0)}/{stats.get('files_found', 0)} files, "
+        f"{stats.get('bytes_read', 0) / 1e6:.1f} MB, {stats.get('hits', 0)} hit(s) — "
+        f"{stats.get('files_per_sec', 0):.0f} files/s, {stats.get('mb_per_sec', 0):.1f} MB/s"
+        + (f", {pruned} skipped by index" if pruned else "")
+    )
+    current = stats.get("current_path") or ""
+    label.setToolTip(current)
+    if current and state != "stopped":
+        width = max(label.width(), 200)
+        shown = label.fontMetrics().elidedText(current, Qt.TextElideMode.ElideMiddle, width)
+        label.setText(f"{label.text()}\n{shown}")
+
+def finish_results(self, results: list):
+    """Streaming: rows are already in place, just report and re-enable."""
+    n = self.results_model.file_count()
+    worker = getattr(self, "worker", None)
+    if worker is not None and worker.token.cancelled:
+        self.append_log(f"⏹ Search stopped; {n} file(s) so far.\n")
+    else:
+        self.append_log(f"✅ Found {n} file(s).\n" if n else "✅ No matches found.\n")
+    enable_widget(self, "btn_secondary", False)
+
 def populate_results(self, results: list):
     try:
+        reset_results(self)
         self._last_results = results or []
-        self.list.clear()
         if not results:
             self.append_log("✅ No matches found.\n")
             enable_widget(self, "btn_secondary", False)
@@ -77,35 +144,55 @@ def populate_results(self, results: list):
 
         self.append_log(f"✅ Found {len(results)} file(s).\n")
         enable_widget(self, "btn_secondary", True)
-        self.lines_list = {}
-        for fp in results:
-            if isinstance(fp, dict):
-                file_path = fp.get("file_path")
-                lines = fp.get("lines", [])
-            else:
-                file_path = fp
-                lines = []
-
-            if not isinstance(file_path, str):
-                continue
-
-            if lines:
-                for obj in lines:
-                    line = obj.get("line")
-                    text = f"{file_path}" if line is not None else file_path
-                    if file_path not in self.lines_list:
-                        self.lines_list[file_path] = []
-                        item = QListWidgetItem(text)
-                        item.setData(Qt.ItemDataRole.UserRole, {"file_path": file_path, "line": line})
-                        self.list.addItem(item)
-                    self.lines_list[file_path].append(line)
-            else:
-                text = f"{file_path}" if line is not None else file_path
-                if file_path not in self.lines_list:
-                    item = QListWidgetItem(file_path)
-                    item.setData(Qt.ItemDataRole.UserRole, {"file_path": file_path, "line": None})
-                    self.list.addItem(item)
-                    self.append_log(file_path + "\n")
-            
+        _add_result_hits(self, results)
+    except Exception as e:
+        logger.info(e)
+
+# — Live search —
+def toggle_live(self, on: bool):
+    if not on:
+        stop_live(self)
+    elif not getattr(self, "_live_params", None):
+        self.append_log("Run a search first; live mode follows the last query.\n")
+    elif not (getattr(self, "worker", None) and self.worker.isRunning()):
+        start_live(self)
+
+def _resume_live(self):
+    """Re-arm the watcher once a search completes (not after a stop)."""
+    chk = getattr(self, "chk_live", None)
+    if chk is not None and chk.isChecked() and not self.worker.token.cancelled:
+        start_live(self)
+
+def start_live(self):
+    stop_live(self)
+    known = [path for path, _ in self.results_model.iter_files()]
+    self.live_worker = WatchWorker(self._live_params, known)
+    self.live_worker.log.connect(self.append_log)
+    self.live_worker.updates.connect(lambda updates: apply_live_updates(self, updates))
+    self.live_worker.start()
+
+def stop_live(self):
+    worker = getattr(self, "live_worker", None)
+    if worker is not None and worker.isRunning():
+        worker.cancel()
+        worker.wait()
+    self.live_worker = None
+
+def apply_live_updates(self, updates: list):
+    """Patch changed files into the results in place; rows for untouched files stay put."""
+    try:
+        changed = dict(updates)
+        for path, result in updates:
+            self.results_model.set_file_results(path, result)
+        self._last_results = [
+            fp for fp in self._last_results
+            if (fp.get("file_path") if isinstance(fp, dict) else fp) not in changed
+        ] + [r for r in changed.values() if r]
+        label = getattr(self, "status_label", None)
+        if label is not None:
+            label.setText(
+                f"live: {self.results_model.file_count()} file(s), "
+                f"{self.results_model.hit_count()} hit(s) — {len(changed)} updated"
+            )
     except Exception as e:
         logger.info(e)
@@ -20,10 +20,30 @@ class finderTab(QWidget):
 
 
         )
+        self.chk_stream = QCheckBox("Stream results"); self.chk_stream.setChecked(True)
+        self.chk_index = QCheckBox("Use trigram index"); self.chk_index.setChecked(False)
+        self.chk_index.setToolTip("Keep an on-disk index per directory; only changed files are re-read.")
+        self.chk_regex = QCheckBox("Regex"); self.chk_regex.setChecked(False)
+        self.chk_regex.setToolTip("Treat each comma-separated string as a regular expression.")
+        self.chk_live = QCheckBox("Live"); self.chk_live.setChecked(False)
+        self.chk_live.setToolTip("Watch the searched tree and update results as files change.")
+        self.chk_live.toggled.connect(self.toggle_live)
+        opts = QHBoxLayout()
+        opts.addWidget(self.chk_stream); opts.addWidget(self.chk_index); opts.addWidget(self.chk_regex)
+        opts.addWidget(self.chk_live)
+        opts.addStretch(1)
+        self.layout().addLayout(opts)
         # Output area
         self.layout().addWidget(QLabel("Results"))
-        self.lines_list = []
-        self.list = QListWidget()
-        self.list.itemDoubleClicked.connect(self.open_one)
+        self.results_model = SearchResultsModel(self)
+        self.list = QListView()
+        self.list.setModel(self.results_model)
+        self.list.setItemDelegate(SearchResultsDelegate(self.list))
+        self.list.setUniformItemSizes(True)
+        self.list.doubleClicked.connect(self.open_one)
         self.layout().addWidget(self.list, stretch=3)
+        self.status_label = QLabel("Ready.")
+        self.layout().addWidget(self.status_label)
         self._last_results = []
+        self._live_params = None
+        self.live_worker = None
@@ -8,6 +8,10 @@ def _setup_menu(self) -> None:
     select_dir_action.triggered.connect(self._select_root_directory)
     file_menu.addAction(select_dir_action)
 
+    open_tree_action = QAction("Open Existing Tree...", self)
+    open_tree_action.triggered.connect(self._open_existing_tree)
+    file_menu.addAction(open_tree_action)
+
     file_menu.addSeparator()
 
     quit_action = QAction("Quit", self)
@@ -56,8 +60,22 @@ def _on_structure_submitted(self, text: str) -> None:
     except Exception as e:
         QMessageBox.critical(self, "Build Error", str(e))
 
+def _open_existing_tree(self) -> None:
+    """Register every file under the root for browsing; contents load when opened."""
+    if not self.config.root_path:
+        self._select_root_directory()
+        if not self.config.root_path:
+            return
+
+    self.registry.clear()
+    files = self.registry.register_tree(self.config.root_path)
+    self.file_browser.populate(self.config.root_path.name, files)
+    self.editor.clear()
+    self._current_file = None
+    self.status_bar.showMessage(f"Registered {len(files)} files", 3000)
+
 def _on_file_selected(self, relative_path: Path) -> None:
-    entry = self.registry.get(relative_path)
+    entry = self.registry.open(relative_path)
     if entry:
         self._current_file = relative_path
         self.editor.set_file(relative_path, entry.content)
@@ -6,36 +6,101 @@ from .dataclasses import *
 # =============================================================================
 
 
+CONTENT_BUDGET = 64 * 1024 * 1024     # characters of clean content kept in memory
+MMAP_THRESHOLD = 1024 * 1024          # files at least this large are read through mmap
+
+
+def read_file_text(path: Path) -> str:
+    """UTF-8 text of `path` with newlines normalized like Path.read_text; big files via mmap."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, "utf-8")
+        else:
+            text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 class FileRegistry:
     """
     Central registry for file state.
     Avoids scattered globals; all file state lives here.
+
+    Registering never reads a file. Content is loaded the first time an
+    entry's `content` is used (normally when it is opened in the editor)
+    and clean content is kept in an LRU within `budget` characters; older
+    clean entries go back to disk-backed state. Dirty entries are never
+    dropped.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, budget: int = CONTENT_BUDGET) -> None:
         self._entries: dict[Path, FileEntry] = {}
         self._listeners: list[Callable[[Path, FileEntry], None]] = []
-
-    def register(self, relative_path: Path, absolute_path: Path) -> FileEntry:
+        self.budget = budget
+        self._resident: OrderedDict[Path, int] = OrderedDict()   # clean loaded entries, oldest first
+        self._resident_size = 0
+
+    def register(self, relative_path: Path, absolute_path: Path, exists: Optional[bool] = None) -> FileEntry:
+        """Add a file without reading it; `exists` skips the stat when the caller already knows."""
+        if exists is None:
+            exists = absolute_path.exists()
+        self._drop_resident(relative_path)
         entry = FileEntry(
             relative_path=relative_path,
             absolute_path=absolute_path,
-            exists_on_disk=absolute_path.exists(),
+            exists_on_disk=exists,
+            _loader=self._load,
         )
-        if entry.exists_on_disk and absolute_path.is_file():
-            try:
-                entry.content = absolute_path.read_text(encoding="utf-8")
-            except Exception:
-                entry.content = ""
         self._entries[relative_path] = entry
         return entry
 
+    def register_tree(self, root: Path) -> list[Path]:
+        """Register every file under `root` from one scandir walk. Returns the relative paths."""
+        registered: list[Path] = []
+        stack: list[tuple[Path, Path]] = [(root, Path())]
+        while stack:
+            abs_dir, rel_dir = stack.pop()
+            try:
+                with os.scandir(abs_dir) as it:
+                    dir_entries = list(it)
+            except OSError:
+                continue
+            for de in dir_entries:
+                try:
+                    if de.is_dir(follow_symlinks=False):
+                        stack.append((abs_dir / de.name, rel_dir / de.name))
+                        continue
+                    if not de.is_file():
+                        continue
+                except OSError:
+                    continue
+                # joining one name is much cheaper than Path(de.path).relative_to(root)
+                rel_path = rel_dir / de.name
+                self.register(rel_path, abs_dir / de.name, exists=True)
+                registered.append(rel_path)
+        return registered
+
     def get(self, relative_path: Path) -> Optional[FileEntry]:
         return self._entries.get(relative_path)
 
+    def open(self, relative_path: Path) -> Optional[FileEntry]:
+        """Entry with its content loaded, marked most recently used."""
+        entry = self._entries.get(relative_path)
+        if entry is None:
+            return None
+        if not entry.loaded:
+            self._load(entry)
+        elif relative_path in self._resident:
+            self._resident.move_to_end(relative_path)
+        return entry
+
     def update_content(self, relative_path: Path, content: str) -> None:
         entry = self._entries.get(relative_path)
         if entry:
+            self._drop_resident(relative_path)
             entry.content = content
             entry.is_dirty = True
             self._notify(relative_path, entry)
@@ -45,6 +110,8 @@ class FileRegistry:
         if entry:
             entry.is_dirty = False
             entry.exists_on_disk = True
+            if entry.loaded:
+                self._add_resident(entry)
 
     def add_listener(self, callback: Callable[[Path, FileEntry], None]) -> None:
         self._listeners.append(callback)
@@ -55,10 +122,47 @@ class FileRegistry:
 
     def clear(self) -> None:
         self._entries.clear()
+        self._resident.clear()
+        self._resident_size = 0
 
     def all_entries(self) -> dict[Path, FileEntry]:
         return dict(self._entries)
 
+    def resident_size(self) -> int:
+        """Characters of clean content currently held in memory."""
+        return self._resident_size
+
+    # ── lazy content ──
+    def _load(self, entry: FileEntry) -> str:
+        content = ""
+        if entry.exists_on_disk and entry.absolute_path.is_file():
+            try:
+                content = read_file_text(entry.absolute_path)
+            except Exception:
+                content = ""
+        entry.content = content
+        self._add_resident(entry)
+        return content
+
+    def _add_resident(self, entry: FileEntry) -> None:
+        path = entry.relative_path
+        self._drop_resident(path)
+        size = len(entry.content)
+        self._resident[path] = size
+        self._resident_size += size
+        # the newest entry stays even when it alone is over budget
+        while self._resident_size > self.budget and len(self._resident) > 1:
+            old_path, old_size = self._resident.popitem(last=False)
+            self._resident_size -= old_size
+            old = self._entries.get(old_path)
+            if old is not None and not old.is_dirty:
+                old.unload()
+
+    def _drop_resident(self, relative_path: Path) -> None:
+        size = self._resident.pop(relative_path, None)
+        if size is not None:
+            self._resident_size -= size
+
 
 # =============================================================================
 # PARSER
@@ -171,7 +275,7 @@ class ScaffoldBuilder:
                 abs_path.parent.mkdir(parents=True, exist_ok=True)
                 if not abs_path.exists():
                     abs_path.touch()
-                self.registry.register(rel_path, abs_path)
+                self.registry.register(rel_path, abs_path, exists=True)
                 created_files.append(rel_path)
 
         return created_files
@@ -6,13 +6,35 @@ from .TreeNode import *
 
 @dataclass
 class FileEntry:
-    """Schema for a file in the registry."""
+    """
+    Schema for a file in the registry.
+    Content is read on first access through `_loader` and may be dropped
+    again by the registry while clean; `content` reloads it transparently.
+    """
 
     relative_path: Path
     absolute_path: Path
-    content: str = ""
     is_dirty: bool = False
     exists_on_disk: bool = False
+    _content: Optional[str] = field(default=None, repr=False)
+    _loader: Optional[Callable[["FileEntry"], str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def loaded(self) -> bool:
+        return self._content is not None
+
+    @property
+    def content(self) -> str:
+        if self._content is None:
+            return self._loader(self) if self._loader else ""
+        return self._content
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self._content = value
+
+    def unload(self) -> None:
+        self._content = None
 
 
 @dataclass
@@ -1,6 +1,6 @@
 from __future__ import annotations
-import re,sys
-from collections import deque
+import mmap,os,re,sys
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
@@ -0,0 +1,18 @@
+"""
+Tests for the Finder console's pure `shared` packages (search, patch, walk).
+
+`shared/__init__.py` star-imports the Qt models and the abstract_* helpers
+as well. So the package is registered by path here, and each test imports
+only the subpackages it needs (`from shared.patch import batch`).
+"""
+import os
+import sys
+import types
+
+SHARED = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "src", "abstract_ide", "consoles", "src",
+                      "finderConsole", "src", "imports", "share_utils", "shared")
+
+if "shared" not in sys.modules:
+    _pkg = types.ModuleType("shared")
+    _pkg.__path__ = [os.path.abspath(SHARED)]
+    sys.modules["shared"] = _pkg
@@ -0,0 +1,56 @@
+import os
+import shutil
+
+import pytest
+
+from shared.patch import batch
+
+def _append(text):
+    return text + "patched\n"
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def test_missing_item_is_skipped_not_failed(tmp_path):
+    a, b = str(tmp_path / "a.py"), str(tmp_path / "b.py")
+    missing = str(tmp_path / "gone.py")
+    below_file = os.path.join(a, "child.py")           # NotADirectoryError
+    _write(a, "a\n")
+    _write(b, "b\n")
+    items = [(p, p) for p in (a, missing, below_file, b)]
+    result = batch.apply_batch(items, _append, durable=False, journal_dir=str(tmp_path / "journal"))
+    assert result.committed
+    assert result.failed == []
+    assert result.skipped == [missing, below_file]
+    assert sorted(result.changed) == [a, b]
+    assert _read(a) == "a\npatched\n" and _read(b) == "b\npatched\n"
+
+@pytest.mark.skipif(batch.fcntl is None, reason="journal locks need flock")
+def test_recovery_skips_a_commit_in_progress(tmp_path):
+    target = str(tmp_path / "t.py")
+    _write(target, "original\n")
+    journal_dir = str(tmp_path / "journal")
+    os.makedirs(journal_dir)
+    txn = batch.PatchTransaction(batch.prepare_changes([(target, target)], _append), journal_dir, durable=False)
+    txn.stage()
+    # the first half of commit(): locked journal written, target swapped in
+    txn._lock_fd = batch._lock_journal(txn.journal)
+    batch._write_json(txn.journal, txn._manifest("pending"))
+    entry = txn.entries[0]
+    os.link(entry["target"], entry["backup"])
+    os.replace(entry["temp"], entry["target"])
+
+    assert batch.recover_journals(journal_dir) == []
+    assert _read(target) == "original\npatched\n"
+    assert os.path.exists(txn.journal)
+
+    # owner gone without finishing: the next recovery rolls it back
+    os.close(txn._lock_fd)
+    assert batch.recover_journals(journal_dir) == [txn.txid]
+    assert _read(target) == "original\n"
+    assert os.listdir(journal_dir) == []
@@ -0,0 +1,66 @@
+import random
+
+from shared.patch import batch
+from shared.patch.delta import apply_delta, line_delta
+from shared.patch.undo import UndoJournal
+
+def _mutate(rng, lines):
+    out = list(lines)
+    for _ in range(rng.randint(0, 4)):
+        op = rng.choice("ids")
+        at = rng.randint(0, len(out))
+        if op == "i":
+            out[at:at] = [rng.choice([b"new\n", b"x = 2\r\n", b"\xff\xfe\n", b"\n"]) for _ in range(rng.randint(1, 3))]
+        elif op == "d" and out:
+            del out[at:at + rng.randint(1, 3)]
+        elif out:
+            out[min(at, len(out) - 1)] = b"changed\n"
+    return out
+
+def test_random_round_trip():
+    rng = random.Random(19)
+    vocab = [b"a\n", b"b\n", b"a\n", b"pass\n", b"\n", b"c\r\n", b"}\n"]
+    for _ in range(500):
+        old_lines = [rng.choice(vocab) for _ in range(rng.randint(0, 30))]
+        new_lines = _mutate(rng, old_lines)
+        old, new = b"".join(old_lines), b"".join(new_lines)
+        if rng.random() < 0.3:
+            old = old.rstrip(b"\n")                   # no final newline
+        ops = line_delta(new, old)
+        assert apply_delta(new, ops) == old
+
+def test_small_change_gives_a_small_delta():
+    old = b"".join(b"line %d\n" % i for i in range(5000))
+    new = old.replace(b"line 2500\n", b"line 2500 changed\nand one more\n")
+    ops = line_delta(new, old)
+    assert ops == [[2500, 2502, "line 2500\n"]]
+    assert apply_delta(new, ops) == old
+
+def test_undo_restores_a_batch(tmp_path):
+    a, b = tmp_path / "a.py", tmp_path / "b.py"
+    a.write_bytes(b"one\r\ntwo\r\nthree")
+    b.write_bytes(b"x = 1\n" * 100)
+    journal = UndoJournal(str(tmp_path / "undo"))
+    result = batch.apply_batch([(str(a), str(a)), (str(b), str(b))],
+                               lambda t: t.replace("two", "2").replace("x = 1\n", "x = 1\n# seen\n", 1),
+                               durable=False, journal_dir=str(tmp_path / "journal"), undo=journal)
+    assert result.committed and result.undo_path
+    assert a.read_bytes() != b"one\r\ntwo\r\nthree"
+    undone = journal.undo_last()
+    assert undone.committed
+    assert a.read_bytes() == b"one\r\ntwo\r\nthree"
+    assert b.read_bytes() == b"x = 1\n" * 100
+    assert journal.records() == []
+
+def test_undo_refuses_files_edited_since(tmp_path):
+    a = tmp_path / "a.py"
+    a.write_text("value = 1\n")
+    journal = UndoJournal(str(tmp_path / "undo"))
+    batch.apply_batch([(str(a), str(a))], lambda t: t.replace("1", "2"),
+                      durable=False, journal_dir=str(tmp_path / "journal"), undo=journal)
+    a.write_text("value = 3\n")
+    undone = journal.undo_last()
+    assert not undone.committed
+    assert undone.failed == [(str(a), "modified since the apply")]
+    assert a.read_text() == "value = 3\n"
+    assert len(journal.records()) == 1
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from shared.patch import route
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "proj"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "x.py").write_text("x = 1\n")
+    (tmp_path / "outside.txt").write_text("secret\n")
+    return root
+
+def test_absolute_header_is_not_taken_as_is(tree, tmp_path):
+    outside = str(tmp_path / "outside.txt")
+    assert route.resolve_patch_path([outside], str(tree)) is None
+    assert route.resolve_patch_path([outside], str(tree), strip=0) is None
+
+def test_dotdot_components_are_dropped(tree):
+    assert route.strip_components("a/../../src/x.py", 1) == os.path.join("src", "x.py")
+    assert route.resolve_patch_path(["a/../../../../outside.txt"], str(tree)) is None
+    escaped = route.resolve_patch_path(["a/../../src/x.py"], str(tree))
+    assert escaped == os.path.join(str(tree), "src", "x.py")
+
+def test_symlink_out_of_the_root_is_refused(tree, tmp_path):
+    (tree / "link").symlink_to(tmp_path)
+    assert os.path.isfile(tree / "link" / "outside.txt")
+    assert route.resolve_patch_path(["a/link/outside.txt"], str(tree)) is None
+
+def test_header_inside_the_root_still_resolves(tree):
+    expected = os.path.join(str(tree), "src", "x.py")
+    assert route.resolve_patch_path(["b/src/x.py", "a/src/x.py"], str(tree)) == expected
+
+@pytest.mark.parametrize("line, expected", [
+    ("--- a/src/x.py", "a/src/x.py"),
+    ("+++ b/src/x.py\t2024-01-02 10:00:00.000000000 +0100", "b/src/x.py"),   # diff -u timestamp
+    ("--- a/src/x.py   \r\n", "a/src/x.py"),
+    ('--- "a/with space\\ttab.py"', "a/with space\ttab.py"),
+    ('+++ "b/caf\\303\\251.py"', "b/café.py"),                                # octal UTF-8 bytes
+    ('--- "a/say \\"hi\\".py"', 'a/say "hi".py'),                           # escaped quote
+    ("--- /dev/null", None),
+    ("+++ ", None),
+])
+def test_header_path(line, expected):
+    assert route.header_path(line) == expected
+
+def test_strip_components_levels():
+    assert route.strip_components("a/src/x.py", 0) == os.path.join("a", "src", "x.py")
+    assert route.strip_components("a/src/x.py", 1) == os.path.join("src", "x.py")
+    assert route.strip_components("./a//src\\x.py", 2) == "x.py"
+    assert route.strip_components("a/src/x.py", 3) is None
+
+def test_auto_strip_prefers_level_one_then_zero(tree):
+    (tree / "a" / "src").mkdir(parents=True)
+    (tree / "a" / "src" / "x.py").write_text("shadow\n")
+    root = str(tree)
+    # a/src/x.py exists at both -p1 (src/x.py) and -p0 (a/src/x.py): -p1 wins, like git
+    assert route.resolve_patch_path(["a/src/x.py"], root) == os.path.join(root, "src", "x.py")
+    assert route.resolve_patch_path(["a/src/x.py"], root, strip=0) == os.path.join(root, "a", "src", "x.py")
+    assert route.resolve_patch_path(["proj/sub/src/x.py"], root) == os.path.join(root, "src", "x.py")   # -p2
+    assert route.resolve_patch_path(["b/missing.py", "a/src/x.py"], root) == os.path.join(root, "src", "x.py")
+    assert route.resolve_patch_path([None, "b/missing.py"], root) is None
@@ -0,0 +1,100 @@
+import os
+import random
+
+import pytest
+
+from shared.pydeps.graph import ModuleGraph
+from shared.pydeps.index import parse_imports
+
+class _Index:
+    """The two things ModuleGraph reads from an ImportIndex."""
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        self.sources = {}
+    def records(self, path):
+        return parse_imports(self.sources.get(path, ""), path) or []
+
+def _snapshot(graph):
+    paths = sorted(graph._ids)
+    return {
+        "deps": {p: graph.dependencies(p) for p in paths},
+        "direct": {p: graph.dependencies(p, transitive=False) for p in paths},
+        "users": {p: graph.dependents(p) for p in paths},
+        "cycle": {p: graph.cycle_of(p) for p in paths},
+        "cycles": graph.cycles(),
+    }
+
+def _random_source(rng, modules):
+    lines = []
+    for name in rng.sample(modules, rng.randint(0, 3)):
+        pkg, _, mod = name.rpartition(".")
+        form = rng.randrange(3)
+        if form == 0:
+            lines.append(f"import {name}")
+        elif form == 1 and pkg:
+            lines.append(f"from {pkg} import {mod}")
+        else:
+            lines.append(f"from .{mod} import thing" if pkg == "pkg" else f"import {name}")
+    if rng.random() < 0.2:
+        lines.append("import os")
+    return "\n".join(lines) + "\n"
+
+@pytest.mark.parametrize("seed", range(6))
+def test_incremental_matches_a_fresh_build(tmp_path, seed):
+    rng = random.Random(seed)
+    root = str(tmp_path)
+    index = _Index(root)
+    modules = {f"pkg.m{i}": os.path.join(index.root, "pkg", f"m{i}.py") for i in range(10)}
+    modules.update({f"top{i}": os.path.join(index.root, f"top{i}.py") for i in range(4)})
+    init = os.path.join(index.root, "pkg", "__init__.py")
+    names = sorted(modules)
+    live = set(rng.sample(names, 10))
+    index.sources[init] = ""
+    for n in live:
+        index.sources[modules[n]] = _random_source(rng, names)
+    files = lambda: [init] + sorted(modules[n] for n in live)
+
+    graph = ModuleGraph.from_index(index, files())
+    for step in range(60):
+        _snapshot(graph)                               # fill the memos the next edit must invalidate
+        action = rng.random()
+        if action < 0.6 or len(live) < 4:
+            n = rng.choice(sorted(live))
+            index.sources[modules[n]] = _random_source(rng, names)
+            if rng.random() < 0.5:
+                graph.update(modules[n], index.records(modules[n]))
+            else:
+                graph.sync(index, files())
+        elif action < 0.8 and len(live) < len(names):
+            n = rng.choice(sorted(set(names) - live))
+            live.add(n)
+            index.sources[modules[n]] = _random_source(rng, names)
+            graph.sync(index, files())
+        else:
+            n = rng.choice(sorted(live))
+            live.discard(n)
+            del index.sources[modules[n]]
+            if rng.random() < 0.5:
+                graph.remove(modules[n])
+            else:
+                graph.sync(index, files())
+        fresh = ModuleGraph.from_index(index, files())
+        assert _snapshot(graph) == _snapshot(fresh), f"seed {seed}, step {step}"
+
+def test_cycle_split_and_merge(tmp_path):
+    index = _Index(str(tmp_path))
+    a, b, c = (os.path.join(index.root, f"{n}.py") for n in "abc")
+    index.sources.update({a: "import b\n", b: "import c\n", c: "import a\n"})
+    graph = ModuleGraph.from_index(index, [a, b, c])
+    assert graph.cycles() == [[a, b, c]]
+    assert graph.dependents(a) == [b, c]
+
+    index.sources[c] = ""
+    graph.update(c, index.records(c))                  # breaks the cycle: split
+    assert graph.cycles() == [] and graph.cycle_of(a) == []
+    assert graph.dependencies(a) == [b, c] and graph.dependents(a) == []
+
+    index.sources[c] = "import b\n"
+    graph.update(c, index.records(c))                  # closes b <-> c: merge
+    assert graph.cycles() == [[b, c]]
+    assert graph.dependencies(a) == [b, c]
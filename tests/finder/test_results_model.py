@@ -0,0 +1,51 @@
+import pytest
+
+# shared.results needs Qt and the whole finder package (its `imports` chain), not just `shared`
+result_model = pytest.importorskip(
+    "abstract_ide.consoles.src.finderConsole.src.imports.share_utils.shared.results.result_model")
+SearchResultsModel = result_model.SearchResultsModel
+
+def _hit(path, lines):
+    return {"file_path": path, "lines": [{"line": n, "content": ""} for n in lines]}
+
+def _rows(model):
+    return [model.entry(r) for r in range(model.rowCount())]
+
+def test_repeated_live_updates_reuse_line_storage(monkeypatch):
+    monkeypatch.setattr(result_model, "COMPACT_MIN", 64)
+    model = SearchResultsModel()
+    model.add_results([_hit(f"f{i}.py", [1, 2]) for i in range(10)])
+    for n in range(500):
+        model.set_file_results("f3.py", _hit("f3.py", range(1, 2 + n % 7)))
+    assert len(model._lines) < 200
+    assert model.file_lines("f3.py") == list(range(1, 2 + 499 % 7))
+    assert model.file_lines("f4.py") == [1, 2]
+    assert model.hit_count() == 9 * 2 + 499 % 7 + 1
+
+def test_compaction_keeps_expanded_rows(monkeypatch):
+    monkeypatch.setattr(result_model, "COMPACT_MIN", 1)
+    model = SearchResultsModel()
+    model.add_results([_hit("a.py", [1, 2, 3]), _hit("b.py", [4, 5]), _hit("c.py", [6])])
+    model.toggle_expanded(1)                             # b.py
+    before = _rows(model)
+    model.set_file_results("a.py", _hit("a.py", [7, 8, 9, 10]))     # grows: re-appended
+    model.set_file_results("a.py", _hit("a.py", [7, 8, 9, 10, 11]))  # half of _lines is garbage now
+    assert model._garbage == 0 and len(model._lines) == 5 + 2 + 1
+    assert _rows(model) == [("a.py", 7), ("b.py", 4), ("b.py", 4), ("b.py", 5), ("c.py", 6)]
+    assert before[1:4] == _rows(model)[1:4]
+    model.set_file_results("c.py", None)
+    assert model.file_lines("a.py") == [7, 8, 9, 10, 11] and model.file_lines("b.py") == [4, 5]
+
+def test_file_row_lookup_after_drops_and_expansion():
+    model = SearchResultsModel()
+    model.add_results([_hit(f"f{i}.py", [i + 1, i + 2]) for i in range(6)])
+    model.toggle_expanded(0)
+    model.toggle_expanded(model._file_row(model._path_ids["f4.py"]))
+    model.set_file_results("f2.py", None)
+    model.set_file_results("f2.py", _hit("f2.py", [9]))              # re-added at the end
+    for path, fid in model._path_ids.items():
+        row = model._file_row(fid)
+        assert model.is_file_row(row) and model.entry(row)[0] == path
+    model.set_file_results("f4.py", _hit("f4.py", [40]))
+    row = model._file_row(model._path_ids["f4.py"])
+    assert model.is_expanded(row) and model.entry(row + 1) == ("f4.py", 40)
@@ -0,0 +1,59 @@
+import random
+import re
+
+from shared.search import blocks
+
+def _get_paths_hits(text, strings):
+    """The per-hunk `getPaths` this replaced: (first line, lines) per non-overlapping hit."""
+    tot = "\n".join(strings)
+    lines = text.split("\n")
+    out = []
+    for m in re.finditer(re.escape(tot), text):
+        start = text[:m.start()].count("\n")
+        if start + len(strings) <= len(lines):
+            out.append((start, lines[start:start + len(strings)]))
+    return out
+
+def _by_block(matcher, text, count):
+    got = [[] for _ in range(count)]
+    for i, first, lines in matcher.scan(text):
+        got[i].append((first, lines))
+    return got
+
+def _check(text, hunks):
+    matcher = blocks.BlockMatcher(hunks)
+    got = _by_block(matcher, text, len(hunks))
+    for i, strings in enumerate(hunks):
+        expected = _get_paths_hits(text, strings) if "\n".join(strings) else []
+        assert got[i] == expected, (i, strings)
+    offsets = matcher.offsets(text)
+    assert offsets == sorted(offsets, key=lambda h: (h[1], h[0]))
+    for i, pos in offsets:
+        assert text.startswith(matcher.blocks[i], pos)
+
+def test_short_blocks_match_like_get_paths():
+    text = "def f(a,\n      b):\n    return (a +\n            b)\n\ndef g():\n    pass\n}\n"
+    hunks = [["def f(a,", "      b):"], [")"], ["}"], ["    return (a +"], [""], ["b"]]
+    _check(text, hunks)
+    assert blocks.BlockMatcher(hunks).short == [1, 2, 5]
+
+def test_random_blocks_match_like_get_paths():
+    rng = random.Random(17)
+    vocab = ["x = 1", ")", "}", "    pass", "return x", "", "if y:", "  ", "foo(bar)"]
+    for _ in range(200):
+        lines = [rng.choice(vocab) for _ in range(rng.randint(1, 40))]
+        text = "\n".join(lines)
+        hunks = []
+        for _ in range(rng.randint(1, 5)):
+            start = rng.randrange(len(lines))
+            hunks.append(lines[start:start + rng.randint(1, 3)])
+        hunks.append([rng.choice(vocab)])
+        _check(text, hunks)
+
+def test_match_blocks_reads_each_file(tmp_path):
+    a, b = tmp_path / "a.py", tmp_path / "b.py"
+    a.write_text("x = 1\n)\nx = 1\n")
+    b.write_text("nothing here\n")
+    found = blocks.match_blocks([str(a), str(b)], [["x = 1"], [")"]], max_workers=1)
+    assert list(found) == [str(a)]
+    assert [(i, first) for i, first, _ in found[str(a)]] == [(0, 0), (1, 1), (0, 2)]
@@ -0,0 +1,39 @@
+import pytest
+
+from shared.search import engine
+from shared.search.cancel import CancelToken, SearchCancelled
+from shared.walk.latency import REMOTE_PROFILE
+
+class _CancelOnSecondCheck(CancelToken):
+    """Passes the per-file check, then cancels inside the file."""
+    def __init__(self):
+        super().__init__()
+        self.checks = 0
+    def raise_if_cancelled(self):
+        self.checks += 1
+        if self.checks == 2:
+            self.cancel()
+        super().raise_if_cancelled()
+
+@pytest.fixture
+def big_file(tmp_path):
+    path = tmp_path / "big.txt"
+    line = b"nothing to see here\n"
+    with open(path, "wb") as f:
+        f.write(line * (3 * engine.SCAN_CHUNK // len(line)))
+        f.write(b"needle\n")
+    return str(path)
+
+def test_cancel_lands_inside_a_large_file_on_the_remote_profile(big_file):
+    assert REMOTE_PROFILE.mmap_threshold > 3 * engine.SCAN_CHUNK     # buffered read, no mmap
+    spec = engine.SearchSpec.from_params(strings="needle", get_lines=False)
+    token = _CancelOnSecondCheck()
+    with pytest.raises(SearchCancelled):
+        engine._search_one(big_file, spec, token=token, profile=REMOTE_PROFILE)
+    assert token.checks == 2
+
+def test_chunked_search_still_finds_hits_on_the_remote_profile(big_file):
+    spec = engine.SearchSpec.from_params(strings="needle", get_lines=False)
+    hits, nbytes, scanned = engine._search_shard([big_file], spec, CancelToken(), REMOTE_PROFILE)
+    assert [h["file_path"] for h in hits] == [big_file]
+    assert scanned == 1
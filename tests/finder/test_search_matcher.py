@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from shared.search import engine
+from shared.search.cancel import CancelToken
+from shared.search.matcher import Matcher
+
+def _naive(buf, needles, require_all):
+    hits = [n in buf for n in needles]
+    return all(hits) if require_all else any(hits)
+
+@pytest.fixture(params=[False, True], ids=["find", "scan"])
+def strategy(request):
+    return request.param
+
+def _matcher(strings, scan):
+    m = Matcher(tuple(strings))
+    if len(m.needles) > 1:
+        m._scan = scan
+    return m
+
+@pytest.mark.parametrize("strings, text", [
+    (["foo", "foobar"], b"xx foobar xx"),            # shorter needle inside the longer hit
+    (["ab", "bc"], b"..abc.."),                      # overlapping hits
+    (["abc", "bcd", "cde"], b"abcde"),
+    (["abc", "zzz"], b"abcabc"),
+])
+def test_overlapping_needles(strings, text, strategy):
+    m = _matcher(strings, strategy)
+    for require_all in (False, True):
+        assert engine._matches(text, m, require_all) == _naive(text, m.needles, require_all)
+
+def test_random_buffers_agree_with_naive(strategy):
+    rng = random.Random(8)
+    for _ in range(300):
+        text = bytes(rng.choice(b"abc\n") for _ in range(rng.randint(0, 60)))
+        strings = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 5))}
+        m = _matcher(strings, strategy)
+        for require_all in (False, True):
+            assert engine._matches(text, m, require_all) == _naive(text, m.needles, require_all)
+
+def test_chunked_windows_agree_with_whole_buffer(strategy, monkeypatch):
+    monkeypatch.setattr(engine, "SCAN_CHUNK", 7)
+    rng = random.Random(13)
+    for _ in range(300):
+        text = bytes(rng.choice(b"abcd") for _ in range(rng.randint(0, 80)))
+        strings = {"".join(rng.choice("abcd") for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 4))}
+        m = _matcher(strings, strategy)
+        for require_all in (False, True):
+            expected = _naive(text, m.needles, require_all)
+            assert engine._matches_chunked(text, m, require_all, CancelToken()) == expected
+
+def test_probe_keeps_find_for_a_single_needle():
+    m = Matcher(("needle",))
+    assert m._use_scan(b"x" * (1 << 20)) is False
+
+def test_probe_picks_a_strategy_once():
+    m = Matcher(tuple(f"self.name_{i}" for i in range(20)))
+    assert m._scan is None
+    assert m._use_scan(b"short") is False and m._scan is None      # too small to time
+    m._use_scan(b"def f(self):\n    return self.other\n" * 20000)
+    assert m._scan in (True, False)
@@ -0,0 +1,85 @@
+"""A local tree behind artificial latency: every scandir/stat costs one round trip."""
+import os
+import threading
+import time
+
+import pytest
+
+from shared.walk import latency, walker
+from shared.walk.latency import LOCAL_PROFILE, REMOTE_PROFILE, MetadataCache, set_io_profile
+
+ROUND_TRIP = 0.01
+
+class _Slow:
+    """Wraps an os function with a sleep (GIL released, like a network wait) and counts calls."""
+    def __init__(self, fn):
+        self.fn = fn
+        self.calls = 0
+        self._lock = threading.Lock()
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(ROUND_TRIP)
+        return self.fn(*args, **kwargs)
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "mount"
+    for i in range(6):
+        for j in range(5):
+            d = root / f"d{i}" / f"s{j}"
+            d.mkdir(parents=True)
+            for k in range(3):
+                (d / f"f{k}.txt").write_text("x")
+    yield str(root)
+    set_io_profile(str(root), None)
+
+@pytest.fixture
+def slow_os(monkeypatch):
+    scandir, stat = _Slow(os.scandir), _Slow(os.stat)
+    monkeypatch.setattr(os, "scandir", scandir)
+    monkeypatch.setattr(os, "stat", stat)
+    return scandir, stat
+
+def _walk(root, profile):
+    set_io_profile(root, profile)
+    latency.default_metadata_cache().invalidate()
+    t0 = time.perf_counter()
+    paths = [e.path for e in walker.walk_entries(root, include_dirs=True)]
+    return paths, time.perf_counter() - t0
+
+def test_remote_profile_lists_ahead_in_parallel(tree, slow_os):
+    scandir, _ = slow_os
+    local_paths, local_time = _walk(tree, LOCAL_PROFILE)
+    local_listings = scandir.calls
+    remote_paths, remote_time = _walk(tree, REMOTE_PROFILE)
+    assert remote_paths == local_paths                   # same entries, same order
+    assert scandir.calls - local_listings == local_listings == 37
+    assert local_time >= local_listings * ROUND_TRIP
+    assert remote_time < local_time / 2
+
+def test_metadata_cache_saves_round_trips(tree, slow_os):
+    _, stat = slow_os
+    files = sorted(os.path.join(dp, f) for dp, _, fs in os.walk(tree) for f in fs)
+
+    t0 = time.perf_counter()
+    direct = [os.stat(p) for p in files]                 # the local path: one stat per lookup
+    serial_time = time.perf_counter() - t0
+    assert stat.calls == len(files)
+
+    meta = MetadataCache(ttl=60.0)
+    t0 = time.perf_counter()
+    cached = meta.stat_many(files, workers=REMOTE_PROFILE.list_workers)
+    parallel_time = time.perf_counter() - t0
+    assert [cached[p].st_size for p in files] == [st.st_size for st in direct]
+    assert parallel_time < serial_time / 2
+    assert stat.calls == 2 * len(files)
+
+    meta.stat_many(files)                                # within the TTL: no round trips at all
+    for p in files:
+        meta.stat(p)
+    assert stat.calls == 2 * len(files)
+
+    meta.invalidate(files[0])
+    meta.stat(files[0])
+    assert stat.calls == 2 * len(files) + 1